@@ -1,18 +1,67 @@
+import asyncio
 import gradio as gr
+import itertools
+import json
 import os
+from core.metrics import merge_snapshots, start_exporters
 from core.pipeline import TranslationPipeline
+from core.serving import AsyncTranslationEngine, EngineOverloadedError
+from core.workers import WorkerPool
 from core.stt import STT
 from core.tts import TTS
+from core.utils import setup_logger
 
-# Initialize Pipeline
+setup_logger()
+
+# Initialize Pipeline (models are loaded on first use unless WARMUP is set)
 pipeline = TranslationPipeline()
-stt = STT()
-tts = TTS()
+if pipeline.config["SERVE_PROCESSES"] > 0:
+    # Translate in worker processes; the pool loads the models before forking so workers share them
+    translator = WorkerPool.from_config(pipeline, pipeline.config)
+else:
+    translator = pipeline
+    if pipeline.config["WARMUP"] in ("background", "blocking"):
+        pipeline.warmup(background=pipeline.config["WARMUP"] == "background")
+engine = AsyncTranslationEngine.from_config(translator, pipeline.config)
+
+def collect_metrics():
+    # Worker processes keep their own registries; model loads before the fork stay in the parent's
+    if translator is pipeline:
+        return pipeline.metrics_snapshot()
+    return merge_snapshots([pipeline.metrics_snapshot(), translator.metrics_snapshot()])
+
+metrics_exporters = start_exporters(collect_metrics, pipeline.config)
+# Hindi and English, then any other target configured in MODEL_PAIRS
+target_languages = ["Hindi", "English"] + sorted({target for _, target in pipeline.registry.pairs} - {"Hindi", "English"})
+stt = STT(vad_filter=pipeline.config["STT_VAD"], min_silence_ms=pipeline.config["STT_VAD_MIN_SILENCE_MS"])
+tts = TTS(
+    use_online=pipeline.config["TTS_ONLINE"], voice=pipeline.config["TTS_VOICE"],
+    cache_dir=pipeline.config["TTS_CACHE_DIR"], cache_max_mb=pipeline.config["TTS_CACHE_MB"],
+)
+
+async def translate_or_raise(text, target_lang):
+    """Awaits the serving engine and turns overload/timeouts into UI errors."""
+    try:
+        return await engine.translate_async(text, target_lang=target_lang)
+    except EngineOverloadedError:
+        raise gr.Error("Server is busy, please try again in a moment.")
+    except asyncio.TimeoutError:
+        raise gr.Error("Translation timed out, please try again.")
+
+async def translate_document_or_raise(text, target_lang):
+    """Document mode on a thread: a bounded number of sentence chunks in flight instead of one engine request per sentence."""
+    try:
+        return await asyncio.to_thread(translator.translate_document, text, target_lang)
+    except Exception as e:
+        raise gr.Error(f"Document translation failed: {e}")
 
-def process_text(text, target_lang, use_glossary):
+async def process_text(text, target_lang, use_glossary, document_mode=False):
     # TODO: Pass use_glossary flag to pipeline if needed, 
     # currently it's auto-applied but we could toggle it.
-    output = pipeline.translate(text, target_lang=target_lang)
+    if document_mode:
+        output = await translate_document_or_raise(text, target_lang)
+    else:
+        output = await translate_or_raise(text, target_lang)
     
     # Format logs for display
     logs = output.get("logs", {})
@@ -26,30 +75,50 @@ def process_text(text, target_lang, use_glossary):
         
     return output["translation"], log_str, confidence_markup
 
-def process_audio(audio_path, target_lang):
+async def process_audio(audio_path, target_lang):
+    """Streams (transcription, translation, logs, audio) as segments are transcribed and translated."""
     if not audio_path:
-        return "", "No audio provided", "", None
-        
-    # STT
-    transcription = stt.transcribe(audio_path)
-    
+        yield "", "No audio provided", "", None
+        return
+
+    # STT: segments arrive as Whisper finalizes them; each is translated while the next decodes,
+    # and partial results are pushed whenever either finishes
+    segments = stt.transcribe_stream(audio_path)
+    transcripts = []
+    tasks = []
+    decode = asyncio.ensure_future(asyncio.to_thread(next, segments, None))
+    while decode is not None or not all(task.done() for task in tasks):
+        waiting = {task for task in tasks if not task.done()}
+        if decode is not None:
+            waiting.add(decode)
+        await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+        if decode is not None and decode.done():
+            segment = decode.result()
+            decode = None
+            if segment is not None:
+                transcripts.append(segment)
+                tasks.append(asyncio.create_task(translate_or_raise(segment["text"], target_lang)))
+                decode = asyncio.ensure_future(asyncio.to_thread(next, segments, None))
+
+        finished = [task.result()["translation"] for task in itertools.takewhile(lambda t: t.done(), tasks)]
+        yield " ".join(s["text"] for s in transcripts), " ".join(finished), "", None
+
     # Translation
-    output = pipeline.translate(transcription, target_lang=target_lang)
-    translation = output["translation"]
-    
-    # TTS
-    audio_out_path = f"outputs/tts_output_{len(translation)}.mp3"
-    if not os.path.exists("outputs"):
-        os.makedirs("outputs")
-        
-    final_audio = tts.speak(translation, lang=target_lang, output_file=audio_out_path)
-    
-    logs = output.get("logs", {})
+    outputs = [task.result() for task in tasks]
+    transcription = " ".join(s["text"] for s in transcripts)
+    translation = " ".join(output["translation"] for output in outputs)
+
     log_str = f"Transcription: {transcription}\n\nProcessing Steps:\n"
-    for k, v in logs.items():
-        log_str += f"- {k}: {v}\n"
-        
-    return transcription, translation, log_str, final_audio
+    for segment, output in zip(transcripts, outputs):
+        log_str += f"Segment {segment['start']:.1f}s-{segment['end']:.1f}s:\n"
+        for k, v in output.get("logs", {}).items():
+            log_str += f"- {k}: {v}\n"
+    yield transcription, translation, log_str, None
+
+    # TTS: repeated phrases come from the audio cache; each new file gets a unique content-addressed path
+    final_audio = await asyncio.wrap_future(tts.submit(translation, lang=target_lang))
+    yield transcription, translation, log_str, final_audio
 
 # UI Layout
 with gr.Blocks(title="BharatCodeMix") as app:
@@ -61,8 +130,9 @@ with gr.Blocks(title="BharatCodeMix") as app:
             with gr.Row():
                 with gr.Column():
                     input_text = gr.Textbox(label="Input Text (English/Hinglish/Hindi)", placeholder="Type here... e.g. 'Main aaj bahut happy hoon'")
-                    target_lang = gr.Dropdown(["Hindi", "English"], label="Target Language", value="Hindi")
+                    target_lang = gr.Dropdown(target_languages, label="Target Language", value="Hindi")
                     use_glossary = gr.Checkbox(label="Apply Glossary Constraints", value=True)
+                    document_mode = gr.Checkbox(label="Document Mode (translate long text sentence by sentence)", value=False)
                     btn_text = gr.Button("Translate", variant="primary")
                 
                 with gr.Column():
@@ -70,15 +140,16 @@ with gr.Blocks(title="BharatCodeMix") as app:
                     confidence_display = gr.Text(label="Quality Check")
                     logs_display = gr.TextArea(label="Pipeline Logs", interactive=False)
             
-            btn_text.click(process_text, inputs=[input_text, target_lang, use_glossary], outputs=[output_text, logs_display, confidence_display])
+            btn_text.click(process_text, inputs=[input_text, target_lang, use_glossary, document_mode], outputs=[output_text, logs_display, confidence_display])
             
             gr.Examples(
                 examples=[
-                    ["Main aaj bahut happy hoon", "Hindi", True],
-                    ["Exam ka tension mat le, bas chill kar", "Hindi", True],
-                    ["Code-mix is quite difficult to handle.", "Hindi", True]
+                    ["Main aaj bahut happy hoon", "Hindi", True, False],
+                    ["Exam ka tension mat le, bas chill kar", "Hindi", True, False],
+                    ["Code-mix is quite difficult to handle.", "Hindi", True, False],
+                    ["Aaj meeting cancel ho gayi. Kal subah 10 baje milte hain!\n\nPlease share the report by Friday.", "Hindi", True, True]
                 ],
-                inputs=[input_text, target_lang, use_glossary]
+                inputs=[input_text, target_lang, use_glossary, document_mode]
             )
 
         # Tab 2: Speech Translation
@@ -86,7 +157,7 @@ with gr.Blocks(title="BharatCodeMix") as app:
             with gr.Row():
                 with gr.Column():
                     input_audio = gr.Audio(sources=["upload"], type="filepath", label="Upload Audio")
-                    target_lang_audio = gr.Dropdown(["Hindi", "English"], label="Target Language", value="Hindi")
+                    target_lang_audio = gr.Dropdown(target_languages, label="Target Language", value="Hindi")
                     btn_audio = gr.Button("Transcribe & Translate", variant="primary")
                     
                 with gr.Column():
@@ -103,6 +174,18 @@ with gr.Blocks(title="BharatCodeMix") as app:
             gr.Textbox(value="Local CPU Mode", label="Execution Mode", interactive=False)
             gr.Markdown("Edit `data/glossary_example.csv` to update glossary terms.")
             gr.Markdown("Edit `data/slang_map.json` to add new slang words.")
+            btn_reload = gr.Button("Reload Glossary & Slang Map")
+            reload_status = gr.Text(label="Resource Version", interactive=False)
+            btn_reload.click(lambda: f"Using version {translator.reload_resources()}", inputs=[], outputs=[reload_status])
+            btn_startup = gr.Button("Show Startup Timings")
+            startup_display = gr.TextArea(label="Startup Timings (import / load / first inference)", interactive=False)
+            btn_startup.click(pipeline.startup_report, inputs=[], outputs=[startup_display])
+            btn_metrics = gr.Button("Show Metrics")
+            metrics_display = gr.TextArea(label="Metrics (enable with METRICS_ENABLED=true)", interactive=False)
+            btn_metrics.click(lambda: json.dumps(collect_metrics(), indent=2), inputs=[], outputs=[metrics_display])
+            btn_models = gr.Button("Show Models")
+            models_display = gr.TextArea(label="Model Registry (per worker process when SERVE_PROCESSES > 0)", interactive=False)
+            btn_models.click(lambda: json.dumps(translator.model_stats(), indent=2, ensure_ascii=False), inputs=[], outputs=[models_display])
 
 if __name__ == "__main__":
     app.launch()
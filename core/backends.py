@@ -0,0 +1,85 @@
+import logging
+import os
+from .utils import startup_profile
+
+logger = logging.getLogger(__name__)
+
+BACKEND_TORCH = "torch"
+BACKEND_TORCH_INT8 = "torch-int8"
+BACKEND_ONNX = "onnx"
+BACKENDS = (BACKEND_TORCH, BACKEND_TORCH_INT8, BACKEND_ONNX)
+
+def export_path(export_dir: str, model_name: str) -> str:
+    """Directory an exported model lives in, e.g. models/onnx/Helsinki-NLP--opus-mt-en-hi."""
+    return os.path.join(export_dir, model_name.replace("/", "--"))
+
+def _checked(backend: str) -> str:
+    if backend not in BACKENDS:
+        logger.error(f"Unknown inference backend {backend!r}, expected one of {', '.join(BACKENDS)}. Using torch.")
+        return BACKEND_TORCH
+    return backend
+
+def loaded_backend(model):
+    """Backend a model was actually loaded on (after any fallback), or None if unknown."""
+    return getattr(model, "inference_backend", None)
+
+def _tagged(model, backend: str):
+    # Recorded on the model so callers can tell a fallback from the backend they asked for
+    model.inference_backend = backend
+    return model
+
+def quantize_dynamic_int8(model):
+    """Dynamic int8 quantization of every nn.Linear; weights are quantized once, activations per call."""
+    import torch
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def load_translation_model(model_name: str, backend: str = BACKEND_TORCH, export_dir: str = "models/onnx"):
+    """
+    Returns (tokenizer, model) for a Marian model on the given backend. All backends expose
+    generate(**inputs) over the tokenizer's PyTorch tensors, so the scheduler is unchanged.
+    The ONNX backend loads graphs written by scripts/export_backend.py; if none exist for
+    the model it logs an error and falls back to PyTorch fp32. loaded_backend(model) tells
+    which backend was used.
+    """
+    backend = _checked(backend)
+    if backend == BACKEND_ONNX:
+        path = export_path(export_dir, model_name)
+        if os.path.isdir(path):
+            with startup_profile.measure("optimum", "import"):
+                from optimum.onnxruntime import ORTModelForSeq2SeqLM
+                from transformers import MarianTokenizer
+            with startup_profile.measure(model_name, "load"):
+                # use_cache keeps the decoder-with-past session, so each step only feeds the new token
+                model = ORTModelForSeq2SeqLM.from_pretrained(path, use_cache=True)
+                return MarianTokenizer.from_pretrained(path), _tagged(model, BACKEND_ONNX)
+        logger.error(f"No ONNX export for {model_name} in {path}; run scripts/export_backend.py. Using torch.")
+
+    # transformers is imported on first use so Hinglish->Hindi requests never pay for it
+    with startup_profile.measure("transformers", "import"):
+        from transformers import MarianMTModel, MarianTokenizer
+    with startup_profile.measure(model_name, "load"):
+        tokenizer = MarianTokenizer.from_pretrained(model_name)
+        model = MarianMTModel.from_pretrained(model_name)
+        if backend == BACKEND_TORCH_INT8:
+            return tokenizer, _tagged(quantize_dynamic_int8(model.eval()), BACKEND_TORCH_INT8)
+    return tokenizer, _tagged(model, BACKEND_TORCH)
+
+def load_sentence_encoder(model_name: str, backend: str = BACKEND_TORCH, export_dir: str = "models/onnx"):
+    """SentenceTransformer for QE on the given backend; ONNX falls back to PyTorch when not exported."""
+    backend = _checked(backend)
+    with startup_profile.measure("sentence_transformers", "import"):
+        from sentence_transformers import SentenceTransformer
+    with startup_profile.measure(model_name, "load"):
+        if backend == BACKEND_ONNX:
+            path = export_path(export_dir, model_name)
+            if os.path.isdir(path):
+                # Prefer the int8 graph written by export_backend.py --quantize
+                onnx_dir = os.path.join(path, "onnx")
+                quantized = sorted(f for f in os.listdir(onnx_dir) if f.startswith("model_qint8")) if os.path.isdir(onnx_dir) else []
+                model_kwargs = {"file_name": f"onnx/{quantized[0]}"} if quantized else None
+                return _tagged(SentenceTransformer(path, backend="onnx", model_kwargs=model_kwargs), BACKEND_ONNX)
+            logger.error(f"No ONNX export for {model_name} in {path}; run scripts/export_backend.py. Using torch.")
+        model = SentenceTransformer(model_name)
+        if backend == BACKEND_TORCH_INT8:
+            return _tagged(quantize_dynamic_int8(model.eval()), BACKEND_TORCH_INT8)
+        return _tagged(model, BACKEND_TORCH)
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+def content_hash(*parts) -> str:
+    """Stable hash over the given parts (used for cache keys and resource versions)."""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(json.dumps(part, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+class TranslationCache:
+    """
+    Content-addressed LRU cache for translation results.
+    Keys cover the normalized text, target language, model name and the slang/glossary
+    version, so a resource edit never serves a stale result.
+    An optional sqlite file backs the in-memory LRU so a restarted worker starts warm.
+    """
+    def __init__(self, max_size: int = 10000, path: Optional[str] = None, max_disk_entries: int = 1000000):
+        self.max_size = max_size
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._puts_since_trim = 0
+        if path:
+            self._open_db(path)
+
+    def _open_db(self, path: str):
+        try:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value TEXT, accessed REAL)"
+            )
+            self._db.commit()
+        except Exception as e:
+            logger.error(f"Failed to open translation cache at {path}: {e}")
+            self._db = None
+
+    def after_fork(self):
+        """Fresh lock and sqlite connection in a forked worker; connections must not cross processes."""
+        self._lock = threading.Lock()
+        if self.path:
+            self._open_db(self.path)
+
+    @staticmethod
+    def make_key(source_text: str, normalized_text: str, target_lang: str, model_name: str, version: str) -> str:
+        # The source is part of the key: glossary enforcement and QE run on it, so two inputs
+        # that normalize to the same text can still have different results
+        return content_hash(source_text, normalized_text, target_lang, model_name, version)
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                value = self._db_get(key)
+                if value is not None:
+                    self._store(key, value)
+
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key: str, value: Dict):
+        with self._lock:
+            self._store(key, value)
+            if self._db is not None:
+                self._db_put(key, value)
+
+    def _store(self, key: str, value: Dict):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _db_get(self, key: str) -> Optional[Dict]:
+        try:
+            row = self._db.execute("SELECT value FROM translations WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE translations SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            return json.loads(row[0])
+        except Exception as e:
+            logger.error(f"Translation cache read failed: {e}")
+            return None
+
+    def _db_put(self, key: str, value: Dict):
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO translations (key, value, accessed) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time()),
+            )
+            self._puts_since_trim += 1
+            if self._puts_since_trim >= 1000:
+                self._trim_db()
+            self._db.commit()
+        except Exception as e:
+            logger.error(f"Translation cache write failed: {e}")
+
+    def _trim_db(self):
+        # Drop least recently used rows once the file grows past its bound
+        self._puts_since_trim = 0
+        self._db.execute(
+            "DELETE FROM translations WHERE key IN ("
+            "SELECT key FROM translations ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
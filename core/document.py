@@ -0,0 +1,152 @@
+import logging
+import re
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A run of whitespace that may end a sentence: any line break, or spaces after a terminator
+# (or a closing quote/bracket that may follow one)
+_BREAK = re.compile(r"\s*\n\s*|(?<=[.!?…।॥\"'”’»)\]])\s+")
+_TERMINAL = re.compile(r"([.!?…।॥]+)[\"'”’»)\]]*$")
+# Where an over-long sentence is cut: after clause punctuation, else at any whitespace
+_CLAUSE = re.compile(r"[,;:،]\s+")
+_SPACE = re.compile(r"\s+")
+# A full stop after these does not end the sentence (compared lowercased, without the dot)
+_ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e", "no", "fig", "approx",
+    "dept", "govt", "inc", "ltd", "co", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept",
+    "oct", "nov", "dec", "shri", "smt",
+}
+
+def _ends_sentence(text: str) -> bool:
+    match = _TERMINAL.search(text)
+    if not match:
+        return False
+    if match.group(1) != ".":
+        return True
+    words = text[:match.start()].split()
+    if not words:
+        return True
+    word = words[-1].lstrip("\"'“‘«([")
+    # Initials ("J. K. Rowling") and known abbreviations
+    if len(word) == 1 and word.isalpha() and word.isupper():
+        return False
+    return word.lower() not in _ABBREVIATIONS
+
+def _split_long(sentence: str, sep: str, max_chars: int) -> List[Tuple[str, str]]:
+    """Cuts a sentence longer than max_chars at its last clause break (or space) within the limit."""
+    pieces = []
+    while len(sentence) > max_chars:
+        window = sentence[:max_chars + 1]
+        cut = None
+        for pattern in (_CLAUSE, _SPACE):
+            matches = [match for match in pattern.finditer(window) if match.start() > 0]
+            if matches:
+                cut = matches[-1]
+                break
+        if cut is None:
+            break
+        gap_start = cut.end() - len(cut.group().lstrip(",;:،"))
+        pieces.append((sentence[:gap_start], sentence[gap_start:cut.end()]))
+        sentence = sentence[cut.end():]
+    pieces.append((sentence, sep))
+    return pieces
+
+def split_sentences(text: str, max_chars: int = 400) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Splits text into sentences at the danda and Latin terminators (., !, ?, …) followed
+    by whitespace, and at line breaks. A full stop after an abbreviation or an initial
+    does not split. Sentences longer than max_chars are cut further at clause punctuation
+    or spaces so no model input grows unbounded.
+    Returns (leading whitespace, [(sentence, whitespace after it)]); joining them all
+    gives back the text exactly.
+    """
+    body = text.lstrip()
+    leading = text[:len(text) - len(body)]
+    pieces = []
+    start = len(leading)
+    for match in _BREAK.finditer(text, start):
+        sentence = text[start:match.start()]
+        if "\n" not in match.group() and not _ends_sentence(sentence):
+            continue
+        pieces.extend(_split_long(sentence, match.group(), max_chars))
+        start = match.end()
+    if start < len(text):
+        tail = text[start:]
+        sentence = tail.rstrip()
+        pieces.extend(_split_long(sentence, tail[len(sentence):], max_chars))
+    return leading, pieces
+
+def assemble(text: str, leading: str, pieces: List[Tuple[str, str]], results: List[Dict]) -> Dict:
+    """
+    Stitches per-sentence results back into one result with the original whitespace.
+    The document confidence is the mean of the sentence confidences weighted by source
+    length; the lowest one and the per-sentence details are kept in the logs.
+    """
+    translation = leading + "".join(result["translation"] + sep for result, (_, sep) in zip(results, pieces))
+    normalized = leading + "".join(result["normalized"] + sep for result, (_, sep) in zip(results, pieces))
+    weights = [max(len(sentence), 1) for sentence, _ in pieces]
+    confidences = [result["confidence"] for result in results]
+    confidence = sum(w * c for w, c in zip(weights, confidences)) / sum(weights) if results else 0.0
+
+    routes: Dict[str, int] = {}
+    timings: Dict[str, float] = {}
+    for result in results:
+        route = result["logs"].get("route", "unknown")
+        routes[route] = routes.get(route, 0) + 1
+        for stage, ms in result["logs"].get("timings_ms", {}).items():
+            timings[stage] = timings.get(stage, 0.0) + ms
+    logs = {
+        "route": "document",
+        "sentences": len(results),
+        "routes": routes,
+        "min_confidence": min(confidences) if confidences else 0.0,
+        # Summed over sentences; batched stages count their batch time once per sentence
+        "timings_ms": timings,
+        "segments": [
+            {"source": sentence, "translation": result["translation"], "confidence": result["confidence"],
+             "route": result["logs"].get("route")}
+            for (sentence, _), result in zip(pieces, results)
+        ],
+    }
+    return {"original": text, "normalized": normalized, "translation": translation, "confidence": confidence, "logs": logs}
+
+def translate_document(submit: Callable[[List[str], str], Future], text: str, target_lang: str = "Hindi",
+                       chunk_sentences: int = 32, max_chars: int = 400, concurrency: int = 2,
+                       timeout: float = None) -> Dict:
+    """
+    Translates a long text sentence by sentence. The sentences go out in chunks of
+    chunk_sentences through submit(texts, target_lang) -> Future, at most `concurrency`
+    chunks at a time (on threads or worker processes); each one is routed and batched
+    per model by translate_batch. The first chunk that fails (or takes longer than
+    timeout seconds) cancels the chunks not yet started and raises.
+    """
+    leading, pieces = split_sentences(text, max_chars)
+    sentences = [sentence for sentence, _ in pieces]
+    chunk_sentences = max(1, chunk_sentences)
+    chunks = [sentences[i:i + chunk_sentences] for i in range(0, len(sentences), chunk_sentences)]
+    results: List[List[Dict]] = [None] * len(chunks)
+    in_flight: Dict[Future, int] = {}
+    try:
+        for index, chunk in enumerate(chunks):
+            if len(in_flight) >= max(1, concurrency):
+                _collect(in_flight, results, timeout)
+            in_flight[submit(chunk, target_lang)] = index
+        while in_flight:
+            _collect(in_flight, results, timeout)
+    except BaseException:
+        for future in in_flight:
+            future.cancel()
+        raise
+    if chunks:
+        logger.info(f"Translated a document of {len(sentences)} sentences in {len(chunks)} chunks")
+    return assemble(text, leading, pieces, [result for chunk in results for result in chunk])
+
+def _collect(in_flight: Dict[Future, int], results: List, timeout: float = None):
+    """Waits for at least one chunk and stores the finished ones; re-raises a chunk's error."""
+    done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+    if not done:
+        raise TimeoutError(f"Document chunk not translated within {timeout} s")
+    for future in done:
+        results[in_flight.pop(future)] = future.result()
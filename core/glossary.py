@@ -1,25 +1,37 @@
 import csv
+import logging
 import re
 import pandas as pd
 from typing import Dict, List, Tuple
+from .matcher import TermMatcher
+
+logger = logging.getLogger(__name__)
 
 class GlossaryManager:
-    def __init__(self, glossary_path: str = None):
+    def __init__(self, glossary_path: str = None, strict: bool = False):
+        """With strict, a glossary that cannot be loaded raises instead of leaving the glossary empty."""
         self.glossary: Dict[str, str] = {}
+        self.matcher = TermMatcher()
         if glossary_path:
-            self.load_glossary(glossary_path)
+            try:
+                self.load_glossary(glossary_path)
+            except Exception as e:
+                if strict:
+                    raise
+                logger.error(f"Error loading glossary: {e}")
 
     def load_glossary(self, path: str):
-        """Loads glossary from a CSV file (Source, Target)."""
-        try:
-            df = pd.read_csv(path)
-            # Expecting columns 'Source' and 'Target'
-            if 'Source' in df.columns and 'Target' in df.columns:
-                self.glossary = pd.Series(df.Target.values, index=df.Source.values).to_dict()
-            else:
-                print(f"Warning: CSV must have 'Source' and 'Target' columns. Found: {df.columns}")
-        except Exception as e:
-            print(f"Error loading glossary: {e}")
+        """Loads glossary from a CSV file (Source, Target). Raises if it cannot be read or lacks a column."""
+        df = pd.read_csv(path)
+        # Expecting columns 'Source' and 'Target'
+        if 'Source' not in df.columns or 'Target' not in df.columns:
+            raise ValueError(f"{path} must have 'Source' and 'Target' columns. Found: {list(df.columns)}")
+        self.set_glossary(pd.Series(df.Target.values, index=df.Source.values).to_dict())
+
+    def set_glossary(self, glossary: Dict[str, str]):
+        """Replaces the glossary and compiles its single-pass matcher (done once, not per request)."""
+        self.glossary = glossary
+        self.matcher = TermMatcher((str(source), str(target)) for source, target in glossary.items())
 
     def apply_glossary_pre_translation(self, text: str) -> Tuple[str, List[str]]:
         """
@@ -45,29 +57,28 @@ class GlossaryManager:
         # A better approach for the demo: Just ensure the 'Target' word exists if 'Source' word was in input.
         
         final_text = translated_text
-        for source_term, target_term in self.glossary.items():
-            # If source term is present in the original text (case-insensitive)
-            if re.search(r'\b' + re.escape(str(source_term)) + r'\b', source_text, re.IGNORECASE):
-                # We want to ensure target_term is in final_text.
-                # But we don't know WHERE to put it without alignment.
-                # So we will use a naive Replace All from the default translation of that term if possible.
-                # LIMITATION: This is hard without word alignment. 
-                # Fallback: We can just use this for "Do Not Translate" (Keep English in Hindi output).
-                
-                # Case 1: Keep original term (Source == Target)
-                if source_term.lower() == target_term.lower():
-                     # If the model translated it, we might try to revert it.
-                     # This is hard to guess what it translated to.
-                     pass 
-                
+        # One pass over the source finds every glossary term present (case-insensitive, whole word)
+        for start, end, target_term in self.matcher.find_all(source_text):
+            source_term = source_text[start:end]
+            # We want to ensure target_term is in final_text.
+            # But we don't know WHERE to put it without alignment.
+            # So we will use a naive Replace All from the default translation of that term if possible.
+            # LIMITATION: This is hard without word alignment. 
+            # Fallback: We can just use this for "Do Not Translate" (Keep English in Hindi output).
+            
+            # Case 1: Keep original term (Source == Target)
+            if source_term.lower() == target_term.lower():
+                 # If the model translated it, we might try to revert it.
+                 # This is hard to guess what it translated to.
+                 pass 
+            
         return final_text
 
     def simple_replace(self, text: str) -> str:
         """
         Directly replaces occurrences of Source with Target.
         Useful if we want to force specific vocabulary before processing or in the output.
+        All terms are replaced in a single pass (longest match first), so a replacement
+        is never itself rewritten by another entry.
         """
-        for source, target in self.glossary.items():
-            pattern = re.compile(r'\b' + re.escape(str(source)) + r'\b', re.IGNORECASE)
-            text = pattern.sub(str(target), text)
-        return text
+        return self.matcher.replace(text, lambda matched, target: target)
@@ -1,14 +1,50 @@
+import logging
+import os
 import re
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Characters removed before the stop-word check (same rule as detect_language)
+_NON_WORD = re.compile(r'[^\w\s]')
+_TOKEN = re.compile(r'\S+')
+# Rows per chunk in detect_batch, and code points per chunk matrix (rows x longest row), so
+# one very long text cannot inflate the UTF-32 matrix of the short rows around it
+_BATCH_CHUNK = 65536
+_BATCH_CODE_POINTS = 1 << 22
+# Word shapes that are rare in romanized Hindi; used for unknown tokens when no model is loaded
+_ENGLISH_SHAPE = re.compile(r"(?:ing|tion|sion|ness|ment|able|ful|less|ly|ed|[^aeiou]y)$|^(?:th|wh|ph)|[xq]|c(?!h)")
 
 class LanguageDetector:
-    def __init__(self):
+    def __init__(self, model_path: str = None, min_confidence: float = 0.8):
+        # Optional character n-gram model (core/langid.py); the stop-word heuristic is the fallback
+        self.ngram_model = None
+        self.min_confidence = min_confidence
+        if model_path and os.path.exists(model_path):
+            try:
+                from .langid import NgramLanguageID
+                self.ngram_model = NgramLanguageID.load(model_path)
+            except Exception as e:
+                logger.error(f"Failed to load language ID model {model_path}: {e}")
+
         # A small set of common English words to help distinguish Hinglish from English
         self.common_english_words = {
             "the", "be", "to", "of", "and", "a", "in", "that", "have", "i", "it", "for", "not", "on", "with",
             "he", "as", "you", "do", "at", "this", "but", "his", "by", "from", "they", "we", "say", "her", "she",
             "is", "are", "was", "were"
         }
+        # Frequent romanized Hindi words, used by tag_tokens
+        self.common_hinglish_words = {
+            "hai", "hain", "ho", "hoon", "hun", "tha", "thi", "kya", "kyun", "kyu", "kaise", "kaisa", "kahan",
+            "kab", "kaun", "kitna", "nahi", "nahin", "na", "haan", "ji", "aap", "tum", "tu", "main", "mai",
+            "mera", "meri", "mere", "tera", "teri", "tere", "apna", "apni", "uska", "uski", "unka", "hum",
+            "hamara", "yeh", "ye", "woh", "wo", "vo", "aaj", "kal", "abhi", "phir", "bhi", "bahut", "bohot",
+            "thoda", "accha", "acha", "achha", "theek", "thik", "sab", "kuch", "koi", "aur", "lekin", "par",
+            "ki", "ka", "ke", "ko", "se", "mein", "pe", "liye", "wala", "wali", "karo", "karna", "kar", "kiya",
+            "karta", "karti", "raha", "rahi", "rahe", "gaya", "gayi", "hua", "hui", "jao", "jana", "chal",
+            "chalo", "dekho", "bolo", "bol", "bata", "batao", "pata", "samajh", "yaar", "bhai", "dost", "ghar",
+            "khana", "paani", "pani", "din", "raat", "mat", "bas", "sirf", "zyada", "kam", "jaldi", "der", "haal"
+        }
 
     def detect_script(self, text: str) -> str:
         """Detects if the text is predominantly Devanagari or Latin."""
@@ -41,3 +77,203 @@ class LanguageDetector:
         if ratio < 0.2:
             return "Hinglish"
         return "English"
+
+    def _scan(self, text: str) -> Tuple[int, int, int, int]:
+        """
+        Single pass over the whitespace tokens of text.
+        Returns (devanagari_chars, latin_chars, words, english_stop_words) without building
+        intermediate match lists. Plain ASCII words take a fast path; other tokens are
+        walked character by character.
+        """
+        stop_words = self.common_english_words
+        devanagari = latin = words = english = 0
+        for match in _TOKEN.finditer(text):
+            token = match.group()
+            if token.isascii() and token.isalpha():
+                latin += len(token)
+                words += 1
+                if token.lower() in stop_words:
+                    english += 1
+                continue
+
+            clean = True
+            for ch in token:
+                if '\u0900' <= ch <= '\u097f':
+                    devanagari += 1
+                elif ch.isascii() and ch.isalpha():
+                    latin += 1
+                if clean and not (ch.isalnum() or ch == "_"):
+                    clean = False
+            if not clean:
+                token = _NON_WORD.sub('', token)
+                if not token:
+                    continue
+            words += 1
+            if token.lower() in stop_words:
+                english += 1
+        return devanagari, latin, words, english
+
+    def _classify(self, devanagari: int, latin: int, words: int, english: int) -> Tuple[str, str]:
+        if devanagari > latin:
+            return "Devanagari", "Hindi"
+        if not words:
+            return "Latin", "English"
+        # Same 20% stop-word threshold as detect_language
+        if english / words < 0.2:
+            return "Latin", "Hinglish"
+        return "Latin", "English"
+
+    def _apply_model(self, language: str, label: str, confidence: float) -> str:
+        # Confident predictions override the heuristic. Latin-script text can't be
+        # Devanagari Hindi, so that label means romanized Hindi here.
+        if confidence < self.min_confidence:
+            return language
+        return "Hinglish" if label == "Hindi" else label
+
+    def detect_scored(self, text: str) -> Tuple[str, str, Optional[float]]:
+        """
+        Returns (script, language, confidence). The confidence comes from the n-gram model
+        and is None when the heuristic decided (no model, Devanagari script, or no words).
+        """
+        counts = self._scan(text)
+        script, language = self._classify(*counts)
+        if self.ngram_model is None or script == "Devanagari" or not counts[2]:
+            return script, language, None
+        label, confidence = self.ngram_model.predict(text)
+        return script, self._apply_model(language, label, confidence), confidence
+
+    def tag_tokens(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Tags every whitespace-separated token of a code-mixed sentence.
+        Returns (start, end, tag) with tag in English / Hinglish / Hindi (Devanagari) / Other
+        (numbers, punctuation). Known words are looked up in the stop-word and Hinglish sets;
+        the rest go through the n-gram model in one batch when it is loaded and confident,
+        otherwise through a word-shape heuristic.
+        """
+        tagged = []
+        unknown = []
+        for match in _TOKEN.finditer(text):
+            token = match.group()
+            word = _NON_WORD.sub('', token).lower()
+            if not any(ch.isalpha() for ch in word):
+                tag = "Other"
+            elif any('\u0900' <= ch <= '\u097f' for ch in word):
+                tag = "Hindi"
+            elif word in self.common_english_words:
+                tag = "English"
+            elif word in self.common_hinglish_words:
+                tag = "Hinglish"
+            else:
+                tag = None
+                unknown.append((len(tagged), word))
+            tagged.append([match.start(), match.end(), tag])
+
+        if unknown:
+            shapes = ["English" if _ENGLISH_SHAPE.search(word) else "Hinglish" for _, word in unknown]
+            if self.ngram_model is not None:
+                labels, confidences = self.ngram_model.predict_batch([word for _, word in unknown])
+                shapes = [self._apply_model(shape, label, confidence)
+                          for shape, label, confidence in zip(shapes, labels, confidences)]
+            for (i, _), tag in zip(unknown, shapes):
+                # A Latin token the model calls "Other" is still routed as one of the two
+                tagged[i][2] = tag if tag in ("English", "Hinglish") else "Hinglish"
+        return [tuple(item) for item in tagged]
+
+    def detect(self, text: str) -> Tuple[str, str]:
+        """Returns (script, language) from one pass over the text."""
+        return self.detect_scored(text)[:2]
+
+    def detect_batch(self, texts) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Labels many texts at once; accepts a list, NumPy array, pandas Series or pyarrow array.
+        Returns (scripts, languages) as NumPy string arrays.
+        Uses pyarrow compute kernels when pyarrow is installed, otherwise NumPy code-point
+        counting for the script with a per-row stop-word pass over Latin rows only.
+        """
+        import numpy as np
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            counts = self._batch_counts_numpy(texts)
+        else:
+            counts = self._batch_counts_arrow(texts)
+        devanagari, latin, words, english = counts
+
+        n = len(devanagari)
+        scripts = np.where(devanagari > latin, "Devanagari", "Latin")
+        ratio = np.divide(english, words, out=np.ones(n), where=words > 0)
+        languages = np.where(ratio < 0.2, "Hinglish", "English")
+        languages = np.where(scripts == "Devanagari", "Hindi", languages)
+
+        if self.ngram_model is not None:
+            # Rows without words (None, empty, punctuation only) keep the heuristic's English
+            rows = np.flatnonzero((scripts == "Latin") & (words > 0))
+            if len(rows):
+                values = texts.to_pylist() if hasattr(texts, "to_pylist") else list(texts)
+                labels, confidences = self.ngram_model.predict_batch([values[i] for i in rows])
+                languages = languages.astype(object)
+                for i, label, confidence in zip(rows, labels, confidences):
+                    languages[i] = self._apply_model(languages[i], label, confidence)
+                languages = languages.astype(str)
+        return scripts, languages
+
+    def _batch_counts_arrow(self, texts):
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        arr = texts if isinstance(texts, (pa.Array, pa.ChunkedArray)) else pa.array(texts, type=pa.string())
+        arr = pc.fill_null(arr, "")
+        devanagari = pc.count_substring_regex(arr, "[\u0900-\u097F]").to_numpy(zero_copy_only=False)
+        latin = pc.count_substring_regex(arr, "[a-zA-Z]").to_numpy(zero_copy_only=False)
+
+        # RE2 equivalent of [^\w\s] for Python's Unicode \w
+        stripped = pc.replace_substring_regex(pc.utf8_lower(arr), r"[^\p{L}\p{N}_\s]", "")
+        tokens = pc.utf8_split_whitespace(stripped)
+        if isinstance(tokens, pa.ChunkedArray):
+            tokens = tokens.combine_chunks()
+        flat = pc.list_flatten(tokens)
+        parents = pc.list_parent_indices(tokens).to_numpy(zero_copy_only=False)
+        # The split keeps empty strings around leading/trailing whitespace; str.split() does not
+        non_empty = pc.greater(pc.utf8_length(flat), 0).to_numpy(zero_copy_only=False).astype(bool)
+        hits = pc.is_in(flat, value_set=pa.array(sorted(self.common_english_words)))
+        hits = hits.to_numpy(zero_copy_only=False).astype(bool)
+        words = np.bincount(parents[non_empty], minlength=len(arr))
+        english = np.bincount(parents[hits & non_empty], minlength=len(arr))
+        return devanagari, latin, words, english
+
+    def _batch_counts_numpy(self, texts):
+        import numpy as np
+
+        if hasattr(texts, "to_numpy"):
+            texts = texts.to_numpy()
+        texts = np.asarray(texts, dtype=object)
+        n = len(texts)
+        devanagari = np.zeros(n, dtype=np.int64)
+        latin = np.zeros(n, dtype=np.int64)
+        words = np.zeros(n, dtype=np.int64)
+        english = np.zeros(n, dtype=np.int64)
+
+        values = ["" if t is None else t for t in texts]
+        # Rows sorted by length, so each chunk matrix is only as wide as its own longest row
+        lengths = np.fromiter(map(len, values), dtype=np.int64, count=n)
+        order = np.argsort(lengths, kind="stable")
+        sorted_lengths = lengths[order]
+        start = 0
+        while start < n:
+            # Largest chunk whose rows x width stays within _BATCH_CODE_POINTS (at least one row)
+            widths = sorted_lengths[start:start + _BATCH_CHUNK]
+            cells = np.arange(1, len(widths) + 1) * np.maximum(widths, 1)
+            stop = start + max(1, int(np.searchsorted(cells, _BATCH_CODE_POINTS, side="right")))
+            rows = order[start:stop]
+            chunk = np.array([values[i] for i in rows], dtype=str)
+            # Fixed-width UTF-32 rows viewed as a (rows, max_len) code-point matrix
+            codes = chunk.view(np.uint32).reshape(len(chunk), -1)
+            devanagari[rows] = ((codes >= 0x0900) & (codes <= 0x097F)).sum(axis=1)
+            latin[rows] = (((codes >= 0x41) & (codes <= 0x5A)) | ((codes >= 0x61) & (codes <= 0x7A))).sum(axis=1)
+            start = stop
+
+        # The stop-word ratio only matters for rows that are not Devanagari
+        for i in np.flatnonzero(devanagari <= latin):
+            _, _, words[i], english[i] = self._scan(texts[i] or "")
+        return devanagari, latin, words, english
@@ -0,0 +1,160 @@
+import logging
+from typing import Iterable, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+LABELS = ("English", "Hinglish", "Hindi", "Other")
+# Multiplier for the rolling n-gram hash and the final bit mixer (both wrap modulo 2**64)
+_HASH_PRIME = 1099511628211
+_MIX = 0x9E3779B97F4A7C15
+
+class NgramLanguageID:
+    """
+    Compact CPU-only language ID over hashed character n-grams.
+    A linear model: score = bias + mean of weights[bucket] over the n-grams of the text,
+    with the weight table held in a (n_buckets, n_labels) NumPy array. Hashing is a
+    vectorized rolling hash over the text's code points, so a sentence costs a handful
+    of NumPy calls, and a whole batch is scored with the same calls.
+    """
+    def __init__(self, weights, bias, ngram_range: Tuple[int, int] = (1, 4), labels: Sequence[str] = LABELS):
+        import numpy as np
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.ngram_range = tuple(ngram_range)
+        self.labels = tuple(labels)
+        self.n_buckets = self.weights.shape[0]
+        if self.n_buckets & (self.n_buckets - 1):
+            raise ValueError(f"n_buckets must be a power of two, got {self.n_buckets}")
+        # Multiplicative hashing: the top log2(n_buckets) bits of h * _MIX pick the bucket
+        self._shift = np.uint64(64 - (self.n_buckets.bit_length() - 1))
+        self._prime = np.uint64(_HASH_PRIME)
+        self._mix = np.uint64(_MIX)
+        self._one = np.uint64(1)
+
+    @classmethod
+    def load(cls, path: str) -> "NgramLanguageID":
+        import numpy as np
+        data = np.load(path, allow_pickle=False)
+        return cls(data["weights"], data["bias"], tuple(data["ngram_range"]), [str(l) for l in data["labels"]])
+
+    def save(self, path: str):
+        import numpy as np
+        np.savez_compressed(path, weights=self.weights, bias=self.bias,
+                            ngram_range=np.array(self.ngram_range), labels=np.array(self.labels))
+
+    def _ngram_hashes(self, codes):
+        """Yields (n, hashes) for every n-gram order; h_n[i] = h_(n-1)[i] * P + codes[i + n - 1]."""
+        prime = self._prime
+        low, high = self.ngram_range
+        h = codes + self._one
+        for n in range(1, high + 1):
+            if n > 1:
+                if len(h) <= 1:
+                    break
+                h = h[:-1] * prime + codes[n - 1:]
+            if n >= low:
+                yield n, h
+
+    def _to_buckets(self, h):
+        return (h * self._mix) >> self._shift
+
+    @staticmethod
+    def _codes(text: str):
+        import numpy as np
+        return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+    def featurize(self, texts: Sequence[str]):
+        """
+        Returns (row_ids, buckets, n_rows) for all n-grams of all texts.
+        Texts are lowercased, padded with spaces and concatenated; the row of each position
+        comes from the text lengths (so any character, NUL included, may appear in a text),
+        and n-grams that would span two texts are dropped.
+        """
+        import numpy as np
+        padded = [" " + (text or "").lower() + " " for text in texts]
+        codes = self._codes("".join(padded))
+        rows = np.repeat(np.arange(len(padded)), [len(text) for text in padded])
+
+        row_parts, hash_parts = [], []
+        for n, h in self._ngram_hashes(codes):
+            count = len(h)
+            valid = rows[n - 1:n - 1 + count] == rows[:count]
+            row_parts.append(rows[:count][valid])
+            hash_parts.append(h[valid])
+
+        return np.concatenate(row_parts), self._to_buckets(np.concatenate(hash_parts)), len(texts)
+
+    def _scores(self, row_ids, buckets, n_rows):
+        import numpy as np
+        counts = np.bincount(row_ids, minlength=n_rows).astype(np.float32)
+        inv = 1.0 / np.maximum(counts, 1.0)
+        sums = np.stack(
+            [np.bincount(row_ids, weights=self.weights[:, j].take(buckets), minlength=n_rows)
+             for j in range(len(self.labels))],
+            axis=1,
+        )
+        return self.bias + sums * inv[:, None]
+
+    @staticmethod
+    def _softmax(scores):
+        import numpy as np
+        scores = scores - scores.max(axis=1, keepdims=True)
+        exp = np.exp(scores)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict_proba(self, texts: Sequence[str]):
+        """Class probabilities, shape (len(texts), len(labels))."""
+        return self._softmax(self._scores(*self.featurize(texts)))
+
+    def predict_batch(self, texts: Sequence[str]) -> Tuple[List[str], List[float]]:
+        """Returns (labels, confidences) for every text."""
+        proba = self.predict_proba(texts)
+        best = proba.argmax(axis=1)
+        return [self.labels[i] for i in best], proba[range(len(best)), best].tolist()
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """Single-sentence fast path: one gather and a mean over the weight table."""
+        import numpy as np
+        codes = self._codes(" " + (text or "").lower() + " ")
+        buckets = self._to_buckets(np.concatenate([h for _, h in self._ngram_hashes(codes)]))
+        scores = self.bias + self.weights.take(buckets, axis=0).sum(axis=0) / len(buckets)
+        exp = np.exp(scores - scores.max())
+        best = int(exp.argmax())
+        return self.labels[best], float(exp[best] / exp.sum())
+
+def train(examples: Iterable[Tuple[str, str]], n_buckets: int = 2 ** 16, ngram_range: Tuple[int, int] = (1, 4),
+          labels: Sequence[str] = LABELS, epochs: int = 30, learning_rate: float = 5.0,
+          batch_size: int = 32, seed: int = 0) -> NgramLanguageID:
+    """Fits a multinomial logistic regression over hashed n-grams with mini-batch gradient descent."""
+    import numpy as np
+    examples = [(text, label) for text, label in examples if label in labels]
+    if not examples:
+        raise ValueError("No training examples with a known label")
+
+    model = NgramLanguageID(np.zeros((n_buckets, len(labels))), np.zeros(len(labels)), ngram_range, labels)
+    label_index = {label: i for i, label in enumerate(labels)}
+    targets = np.array([label_index[label] for _, label in examples])
+    texts = [text for text, _ in examples]
+    rng = np.random.default_rng(seed)
+
+    for epoch in range(epochs):
+        order = rng.permutation(len(examples))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            row_ids, buckets, n_rows = model.featurize([texts[i] for i in batch])
+            proba = model._softmax(model._scores(row_ids, buckets, n_rows))
+
+            # Summed (not averaged) over the batch, i.e. per-example SGD steps
+            grad = proba
+            grad[np.arange(n_rows), targets[batch]] -= 1.0
+            inv = 1.0 / np.maximum(np.bincount(row_ids, minlength=n_rows), 1)
+            # Each n-gram occurrence carries its row's gradient scaled by 1/len (the mean in _scores)
+            grad_w = np.zeros_like(model.weights)
+            np.add.at(grad_w, buckets, (grad * inv[:, None])[row_ids].astype(np.float32))
+            model.weights -= learning_rate * grad_w
+            model.bias -= learning_rate / n_rows * grad.sum(axis=0).astype(np.float32)
+
+        if (epoch + 1) % 10 == 0:
+            accuracy = (model.predict_proba(texts).argmax(axis=1) == targets).mean()
+            logger.info(f"epoch {epoch + 1}: train accuracy {accuracy:.3f}")
+    return model
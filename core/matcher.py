@@ -0,0 +1,333 @@
+import re
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Positions where \b holds; candidate match starts are taken from these
+_BOUNDARY = re.compile(r'\b')
+_END = None
+
+def _is_word(ch: str) -> bool:
+    # Same notion of a word character as re's \w
+    return ch.isalnum() or ch == "_"
+
+class TermMatcher:
+    """
+    Case-insensitive whole-word matcher over a fixed set of terms.
+    Terms are compiled once into a character trie, and a text is scanned in a single
+    left-to-right pass: at each word boundary the longest term ending on a word boundary
+    wins, and scanning resumes after it (leftmost, longest-match-first).
+    Matches the semantics of re.search(r'\\b' + re.escape(term) + r'\\b', text, re.IGNORECASE).
+    With flexible_whitespace, a space inside a multi-word term matches any run of whitespace.
+    """
+    def __init__(self, terms: Iterable[Tuple[str, object]] = (), flexible_whitespace: bool = False):
+        self._root: Dict = {}
+        self.size = 0
+        self.flexible_whitespace = flexible_whitespace
+        for term, value in terms:
+            self.add(term, value)
+
+    def add(self, term: str, value: object = None):
+        """Adds a term; the first value registered for a (case-folded) term is kept."""
+        term = str(term)
+        if self.flexible_whitespace:
+            term = " ".join(term.split())
+        if not term:
+            return
+        node = self._root
+        for ch in term:
+            node = node.setdefault(ch.lower(), {})
+        if _END not in node:
+            node[_END] = term if value is None else value
+            self.size += 1
+
+    def __len__(self):
+        return self.size
+
+    def find_all(self, text: str) -> List[Tuple[int, int, object]]:
+        """Returns non-overlapping (start, end, value) matches in text order."""
+        if not self._root or not text:
+            return []
+
+        # Fold case once; fall back to per-character folding when lower() changes the length
+        folded = text.lower()
+        if len(folded) != len(text):
+            folded = [ch.lower() for ch in text]
+
+        n = len(text)
+        root = self._root
+        flexible = self.flexible_whitespace
+        matches = []
+        resume = 0
+        for boundary in _BOUNDARY.finditer(text):
+            start = boundary.start()
+            if start < resume or start >= n:
+                continue
+            node = root.get(folded[start])
+            if node is None:
+                continue
+
+            end = start + 1
+            longest = None
+            while True:
+                if _END in node and self._boundary_at(text, end, n):
+                    longest = (end, node[_END])
+                if end == n:
+                    break
+                ch = folded[end]
+                if flexible and ch.isspace():
+                    # The whole whitespace run stands for the single space in the term
+                    node = node.get(" ")
+                    if node is None:
+                        break
+                    end += 1
+                    while end < n and folded[end].isspace():
+                        end += 1
+                    continue
+                node = node.get(ch)
+                if node is None:
+                    break
+                end += 1
+
+            if longest is not None:
+                matches.append((start, longest[0], longest[1]))
+                resume = longest[0]
+        return matches
+
+    @staticmethod
+    def _boundary_at(text: str, pos: int, n: int) -> bool:
+        before = _is_word(text[pos - 1])
+        after = _is_word(text[pos]) if pos < n else False
+        return before != after
+
+    def contains_any(self, text: str) -> bool:
+        return bool(self.find_all(text))
+
+    def replace(self, text: str, replacement: Callable[[str, object], str]) -> str:
+        """Rebuilds text with every match replaced by replacement(matched_text, value)."""
+        matches = self.find_all(text)
+        if not matches:
+            return text
+        pieces = []
+        last = 0
+        for start, end, value in matches:
+            pieces.append(text[last:start])
+            pieces.append(replacement(text[start:end], value))
+            last = end
+        pieces.append(text[last:])
+        return "".join(pieces)
+
+# Splits text into alternating [gap, word, gap, ..., word, gap]; words are maximal \w runs,
+# so word edges are exactly the \b positions
+_WORD_SPLIT = re.compile(r'(\w+)')
+_WHITESPACE_RUN = re.compile(r'\s+')
+_start = itemgetter(0)
+# Maps every ASCII non-word byte to a space, so bytes.split() yields the \w runs of ASCII text
+_ASCII_NON_WORD = bytes(c if c < 128 and _is_word(chr(c)) else 32 for c in range(256))
+
+class PhraseMatcher:
+    """
+    Whole-word matcher over terms that start and end with a word character.
+    Same results as TermMatcher, but works on word tokens: the trie is keyed by words
+    (and the gap before each word) instead of characters, so a match costs one dict
+    lookup per word, and a set check skips texts without any term's first word.
+    ASCII text is tokenized with bytes.translate and str.split, and only the words that
+    start a term are located in it; other text goes through one compiled-regex split.
+    """
+    def __init__(self, terms: Iterable[Tuple[str, object]] = (), flexible_whitespace: bool = False):
+        self._root: Dict = {}
+        # Words that are a whole term and start no longer one, for the ASCII scan:
+        # word -> (" word ", len(word) + 1, value), so no trie walk is needed
+        self._single: Dict[str, Tuple[str, int, object]] = {}
+        # First words of multi-word terms
+        self._phrase_starts = set()
+        self.size = 0
+        self.flexible_whitespace = flexible_whitespace
+        for term, value in terms:
+            self.add(term, value)
+
+    @staticmethod
+    def supports(term: str) -> bool:
+        term = str(term).strip()
+        return bool(term) and _is_word(term[0]) and _is_word(term[-1])
+
+    def _gap(self, gap: str) -> str:
+        if self.flexible_whitespace and gap != " ":
+            return " " if gap.isspace() else _WHITESPACE_RUN.sub(" ", gap)
+        return gap
+
+    def add(self, term: str, value: object = None):
+        """Adds a term; the first value registered for a (case-folded) term is kept."""
+        term = str(term)
+        if self.flexible_whitespace:
+            term = " ".join(term.split())
+        if not term:
+            return
+        if not self.supports(term):
+            raise ValueError(f"PhraseMatcher terms must start and end with a word character: {term!r}")
+        # Split before folding, as _scan does, so case folding cannot change the word structure
+        parts = [part.lower() for part in _WORD_SPLIT.split(term)]
+        node = self._root.setdefault(parts[1], {})
+        for k in range(3, len(parts), 2):
+            node = node.setdefault((self._gap(parts[k - 1]), parts[k]), {})
+        if _END not in node:
+            node[_END] = term if value is None else value
+            self.size += 1
+        first = self._root[parts[1]]
+        if len(first) == 1 and _END in first:
+            self._single[parts[1]] = (f" {parts[1]} ", len(parts[1]) + 1, first[_END])
+        else:
+            self._single.pop(parts[1], None)
+            self._phrase_starts.add(parts[1])
+
+    def __len__(self):
+        return self.size
+
+    def _scan_ascii(self, text: str) -> List[Tuple[int, int, object]]:
+        """
+        find_all for ASCII text, without the regex split. Only the words that are in the
+        trie are located, by searching for " word " in the space-delimited lowercase copy.
+        """
+        root = self._root
+        # Lowercased, with every non-word character turned into a space: same length as text,
+        # and the index of the space before a word in `padded` is the word's start in text
+        mapped = text.lower().encode("ascii").translate(_ASCII_NON_WORD).decode("ascii")
+        found = root.keys() & mapped.split()
+        # Most messages contain no term
+        if not found:
+            return []
+        padded = f" {mapped} "
+
+        matches = []
+        starts = found & self._phrase_starts
+        if starts:
+            # Leftmost-longest over the occurrences of words that begin a phrase
+            occurrences = sorted((start, word) for word in starts for start in self._occurrences(padded, f" {word} "))
+            covered = 0
+            for start, word in occurrences:
+                if start < covered:
+                    continue
+                match = self._walk(text, padded, start, word)
+                if match is not None:
+                    matches.append(match)
+                    covered = match[1]
+            found -= starts
+
+        single = self._single
+        for word in found:
+            key, length, value = single[word]
+            for start in self._occurrences(padded, key):
+                matches.append((start, start + length - 1, value))
+        if starts and matches:
+            # Drop single words inside a phrase match
+            matches.sort(key=_start)
+            kept = []
+            covered = 0
+            for match in matches:
+                if match[0] >= covered:
+                    kept.append(match)
+                    covered = match[1]
+            return kept
+        if len(found) > 1:
+            matches.sort(key=_start)
+        return matches
+
+    @staticmethod
+    def _occurrences(padded: str, key: str) -> List[int]:
+        positions = []
+        start = padded.find(key)
+        while start >= 0:
+            positions.append(start)
+            start = padded.find(key, start + len(key) - 1)
+        return positions
+
+    def _walk(self, text: str, padded: str, start: int, word: str):
+        """Longest term starting with the word at text[start:], as (start, end, value), or None."""
+        node = self._root[word]
+        # Positions in padded: the word's end, where its trailing space is
+        end = start + 1 + len(word)
+        longest = (start, end - 1, node[_END]) if _END in node else None
+        # Only phrase prefixes have children beyond the end marker
+        while len(node) > (_END in node):
+            rest = padded[end:]
+            next_start = end + len(rest) - len(rest.lstrip(" "))
+            next_end = padded.find(" ", next_start)
+            if next_end < 0:
+                break
+            gap = text[end - 1:next_start - 1].lower()
+            if self.flexible_whitespace and gap != " " and gap.split() != [gap]:
+                gap = " " if gap.isspace() else _WHITESPACE_RUN.sub(" ", gap)
+            node = node.get((gap, padded[next_start:next_end]))
+            if node is None:
+                break
+            end = next_end
+            if _END in node:
+                longest = (start, end - 1, node[_END])
+        return longest
+
+    def _scan(self, text: str):
+        """Returns (parts, [(first_part, last_part, value)]) with indices into the split text."""
+        root = self._root
+        parts = _WORD_SPLIT.split(text)
+        # Fold all words with one lower() call; parts keeps the original spelling
+        words = "\0".join(parts[1::2]).lower().split("\0")
+        if root.keys().isdisjoint(words):
+            return parts, []
+
+        flexible = self.flexible_whitespace
+        spans = []
+        count = len(words)
+        resume = 0
+        for i in [i for i, word in enumerate(words) if word in root]:
+            if i < resume:
+                continue
+            node = root[words[i]]
+            longest = i if _END in node else -1
+            value = node.get(_END)
+            j = i
+            # Only phrase prefixes have children beyond the end marker
+            while len(node) > (_END in node) and j + 1 < count:
+                gap = parts[2 * j + 2].lower()
+                if flexible and gap != " ":
+                    gap = " " if gap.isspace() else _WHITESPACE_RUN.sub(" ", gap)
+                node = node.get((gap, words[j + 1]))
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    longest, value = j, node[_END]
+
+            if longest >= 0:
+                spans.append((2 * i + 1, 2 * longest + 1, value))
+                resume = longest + 1
+        return parts, spans
+
+    def find_all(self, text: str) -> List[Tuple[int, int, object]]:
+        """Returns non-overlapping (start, end, value) matches in text order."""
+        if not self._root or not text:
+            return []
+        if text.isascii():
+            return self._scan_ascii(text)
+        parts, spans = self._scan(text)
+        if not spans:
+            return []
+        offsets = [0]
+        for part in parts:
+            offsets.append(offsets[-1] + len(part))
+        return [(offsets[first], offsets[last + 1], value) for first, last, value in spans]
+
+    def contains_any(self, text: str) -> bool:
+        return bool(self.find_all(text))
+
+    def replace(self, text: str, replacement: Callable[[str, object], str]) -> str:
+        """Rebuilds text with every match replaced by replacement(matched_text, value)."""
+        matches = self.find_all(text)
+        if not matches:
+            return text
+        pieces = []
+        last = 0
+        for start, end, value in matches:
+            pieces.append(text[last:start])
+            pieces.append(replacement(text[start:end], value))
+            last = end
+        pieces.append(text[last:])
+        return "".join(pieces)
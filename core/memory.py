@@ -0,0 +1,255 @@
+import csv
+import gzip
+import json
+import logging
+import math
+import os
+import threading
+import xml.etree.ElementTree as ElementTree
+from array import array
+from typing import Dict, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# TMX / CSV language codes to the names the pipeline uses
+LANG_CODES = {"en": "English", "hi": "Hindi", "kn": "Kannada", "mr": "Marathi", "hi-latn": "Hinglish"}
+_XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+# Below this many candidates, scoring by set intersection beats more posting-list passes
+_VERIFY_DIRECTLY = 4
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+def _trigrams(normalized: str) -> set:
+    padded = f" {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _lang_name(code: str) -> str:
+    return LANG_CODES.get(code.lower(), LANG_CODES.get(code.lower().split("-")[0], code))
+
+class _Index:
+    """Entries of one target language with a trigram -> entry ids inverted index."""
+    def __init__(self):
+        self.sources: List[str] = []
+        self.targets: List[str] = []
+        self.source_langs: List[str] = []
+        # Trigram count per entry, grown by doubling; readers slice a snapshot of it
+        self.sizes = np.zeros(1024, dtype=np.uint32)
+        self.exact: Dict[str, int] = {}
+        self.gram_ids: Dict[str, int] = {}
+        # array('I') keeps a posting at 4 bytes instead of a pointer plus an int object;
+        # ids are appended in increasing order, so every posting list is sorted
+        self.postings: List[array] = []
+
+class TranslationMemory:
+    """
+    Earlier (post-edited) translations, looked up by fuzzy match on the source sentence.
+    Similarity is the Dice coefficient of the character-trigram sets of the lowercased,
+    whitespace-collapsed sources, and lookups are exact. Candidates come only from the
+    postings of the query's rarest trigrams (a sentence sharing none of them cannot reach
+    the threshold) and must fit the length bounds the threshold allows. Their overlap is
+    then counted against the remaining, more common trigrams with vectorized searches of
+    the sorted posting lists, dropping candidates as soon as they can no longer reach the
+    threshold.
+    Entries are kept per target language; adding a source that is already stored
+    replaces its translation.
+    """
+    def __init__(self, threshold: float = 0.9):
+        self.threshold = threshold
+        self.version = 0
+        self._indexes: Dict[str, _Index] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(index.sources) for index in self._indexes.values())
+
+    def add(self, source: str, target: str, source_lang: str = "", target_lang: str = "Hindi"):
+        key = _normalize(source)
+        if not key or not target:
+            return
+        with self._lock:
+            index = self._indexes.setdefault(target_lang, _Index())
+            self.version += 1
+            existing = index.exact.get(key)
+            if existing is not None:
+                index.targets[existing] = target
+                index.source_langs[existing] = source_lang
+                return
+
+            entry = len(index.sources)
+            grams = _trigrams(key)
+            # Entry data first, postings last: lock-free readers never see a posting without its entry
+            if entry == len(index.sizes):
+                grown = np.zeros(2 * entry, dtype=np.uint32)
+                grown[:entry] = index.sizes
+                index.sizes = grown
+            index.sizes[entry] = len(grams)
+            index.sources.append(source)
+            index.targets.append(target)
+            index.source_langs.append(source_lang)
+            for gram in grams:
+                gram_id = index.gram_ids.get(gram)
+                if gram_id is None:
+                    gram_id = index.gram_ids[gram] = len(index.postings)
+                    index.postings.append(array("I"))
+                index.postings[gram_id].append(entry)
+            index.exact[key] = entry
+
+    def lookup(self, text: str, target_lang: str, threshold: float = None) -> Optional[Dict]:
+        """Best entry at or above the threshold as {source, target, source_lang, similarity}, else None."""
+        index = self._indexes.get(target_lang)
+        if index is None:
+            return None
+        threshold = self.threshold if threshold is None else threshold
+        key = _normalize(text)
+        if not key:
+            return None
+        entry = index.exact.get(key)
+        if entry is not None:
+            return self._match(index, entry, 1.0)
+        if threshold >= 1.0:
+            return None
+
+        grams = _trigrams(key)
+        size = len(grams)
+        # Bounds get a small slack: float rounding must not prune a candidate exactly at the
+        # threshold (12 * 0.8 / 1.2 == 8.000000000000002)
+        min_overlap = math.ceil(threshold * size / (2 - threshold) - 1e-9)
+        postings = sorted(
+            (index.postings[gram_id] for gram_id in (index.gram_ids.get(gram) for gram in grams) if gram_id is not None),
+            key=len,
+        )
+        # Any size - min_overlap + 1 query grams must include a shared one; unknown grams
+        # are the rarest of all but can never be shared
+        prefix = size - min_overlap + 1 - (size - len(postings))
+        if prefix <= 0:
+            return None
+
+        sizes = index.sizes
+        candidates, overlap = np.unique(
+            np.concatenate([np.array(posting, dtype=np.uint32) for posting in postings[:prefix]]), return_counts=True
+        )
+        candidate_sizes = sizes[candidates].astype(np.float64)
+        keep = ((candidate_sizes >= size * threshold / (2 - threshold) - 1e-9)
+                & (candidate_sizes <= size * (2 - threshold) / threshold + 1e-9))
+        candidates, overlap, candidate_sizes = candidates[keep], overlap[keep], candidate_sizes[keep]
+        needed = threshold * (size + candidate_sizes) / 2 - 1e-9
+
+        rest = postings[prefix:]
+        for k, posting in enumerate(rest):
+            if len(candidates) <= _VERIFY_DIRECTLY:
+                break
+            alive = overlap + (len(rest) - k) >= needed
+            if not alive.all():
+                candidates, overlap, candidate_sizes, needed = (
+                    candidates[alive], overlap[alive], candidate_sizes[alive], needed[alive]
+                )
+            ids = np.array(posting, dtype=np.uint32)
+            found = np.minimum(np.searchsorted(ids, candidates), len(ids) - 1)
+            overlap = overlap + (ids[found] == candidates)
+        else:
+            if len(candidates):
+                similarity = 2 * overlap / (size + candidate_sizes)
+                best = int(np.argmax(similarity))
+                if similarity[best] >= threshold:
+                    return self._match(index, int(candidates[best]), float(similarity[best]))
+            return None
+
+        best, best_similarity = None, threshold
+        for candidate in candidates.tolist():
+            other = _trigrams(_normalize(index.sources[candidate]))
+            similarity = 2 * len(grams & other) / (size + len(other))
+            if similarity > best_similarity or (best is None and similarity >= best_similarity):
+                best, best_similarity = candidate, similarity
+        return self._match(index, best, best_similarity) if best is not None else None
+
+    @staticmethod
+    def _match(index: _Index, entry: int, similarity: float) -> Dict:
+        return {
+            "source": index.sources[entry],
+            "target": index.targets[entry],
+            "source_lang": index.source_langs[entry],
+            "similarity": similarity,
+        }
+
+    def import_csv(self, path: str, target_lang: str = "Hindi", source_lang: str = "") -> int:
+        """
+        Adds rows of a CSV with Source and Target columns (case-insensitive); optional
+        SourceLang/TargetLang columns override the defaults. Returns the rows added.
+        """
+        added = 0
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            columns = {name.lower().replace("_", ""): name for name in reader.fieldnames or []}
+            if "source" not in columns or "target" not in columns:
+                raise ValueError(f"CSV must have 'Source' and 'Target' columns. Found: {reader.fieldnames}")
+            for row in reader:
+                row_target = row.get(columns.get("targetlang", ""), "") or target_lang
+                row_source = row.get(columns.get("sourcelang", ""), "") or source_lang
+                self.add(row[columns["source"]], row[columns["target"]], _lang_name(row_source) if row_source else "",
+                         _lang_name(row_target))
+                added += 1
+        return added
+
+    def import_tmx(self, path: str, source_code: str = None, target_code: str = "hi") -> int:
+        """
+        Adds the translation units of a TMX file, streamed so large files are not held in
+        memory. source_code defaults to the header's srclang. Returns the units added.
+        """
+        added = 0
+        source_code = source_code.lower() if source_code else None
+        target_code = target_code.lower()
+        for event, element in ElementTree.iterparse(path, events=("start", "end")):
+            tag = element.tag.rsplit("}", 1)[-1]
+            if event == "start":
+                if tag == "header" and source_code is None:
+                    source_code = (element.get("srclang") or "en").lower()
+                continue
+            if tag != "tu":
+                continue
+            segments = {}
+            for tuv in element.iter():
+                if tuv.tag.rsplit("}", 1)[-1] != "tuv":
+                    continue
+                lang = (tuv.get(_XML_LANG) or tuv.get("lang") or "").lower()
+                seg = next((child for child in tuv if child.tag.rsplit("}", 1)[-1] == "seg"), None)
+                if seg is not None:
+                    segments[lang] = "".join(seg.itertext())
+            source = self._pick(segments, source_code)
+            target = self._pick(segments, target_code)
+            if source and target:
+                self.add(source, target, _lang_name(source_code), _lang_name(target_code))
+                added += 1
+            element.clear()
+        return added
+
+    @staticmethod
+    def _pick(segments: Dict[str, str], code: str) -> Optional[str]:
+        """Segment for a language code; otherwise one whose base language matches ('en' and 'en-US')."""
+        if code in segments:
+            return segments[code]
+        base = code.split("-")[0]
+        return next((text for lang, text in segments.items() if lang.split("-")[0] == base), None)
+
+    def save(self, path: str):
+        """Writes every entry as gzip-compressed jsonl ([source, target, source_lang, target_lang] per line)."""
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_path = path + ".tmp"
+        with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+            for target_lang, index in list(self._indexes.items()):
+                for source, target, source_lang in zip(list(index.sources), list(index.targets), list(index.source_langs)):
+                    f.write(json.dumps([source, target, source_lang, target_lang], ensure_ascii=False) + "\n")
+        os.replace(temp_path, path)
+
+    def load(self, path: str) -> int:
+        """Adds the entries of a file written by save(); the index is rebuilt as they load. Returns the count."""
+        count = 0
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    self.add(*json.loads(line))
+                    count += 1
+        return count
@@ -0,0 +1,223 @@
+import json
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _key(name: str, labels: Dict) -> Tuple:
+    return (name, tuple(sorted(labels.items())))
+
+class MetricsRegistry:
+    """
+    In-process counters and histograms keyed by name and labels.
+    A disabled registry returns from every call at once, so instrumented code pays one
+    attribute check; loops that only feed metrics should test `enabled` first.
+    """
+    def __init__(self, enabled: bool = True, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+        self._counters: Dict[Tuple, float] = {}
+        self._histograms: Dict[Tuple, List] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # Per-bucket counts (last one is +Inf), sum, count
+                histogram = self._histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            counts = histogram[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def snapshot(self) -> Dict:
+        """JSON-serializable copy of every metric; see merge_snapshots and render_prometheus."""
+        with self._lock:
+            return {
+                "buckets": list(self.buckets),
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in self._counters.items()
+                ],
+                "histograms": [
+                    {"name": name, "labels": dict(labels), "counts": list(counts), "sum": total, "count": count}
+                    for (name, labels), (counts, total, count) in self._histograms.items()
+                ],
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+def merge_snapshots(snapshots: List[Dict]) -> Dict:
+    """Adds up snapshots from several processes (same bucket bounds assumed)."""
+    counters: Dict[Tuple, Dict] = {}
+    histograms: Dict[Tuple, Dict] = {}
+    for snapshot in snapshots:
+        for counter in snapshot["counters"]:
+            key = _key(counter["name"], counter["labels"])
+            if key in counters:
+                counters[key]["value"] += counter["value"]
+            else:
+                counters[key] = dict(counter)
+        for histogram in snapshot["histograms"]:
+            key = _key(histogram["name"], histogram["labels"])
+            if key in histograms:
+                merged = histograms[key]
+                merged["counts"] = [a + b for a, b in zip(merged["counts"], histogram["counts"])]
+                merged["sum"] += histogram["sum"]
+                merged["count"] += histogram["count"]
+            else:
+                histograms[key] = {**histogram, "counts": list(histogram["counts"])}
+    buckets = snapshots[0]["buckets"] if snapshots else list(DEFAULT_BUCKETS)
+    return {"buckets": buckets, "counters": list(counters.values()), "histograms": list(histograms.values())}
+
+def _labels_text(labels: Dict) -> str:
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+def render_prometheus(snapshot: Dict) -> str:
+    """Prometheus text exposition format (0.0.4) of a snapshot."""
+    lines = []
+    typed = set()
+    for counter in sorted(snapshot["counters"], key=lambda c: c["name"]):
+        if counter["name"] not in typed:
+            typed.add(counter["name"])
+            lines.append(f"# TYPE {counter['name']} counter")
+        lines.append(f"{counter['name']}{_labels_text(counter['labels'])} {counter['value']}")
+
+    bounds = [str(bound) for bound in snapshot["buckets"]] + ["+Inf"]
+    for histogram in sorted(snapshot["histograms"], key=lambda h: h["name"]):
+        name, labels = histogram["name"], histogram["labels"]
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, count in zip(bounds, histogram["counts"]):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels_text({**labels, 'le': bound})} {cumulative}")
+        lines.append(f"{name}_sum{_labels_text(labels)} {histogram['sum']}")
+        lines.append(f"{name}_count{_labels_text(labels)} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+class PrometheusExporter:
+    """Serves collect() in Prometheus text format at http://host:port/metrics from a daemon thread."""
+    def __init__(self, collect: Callable[[], Dict], port: int, host: str = "127.0.0.1"):
+        self.collect = collect
+        self.port = port
+        self.host = host
+        self._server = None
+
+    def start(self):
+        collect = self.collect
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                try:
+                    body = render_prometheus(collect()).encode("utf-8")
+                except Exception as e:
+                    logger.error(f"Failed to collect metrics: {e}")
+                    self.send_error(500)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would flood the app log
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+class JsonExporter:
+    """Writes collect() to a JSON file every `interval` seconds and once more on stop."""
+    def __init__(self, collect: Callable[[], Dict], path: str, interval: float = 60.0):
+        self.collect = collect
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def export(self):
+        try:
+            snapshot = self.collect()
+        except Exception as e:
+            logger.error(f"Failed to collect metrics: {e}")
+            return
+        # A failed write (disk full, permissions) is logged; the next interval tries again
+        try:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=2)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to write metrics to {self.path}: {e}")
+
+    def start(self):
+        def loop():
+            while not self._stop.wait(self.interval):
+                self.export()
+
+        self._thread = threading.Thread(target=loop, name="metrics-json", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.export()
+
+def start_exporters(collect: Callable[[], Dict], config: Dict) -> List:
+    """Starts the exporters enabled in the config; call stop() on each at shutdown."""
+    exporters = []
+    if not config["METRICS_ENABLED"]:
+        return exporters
+    if config["METRICS_PORT"] > 0:
+        exporters.append(PrometheusExporter(collect, config["METRICS_PORT"]))
+    if config["METRICS_JSON_PATH"]:
+        exporters.append(JsonExporter(collect, config["METRICS_JSON_PATH"], config["METRICS_JSON_INTERVAL"]))
+    for exporter in exporters:
+        exporter.start()
+    return exporters
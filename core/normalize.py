@@ -1,15 +1,23 @@
 import json
 import re
 import os
+from typing import List
 from indic_transliteration import sanscript
 from indic_transliteration import sanscript
+from .matcher import PhraseMatcher, TermMatcher
+from .transliterate import Transliterator
 
 class Normalizer:
-    def __init__(self, slang_map_path: str = None):
+    def __init__(self, slang_map_path: str = None, transliterator: Transliterator = None, strict: bool = False):
+        """With strict, a missing slang map file raises instead of falling back to the inline default."""
+        # Shared across reloads by the ResourceStore so the word cache stays warm
+        self.transliterator = transliterator or Transliterator()
         self.slang_map = {}
         if slang_map_path and os.path.exists(slang_map_path):
             with open(slang_map_path, 'r', encoding='utf-8') as f:
                 self.slang_map = json.load(f)
+        elif strict and slang_map_path:
+            raise FileNotFoundError(f"Slang map not found: {slang_map_path}")
         else:
             # Fallback inline default
             self.slang_map = {
@@ -18,22 +26,28 @@ class Normalizer:
                 "sem": "semester",
                 "prof": "professor"
             }
+        # Compiled once per map; multi-word keys match across any whitespace run.
+        # The word-level matcher covers the usual keys, the character trie handles keys
+        # that start or end with punctuation
+        matcher_cls = PhraseMatcher if all(PhraseMatcher.supports(k) for k in self.slang_map) else TermMatcher
+        self.slang_matcher = matcher_cls(self.slang_map.items(), flexible_whitespace=True)
 
     def normalize_slang(self, text: str) -> str:
-        """Replaces known slang words with formal alternatives."""
-        words = text.split()
-        normalized_words = []
-        for word in words:
-            lower_word = word.lower().strip(".,!?")
-            if lower_word in self.slang_map:
-                # Replace but try to keep casing if original was Capitalized
-                replacement = self.slang_map[lower_word]
-                if word[0].isupper():
-                    replacement = replacement.capitalize()
-                normalized_words.append(replacement)
-            else:
-                normalized_words.append(word)
-        return " ".join(normalized_words)
+        """Replaces known slang words and phrases with formal alternatives, leaving spacing and punctuation as-is."""
+        return self.slang_matcher.replace(text, self._slang_replacement)
+
+    def normalize_slang_batch(self, texts: List[str]) -> List[str]:
+        """Batch entry point for normalize_slang."""
+        replace = self.slang_matcher.replace
+        replacement = self._slang_replacement
+        return [replace(text, replacement) for text in texts]
+
+    @staticmethod
+    def _slang_replacement(matched: str, replacement: str) -> str:
+        # Keep casing if original was Capitalized
+        if matched[0].isupper():
+            return replacement.capitalize()
+        return replacement
 
     def transliterate_to_devanagari(self, text: str) -> str:
         """
@@ -44,6 +58,6 @@ class Normalizer:
         # We'll use HK (Harvard-Kyoto) or ITRANS. HK is often simpler for general chat typing.
         # Let's try to trust the library's best effort for Roman -> Devanagari.
         try:
-            return sanscript.transliterate(text, sanscript.ITRANS, sanscript.DEVANAGARI)
+            return self.transliterator.transliterate(text)
         except Exception:
             return text
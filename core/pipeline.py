@@ -1,53 +1,143 @@
 import os
 import logging
-from .utils import load_config
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
+from .utils import StageTimer, load_config, startup_profile
+from .metrics import MetricsRegistry
+from .backends import load_translation_model
 from .lang_detect import LanguageDetector
-from .normalize import Normalizer
-from .glossary import GlossaryManager
+from .memory import TranslationMemory
+from .registry import ModelRegistry, pair_route
 from .quality_check import QualityChecker
-from transformers import MarianMTModel, MarianTokenizer
+from .scheduler import BatchScheduler
+from .cache import TranslationCache
+from .document import translate_document
+from .resources import Resources, ResourceStore
+from .transliterate import Transliterator
 
 logger = logging.getLogger(__name__)
 
+# Route names recorded in the logs and used to group batched requests
+ROUTE_EN_HI = "en-hi"
+ROUTE_HI_EN = "hi-en"
+ROUTE_TRANSLITERATE = "transliterate"
+ROUTE_IDENTITY = "identity"
+ROUTE_SPANS = "spans"
+ROUTE_MEMORY = "memory"
+
 class TranslationPipeline:
     def __init__(self):
         self.config = load_config()
-        self.lang_detector = LanguageDetector()
-        self.normalizer = Normalizer("data/slang_map.json")
-        self.glossary_manager = GlossaryManager("data/glossary_example.csv")
-        self.quality_checker = QualityChecker()
+        # Disabled by default; a disabled registry ignores every call
+        self.metrics = MetricsRegistry(enabled=self.config["METRICS_ENABLED"])
+        self.lang_detector = LanguageDetector(self.config["LANGID_MODEL_PATH"], self.config["LANGID_MIN_CONFIDENCE"])
+        # Slang map and glossary live in a versioned store so edits apply without a restart
+        self.resources = ResourceStore(
+            "data/slang_map.json", "data/glossary_example.csv",
+            Transliterator(self.config["TRANSLIT_CACHE_SIZE"], self.config["TRANSLIT_COMPILED"]),
+        )
+        self.quality_checker = QualityChecker(
+            self.config["QE_CACHE_SIZE"], self.config["QE_HALF_PRECISION"],
+            self.config["INFERENCE_BACKEND"], self.config["ONNX_EXPORT_DIR"],
+        )
+        self.scheduler = BatchScheduler(
+            max_tokens=self.config["MAX_BATCH_TOKENS"],
+            max_batch_size=self.config["MAX_BATCH_SIZE"],
+            metrics=self.metrics,
+        )
+        self.memory = TranslationMemory(self.config["TM_THRESHOLD"])
+        if self.config["TM_PATH"] and os.path.exists(self.config["TM_PATH"]):
+            try:
+                logger.info(f"Loaded {self.memory.load(self.config['TM_PATH'])} translation memory entries")
+            except Exception as e:
+                logger.error(f"Failed to load translation memory {self.config['TM_PATH']}: {e}")
+        self.cache = None
+        if self.config["CACHE_SIZE"] > 0:
+            self.cache = TranslationCache(self.config["CACHE_SIZE"], self.config["CACHE_PATH"])
+            # Entries of an old version can never hit again, so free them on every swap
+            self.resources.add_listener(lambda resources: self.cache.clear())
+        if self.config["RESOURCE_POLL_SECONDS"] > 0:
+            self.resources.start_watching(self.config["RESOURCE_POLL_SECONDS"])
         
-        # Cache for models
-        self.models = {}
-        self.tokenizers = {}
+        # Translation models per language pair, loaded on demand within MODEL_MEMORY_MB
+        self.registry = ModelRegistry.from_config(
+            self.config,
+            lambda name: load_translation_model(name, self.config["INFERENCE_BACKEND"], self.config["ONNX_EXPORT_DIR"]),
+            self.metrics,
+        )
+        # Chunks of a long document are translated concurrently on these threads
+        self._document_executor = ThreadPoolExecutor(
+            max_workers=max(1, self.config["DOC_CONCURRENCY"]), thread_name_prefix="document"
+        )
 
     def load_model(self, model_name):
-        if model_name not in self.models:
-            logger.info(f"Loading model: {model_name}")
-            try:
-                self.tokenizers[model_name] = MarianTokenizer.from_pretrained(model_name)
-                self.models[model_name] = MarianMTModel.from_pretrained(model_name)
-            except Exception as e:
-                logger.error(f"Failed to load model {model_name}: {e}")
-        return self.tokenizers.get(model_name), self.models.get(model_name)
+        return self.registry.get(model_name)
 
-    def translate(self, text, source_lang_hint=None, target_lang="Hindi"):
+    def model_stats(self) -> Dict:
+        return self.registry.stats()
+
+    def warmup(self, background=True) -> List[Future]:
         """
-        Main pipeline execution.
+        Loads the configured translation models and the QE model in parallel.
+        With background=True this returns immediately; the futures complete when loading is done.
+        """
+        model_names = [self.registry.model_for("English", "Hindi"), self.registry.model_for("Hindi", "English")]
+        executor = ThreadPoolExecutor(max_workers=len(model_names) + 1, thread_name_prefix="warmup")
+        futures = [executor.submit(self.load_model, name) for name in model_names]
+        futures.append(executor.submit(self.quality_checker.load_model))
+        executor.shutdown(wait=not background)
+        return futures
+
+    def startup_report(self) -> str:
+        """Import, model-load and first-inference timings per component."""
+        return startup_profile.format_report()
+
+    @property
+    def normalizer(self):
+        return self.resources.current().normalizer
+
+    @property
+    def glossary_manager(self):
+        return self.resources.current().glossary_manager
+
+    def reload_resources(self) -> int:
+        """Re-reads the slang map and glossary now. Returns the resource version in use afterwards."""
+        self.resources.reload()
+        return self.resources.current().version
+
+    def _prepare(self, text, target_lang="Hindi", resources: Resources = None) -> Dict:
         """
-        steps_log = {}
+        Runs detection, normalization and route selection for one input.
+        Returns a job dict whose segments with a 'model_name' still need neural translation.
+        """
+        resources = resources or self.resources.current()
+        timer = StageTimer()
+        steps_log = {"timings_ms": timer.timings}
 
         # 1. Detection
-        detected_script = self.lang_detector.detect_script(text)
-        detected_lang = self.lang_detector.detect_language(text)
+        with timer.measure("detect"):
+            detected_script, detected_lang, lang_confidence = self.lang_detector.detect_scored(text)
         steps_log["detected_script"] = detected_script
         steps_log["detected_lang"] = detected_lang
+        if lang_confidence is not None:
+            steps_log["lang_confidence"] = lang_confidence
+
+        # A close enough earlier (post-edited) translation is returned as it is
+        with timer.measure("memory"):
+            match = self.memory.lookup(text, target_lang)
+        if match:
+            steps_log["memory"] = {"source": match["source"], "similarity": round(match["similarity"], 4)}
+            steps_log["route"] = ROUTE_MEMORY
+            segment = {"text": text, "model_name": "", "translation": match["target"], "sep": ""}
+            return self._job(text, text, ROUTE_MEMORY, [segment], steps_log, timer)
 
         # 2. Normalization
         normalized_text = text
         if detected_lang == "Hinglish" or detected_script == "Latin":
             # Apply slang normalization first
-            normalized_text = self.normalizer.normalize_slang(normalized_text)
+            with timer.measure("normalize"):
+                normalized_text = resources.normalizer.normalize_slang(normalized_text)
             steps_log["slang_normalized"] = normalized_text
             
             # Then transliterate if going to Hindi and script is Latin
@@ -63,80 +153,302 @@ class TranslationPipeline:
             # If input is "kya haal hai" (Hinglish), and we send it to EN-HI model, it might fail.
             # If we transliterate to "क्या हाल है", we verify it IS Hindi.
             
-            if target_lang == "Hindi":
-               # If it was classified as Hinglish, we might assume it is mostly Hindi in Latin script.
-               # In that case, the 'translation' is effectively Transliteration + Grammar fix.
-               # BUT, if we have a model EN->HI, and we give it "Happy Birthday", it gives "janmdin mubarak".
-               # If we give "Tum kahan ho", it might translate "Tum" as "You" ?? No, standard models fail on Hinglish.
-               
-               # Demo Strategy:
-               # If Hinglish is detected, we prioritize Transliteration to Devanagari
-               # and treat THAT as the output if the goal is Hindi.
-               # IF the goal is English, we transliterate to Devanagari -> Translate HI to EN.
-               
-               pass
+            # Demo Strategy:
+            # If Hinglish is detected, we prioritize Transliteration to Devanagari
+            # and treat THAT as the output if the goal is Hindi.
+            # IF the goal is English, we transliterate to Devanagari -> Translate HI to EN.
 
         # Apply Glossary (Pre) - keeping specific terms
-        normalized_text, _ = self.glossary_manager.apply_glossary_pre_translation(normalized_text)
+        with timer.measure("glossary"):
+            normalized_text, _ = resources.glossary_manager.apply_glossary_pre_translation(normalized_text)
+
+        # Span routing: only the parts of a code-mixed sentence that are not already
+        # in the target language go through a model
+        if detected_lang == "Hinglish" and self.config["SPAN_ROUTING"] and target_lang in ("Hindi", "English"):
+            segments = self._span_segments(normalized_text, target_lang, resources, timer)
+            steps_log["spans"] = [(segment["source"], segment["action"]) for segment in segments]
+            steps_log["route"] = ROUTE_SPANS
+            return self._job(text, normalized_text, ROUTE_SPANS, segments, steps_log, timer)
         
-        # 3. Translation
+        # 3. Route selection
         final_translation = ""
         model_name = ""
         
-        # Logic for Model Selection
         # Case 1: English -> Hindi
         if (detected_lang == "English") and target_lang == "Hindi":
-            model_name = self.config["DEFAULT_MODEL_EN_HI"]
+            model_name = self.registry.model_for("English", "Hindi")
+            route = ROUTE_EN_HI
             
         # Case 2: Hindi (Devanagari) -> English
         elif (detected_lang == "Hindi" or detected_script == "Devanagari") and target_lang == "English":
-            model_name = self.config["DEFAULT_MODEL_HI_EN"]
+            model_name = self.registry.model_for("Hindi", "English")
+            route = ROUTE_HI_EN
             
         # Case 3: Hinglish (Latin) -> Hindi
         elif (detected_lang == "Hinglish") and target_lang == "Hindi":
             # Just transliterate
-            transliterated = self.normalizer.transliterate_to_devanagari(normalized_text)
+            with timer.measure("transliterate"):
+                transliterated = resources.normalizer.transliterate_to_devanagari(normalized_text)
             steps_log["transliteration"] = transliterated
             final_translation = transliterated
+            route = ROUTE_TRANSLITERATE
             # We skip neural translation here as it's already "translated" script-wise.
             
         # Case 4: Hinglish (Latin) -> English
         elif (detected_lang == "Hinglish") and target_lang == "English":
             # Transliterate to Devanagari -> Then Translate HI to EN
-            transliterated = self.normalizer.transliterate_to_devanagari(normalized_text)
+            with timer.measure("transliterate"):
+                transliterated = resources.normalizer.transliterate_to_devanagari(normalized_text)
             steps_log["transliteration"] = transliterated
             normalized_text = transliterated # New input for translation
-            model_name = self.config["DEFAULT_MODEL_HI_EN"]
+            model_name = self.registry.model_for("Hindi", "English")
+            route = ROUTE_HI_EN
+
+        # Case 5: any other pair configured in MODEL_PAIRS (e.g. English -> Marathi);
+        # romanized Hindi is transliterated and goes through the Hindi model
+        elif self.registry.model_for(self._pair_source(detected_script, detected_lang), target_lang):
+            source_lang = self._pair_source(detected_script, detected_lang)
+            if detected_lang == "Hinglish":
+                with timer.measure("transliterate"):
+                    normalized_text = resources.normalizer.transliterate_to_devanagari(normalized_text)
+                steps_log["transliteration"] = normalized_text
+            model_name = self.registry.model_for(source_lang, target_lang)
+            route = pair_route(source_lang, target_lang)
             
         else:
             # Fallback or identity
             final_translation = normalized_text
+            route = ROUTE_IDENTITY
 
-        # Run Neural Model if needed
-        if model_name:
-            tokenizer, model = self.load_model(model_name)
-            if tokenizer and model:
-                try:
-                    inputs = tokenizer(normalized_text, return_tensors="pt", padding=True)
-                    translated = model.generate(**inputs)
-                    final_translation = tokenizer.decode(translated[0], skip_special_tokens=True)
-                except Exception as e:
-                    logger.error(f"Translation failed: {e}")
-                    final_translation = "Error in translation"
-
-        steps_log["raw_translation"] = final_translation
-
-        # 4. Glossary (Post)
-        final_translation = self.glossary_manager.apply_glossary_post_translation(final_translation, text)
-        steps_log["glossary_applied"] = final_translation
-
-        # 5. Quality Check
-        confidence = self.quality_checker.compute_confidence(text, final_translation)
-        
+        steps_log["route"] = route
+        segment = {"text": normalized_text, "model_name": model_name, "translation": final_translation, "sep": ""}
+        return self._job(text, normalized_text, route, [segment], steps_log, timer)
+
+    @staticmethod
+    def _pair_source(detected_script, detected_lang) -> str:
+        """Source language used to pick a model: Devanagari and romanized Hindi both count as Hindi."""
+        if detected_lang == "Hinglish" or detected_script == "Devanagari":
+            return "Hindi"
+        return detected_lang
+
+    @staticmethod
+    def _job(text, normalized_text, route, segments: List[Dict], steps_log: Dict, timer: StageTimer) -> Dict:
+        models = sorted({segment["model_name"] for segment in segments if segment["model_name"]})
         return {
             "original": text,
             "normalized": normalized_text,
+            "route": route,
+            # Route plus models, so span and whole-sentence results never share a cache entry
+            "model_key": route + ":" + ",".join(models),
+            "segments": segments,
+            "logs": steps_log,
+            # Fills steps_log["timings_ms"]; batched stages add their batch wall time to every job in the batch
+            "timer": timer,
+        }
+
+    def _span_segments(self, text, target_lang, resources: Resources, timer: StageTimer) -> List[Dict]:
+        """
+        Splits a code-mixed sentence into runs of same-language tokens.
+        Romanized Hindi runs are transliterated (and, for English output, sent to HI->EN);
+        English runs are sent to EN->HI only when the target is Hindi. The whitespace
+        between runs is kept in 'sep' so the output can be reassembled as it was.
+        """
+        spans = []
+        with timer.measure("detect"):
+            tags = self.lang_detector.tag_tokens(text)
+        for start, end, tag in tags:
+            if spans and spans[-1][2] == tag:
+                spans[-1][1] = end
+            else:
+                spans.append([start, end, tag])
+
+        segments = []
+        if spans and spans[0][0] > 0:
+            segments.append({"source": text[:spans[0][0]], "text": "", "model_name": "", "action": "keep",
+                             "translation": "", "sep": text[:spans[0][0]]})
+        for k, (start, end, tag) in enumerate(spans):
+            span = text[start:end]
+            next_start = spans[k + 1][0] if k + 1 < len(spans) else len(text)
+            segment = {"source": span, "text": span, "model_name": "", "action": "keep",
+                       "translation": span, "sep": text[end:next_start]}
+
+            if tag == "Hinglish":
+                with timer.measure("transliterate"):
+                    transliterated = resources.normalizer.transliterate_to_devanagari(span)
+                segment["translation"] = transliterated
+                segment["action"] = ROUTE_TRANSLITERATE
+                if target_lang == "English":
+                    segment.update(text=transliterated, model_name=self.registry.model_for("Hindi", "English"),
+                                   action=ROUTE_HI_EN)
+            elif tag == "English" and target_lang == "Hindi":
+                segment.update(model_name=self.registry.model_for("English", "Hindi"), action=ROUTE_EN_HI)
+            elif tag == "Hindi" and target_lang == "English":
+                segment.update(model_name=self.registry.model_for("Hindi", "English"), action=ROUTE_HI_EN)
+            segments.append(segment)
+        return segments
+
+    def _generate(self, model_name, texts: List[str], max_batch_size=None) -> List[str]:
+        """Translates texts in length-bucketed, padded batches (see BatchScheduler)."""
+        tokenizer, model = self.load_model(model_name)
+        if not (tokenizer and model):
+            self.metrics.inc("translate_fallbacks_total", len(texts), model=model_name, reason="model_unavailable")
+            return [""] * len(texts)
+        with startup_profile.measure(model_name, "first_inference"):
+            return self.scheduler.run(tokenizer, lambda inputs: model.generate(**inputs), texts, max_batch_size, model_name)
+
+    def _finish(self, job: Dict, final_translation: str, confidence: float) -> Dict:
+        return {
+            "original": job["original"],
+            "normalized": job["normalized"],
             "translation": final_translation,
             "confidence": confidence,
-            "logs": steps_log
+            "logs": job["logs"]
         }
+
+    def translate_batch(self, texts: List[str], target_lang="Hindi", max_batch_size=None) -> List[Dict]:
+        """
+        Translates many inputs at once.
+        Inputs are grouped by route so each model sees padded batches instead of
+        one generate call per sentence. Results come back in input order.
+        """
+        # One snapshot for the whole batch, even if a reload lands mid-request
+        resources = self.resources.current()
+        jobs = [self._prepare(text, target_lang, resources) for text in texts]
+
+        # Serve repeated inputs from the result cache; they skip generation and QE
+        cached = [None] * len(jobs)
+        if self.cache is not None:
+            for i, job in enumerate(jobs):
+                # Memory lookups are as cheap as the cache, and entries can be replaced
+                if job["route"] == ROUTE_MEMORY:
+                    continue
+                job["cache_key"] = self.cache.make_key(
+                    job["original"], job["normalized"], target_lang,
+                    f'{job["model_key"]}@{self.config["INFERENCE_BACKEND"]}', resources.fingerprint,
+                )
+                cached[i] = self.cache.get(job["cache_key"])
+                job["logs"]["cache"] = {"hit": cached[i] is not None, **self._cache_counters()}
+
+        # Group every segment that needs a neural model by model name, across all jobs
+        groups: Dict[str, List[Dict]] = {}
+        for i, job in enumerate(jobs):
+            if cached[i] is not None:
+                continue
+            for segment in job["segments"]:
+                if segment["model_name"]:
+                    groups.setdefault(segment["model_name"], []).append(segment)
+
+        for model_name, segments in groups.items():
+            start = time.perf_counter()
+            outputs = self._generate(model_name, [segment["text"] for segment in segments], max_batch_size)
+            self._add_timing(jobs, segments, "generate", time.perf_counter() - start)
+            for segment, output in zip(segments, outputs):
+                segment["translation"] = output
+
+        results = [None] * len(jobs)
+        pending = []
+        for i, (job, hit) in enumerate(zip(jobs, cached)):
+            if hit is not None:
+                job["logs"]["raw_translation"] = hit["raw_translation"]
+                job["logs"]["glossary_applied"] = hit["translation"]
+                results[i] = self._finish(job, hit["translation"], hit["confidence"])
+                continue
+
+            raw_translation = "".join(segment["translation"] + segment["sep"] for segment in job["segments"])
+            final_translation = raw_translation
+            job["logs"]["raw_translation"] = final_translation
+
+            # 4. Glossary (Post)
+            with job["timer"].measure("glossary"):
+                final_translation = resources.glossary_manager.apply_glossary_post_translation(final_translation, job["original"])
+            job["logs"]["glossary_applied"] = final_translation
+            pending.append((i, job, raw_translation, final_translation))
+
+        # 5. Quality Check, one batched encode for every job that needs it.
+        # Rule-based routes (no model segment) can skip it: the output is deterministic
+        skip_qe = self.config["QE_SKIP_DETERMINISTIC"]
+        scored = [
+            entry for entry in pending
+            if entry[1]["route"] != ROUTE_MEMORY and not (skip_qe and self._is_deterministic(entry[1]))
+        ]
+        confidences = {}
+        if scored:
+            start = time.perf_counter()
+            scores = self.quality_checker.compute_confidence_batch(
+                [job["original"] for _, job, _, _ in scored],
+                [final_translation for _, _, _, final_translation in scored],
+            )
+            elapsed = time.perf_counter() - start
+            for _, job, _, _ in scored:
+                job["timer"].add("qe", elapsed)
+            confidences = {i: score for (i, _, _, _), score in zip(scored, scores)}
+
+        for i, job, raw_translation, final_translation in pending:
+            if i in confidences:
+                confidence = confidences[i]
+            elif job["route"] == ROUTE_MEMORY:
+                # Post-edited text; how closely the source matched is the confidence
+                confidence = job["logs"]["memory"]["similarity"]
+            else:
+                confidence = 1.0
+                job["logs"]["qe"] = "skipped"
+            results[i] = self._finish(job, final_translation, confidence)
+
+            # Failed or missing model outputs are not worth remembering
+            failed = any(
+                segment["model_name"] and segment["translation"] in ("", "Error in translation")
+                for segment in job["segments"]
+            )
+            if self.cache is not None and not failed and "cache_key" in job:
+                self.cache.put(job["cache_key"], {
+                    "raw_translation": raw_translation,
+                    "translation": final_translation,
+                    "confidence": confidence,
+                })
+
+        if self.metrics.enabled:
+            self._record_metrics(jobs, cached)
+        return results
+
+    def _record_metrics(self, jobs: List[Dict], cached: List):
+        for job, hit in zip(jobs, cached):
+            self.metrics.inc("translate_requests_total", route=job["route"])
+            if "cache_key" in job:
+                self.metrics.inc("translate_cache_lookups_total", result="hit" if hit is not None else "miss")
+            for stage, ms in job["timer"].timings.items():
+                self.metrics.observe("translate_stage_seconds", ms / 1000, stage=stage)
+
+    def metrics_snapshot(self) -> Dict:
+        return self.metrics.snapshot()
+
+    @staticmethod
+    def _add_timing(jobs: List[Dict], segments: List[Dict], stage: str, seconds: float):
+        """Charges a batched call to each job with a segment in it, once per job."""
+        ids = {id(segment) for segment in segments}
+        for job in jobs:
+            if any(id(segment) in ids for segment in job["segments"]):
+                job["timer"].add(stage, seconds)
+
+    @staticmethod
+    def _is_deterministic(job: Dict) -> bool:
+        return not any(segment["model_name"] for segment in job["segments"])
+
+    def _cache_counters(self) -> Dict[str, int]:
+        return {"hits": self.cache.hits, "misses": self.cache.misses}
+
+    def translate_document(self, text, target_lang="Hindi") -> Dict:
+        """
+        Translates a long text sentence by sentence (see core.document) and stitches the
+        output back together with the original whitespace and line breaks.
+        """
+        return translate_document(
+            lambda texts, target: self._document_executor.submit(self.translate_batch, texts, target),
+            text, target_lang, self.config["DOC_CHUNK_SENTENCES"], self.config["DOC_MAX_SENTENCE_CHARS"],
+            self.config["DOC_CONCURRENCY"],
+        )
+
+    def translate(self, text, source_lang_hint=None, target_lang="Hindi"):
+        """
+        Main pipeline execution.
+        """
+        return self.translate_batch([text], target_lang=target_lang)[0]
@@ -1,17 +1,39 @@
-from sentence_transformers import SentenceTransformer, util
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from typing import List
+from .utils import startup_profile
+from .backends import load_sentence_encoder
 
 logger = logging.getLogger(__name__)
 
 class QualityChecker:
-    def __init__(self):
+    def __init__(self, cache_size: int = 4096, half_precision: bool = False,
+                 backend: str = "torch", export_dir: str = "models/onnx"):
         # Using a very small, fast model for CPU usage
         self.model_name = 'all-MiniLM-L6-v2'
-        try:
-            self.model = SentenceTransformer(self.model_name)
-        except Exception as e:
-            logger.error(f"Failed to load QualityChecker model: {e}")
-            self.model = None
+        # Loaded on first use (or by TranslationPipeline.warmup) to keep startup fast
+        self.model = None
+        self._load_failed = False
+        self.backend = backend
+        self.export_dir = export_dir
+        # Normalized embeddings by text hash (LRU); float16 halves the memory per entry
+        self.cache_size = cache_size
+        self.half_precision = half_precision
+        self._embeddings = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load_model(self):
+        if self.model is None and not self._load_failed:
+            try:
+                self.model = load_sentence_encoder(self.model_name, self.backend, self.export_dir)
+            except Exception as e:
+                logger.error(f"Failed to load QualityChecker model: {e}")
+                self._load_failed = True
+        return self.model
 
     def compute_confidence(self, source_text: str, translated_text: str) -> float:
         """
@@ -20,7 +42,7 @@ class QualityChecker:
         'all-MiniLM-L6-v2' is primarily English, so for HI->EN it works well.
         For EN->HI, we ideally need a multilingual model like 'paraphrase-multilingual-MiniLM-L12-v2'.
         """
-        if not self.model:
+        if not self.load_model():
             return 0.0
             
         # For better accuracy on EN-HI, let's assume we might switch to a multilingual one
@@ -32,11 +54,62 @@ class QualityChecker:
         # So we really should load a multilingual model.
         # Let's try to load a multilingual one if possible, else fallback.
         
+        return self.compute_confidence_batch([source_text], [translated_text])[0]
+
+    def compute_confidence_batch(self, source_texts: List[str], translated_texts: List[str]) -> List[float]:
+        """
+        Cosine similarity of every (source, translation) pair.
+        All texts not in the embedding cache are encoded in a single encode call.
+        """
+        if not source_texts:
+            return []
+        if not self.load_model():
+            return [0.0] * len(source_texts)
+
         try:
-            embeddings1 = self.model.encode(source_text, convert_to_tensor=True)
-            embeddings2 = self.model.encode(translated_text, convert_to_tensor=True)
-            score = util.cos_sim(embeddings1, embeddings2)
-            return float(score[0][0])
+            embeddings = self.embed(list(source_texts) + list(translated_texts))
+            sources, translations = embeddings[:len(source_texts)], embeddings[len(source_texts):]
+            # Rows are unit length, so the row-wise dot product is the cosine similarity
+            # (clipped, since float16 storage can round it just past 1)
+            scores = (sources * translations).sum(axis=1).clip(-1.0, 1.0)
+            return [float(score) for score in scores]
         except Exception as e:
             logger.error(f"Error computing confidence: {e}")
-            return 0.0
+            return [0.0] * len(source_texts)
+
+    def embed(self, texts: List[str]):
+        """Returns L2-normalized float32 embeddings, shape (len(texts), dim)."""
+        import numpy as np
+        keys = [hashlib.sha1(text.encode("utf-8")).hexdigest() for text in texts]
+        vectors = {}
+        with self._lock:
+            for key in keys:
+                if key not in vectors and key in self._embeddings:
+                    self._embeddings.move_to_end(key)
+                    vectors[key] = self._embeddings[key]
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        with self._lock:
+            # Repeats within the batch count as hits; each distinct text is encoded once
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            with startup_profile.measure(self.model_name, "first_inference"):
+                encoded = np.asarray(self.model.encode(list(missing.values()), convert_to_numpy=True), dtype=np.float32)
+            encoded /= np.maximum(np.linalg.norm(encoded, axis=1, keepdims=True), 1e-12)
+            dtype = np.float16 if self.half_precision else np.float32
+            with self._lock:
+                for key, vector in zip(missing, encoded):
+                    vectors[key] = vector.astype(dtype)
+                    if self.cache_size > 0:
+                        self._embeddings[key] = vectors[key]
+                while len(self._embeddings) > self.cache_size:
+                    self._embeddings.popitem(last=False)
+
+        return np.stack([vectors[key] for key in keys]).astype(np.float32)
+
+    def cache_stats(self):
+        return {"size": len(self._embeddings), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,217 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple
+from .backends import loaded_backend
+
+logger = logging.getLogger(__name__)
+
+# Language names used by the pipeline and their ISO codes (route names, MODEL_PAIRS keys)
+LANGUAGE_CODES = {"English": "en", "Hindi": "hi", "Marathi": "mr", "Kannada": "kn", "Bengali": "bn", "Tamil": "ta",
+                  "Telugu": "te", "Gujarati": "gu", "Malayalam": "ml", "Punjabi": "pa", "Urdu": "ur"}
+_LANGUAGE_NAMES = {code: name for name, code in LANGUAGE_CODES.items()}
+# Failed loads are retried after MODEL_RETRY_SECONDS, doubling per failure up to this
+MAX_BACKOFF_SECONDS = 3600.0
+
+def pair_route(source_lang: str, target_lang: str) -> str:
+    """Route name for a model pair, e.g. 'en-hi'."""
+    return f"{LANGUAGE_CODES.get(source_lang, source_lang.lower())}-{LANGUAGE_CODES.get(target_lang, target_lang.lower())}"
+
+def parse_model_pairs(spec: str) -> Dict[Tuple[str, str], str]:
+    """'English-Marathi=Helsinki-NLP/opus-mt-en-mr,hi-en=...' (names or codes) -> {(source, target): model}."""
+    pairs = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        try:
+            languages, model_name = item.split("=", 1)
+            source, target = (part.strip() for part in languages.split("-", 1))
+        except ValueError:
+            logger.error(f"Ignoring malformed MODEL_PAIRS entry {item!r}; expected Source-Target=model")
+            continue
+        pairs[(_LANGUAGE_NAMES.get(source.lower(), source), _LANGUAGE_NAMES.get(target.lower(), target))] = model_name.strip()
+    return pairs
+
+def _resident_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def _model_bytes(model) -> int:
+    """Bytes held by a model's tensors (weights and buffers, packed int8 weights included), or 0 if unknown."""
+    try:
+        state = model.state_dict()
+    except Exception:
+        return 0
+    total = 0
+    for value in state.values():
+        values = value if isinstance(value, (tuple, list)) else (value,)
+        for tensor in values:
+            if hasattr(tensor, "element_size") and hasattr(tensor, "nelement"):
+                total += tensor.element_size() * tensor.nelement()
+    return total
+
+class ModelRegistry:
+    """
+    Translation models by name, loaded on demand and kept within a memory budget.
+    Language pairs map to model names (the two defaults plus MODEL_PAIRS). Concurrent
+    requests for a model that is loading wait for that one load instead of starting
+    their own. When the resident models exceed the budget, the least recently used ones
+    are dropped (a request still holding one keeps it until it finishes). A failed load
+    is remembered and not retried until its backoff expires, doubling with each failure.
+    """
+    def __init__(self, loader: Callable[[str], Tuple], pairs: Dict[Tuple[str, str], str],
+                 memory_budget_mb: float = 0, retry_seconds: float = 30.0, metrics=None):
+        self.loader = loader
+        self.pairs = dict(pairs)
+        self.budget = int(memory_budget_mb * 1024 * 1024)
+        self.retry_seconds = retry_seconds
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        # name -> (tokenizer, model, bytes), least recently used first
+        self._resident: "OrderedDict[str, Tuple]" = OrderedDict()
+        self._loading: Dict[str, Future] = {}
+        # name -> (failures, retry_at, error)
+        self._failed: Dict[str, Tuple[int, float, str]] = {}
+        # Last known size per model, so the budget can be made room for before loading
+        self._sizes: Dict[str, int] = {}
+        self._counters = {"hits": 0, "loads": 0, "load_failures": 0, "shared_loads": 0, "backoff_skips": 0, "evictions": 0}
+
+    @classmethod
+    def from_config(cls, config: Dict, loader: Callable[[str], Tuple], metrics=None) -> "ModelRegistry":
+        pairs = {
+            ("English", "Hindi"): config["DEFAULT_MODEL_EN_HI"],
+            ("Hindi", "English"): config["DEFAULT_MODEL_HI_EN"],
+        }
+        pairs.update(parse_model_pairs(config["MODEL_PAIRS"]))
+        return cls(loader, pairs, config["MODEL_MEMORY_MB"], config["MODEL_RETRY_SECONDS"], metrics)
+
+    def model_for(self, source_lang: str, target_lang: str) -> str:
+        """Model name for a language pair, or "" when none is configured."""
+        return self.pairs.get((source_lang, target_lang), "")
+
+    def after_fork(self):
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def get(self, model_name: str) -> Tuple:
+        """(tokenizer, model), loading it if needed; (None, None) if it failed to load or is backing off."""
+        with self._lock:
+            entry = self._resident.get(model_name)
+            if entry is not None:
+                self._resident.move_to_end(model_name)
+                self._counters["hits"] += 1
+                return entry[0], entry[1]
+            failure = self._failed.get(model_name)
+            if failure is not None and time.monotonic() < failure[1]:
+                self._counters["backoff_skips"] += 1
+                return None, None
+            future = self._loading.get(model_name)
+            owner = future is None
+            if owner:
+                future = self._loading[model_name] = Future()
+            else:
+                self._counters["shared_loads"] += 1
+
+        if not owner:
+            return future.result()
+        try:
+            result = self._load(model_name)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._loading.pop(model_name, None)
+        future.set_result(result)
+        return result
+
+    def _load(self, model_name: str) -> Tuple:
+        # Make room first when the size is known from an earlier load
+        self._evict_for(self._sizes.get(model_name, 0), keep=model_name)
+        logger.info(f"Loading model: {model_name}")
+        before = _resident_bytes()
+        start = time.perf_counter()
+        try:
+            tokenizer, model = self.loader(model_name)
+        except Exception as e:
+            with self._lock:
+                failures = self._failed.get(model_name, (0, 0.0, ""))[0] + 1
+                backoff = min(self.retry_seconds * 2 ** (failures - 1), MAX_BACKOFF_SECONDS)
+                self._failed[model_name] = (failures, time.monotonic() + backoff, str(e))
+                self._counters["load_failures"] += 1
+            logger.error(f"Failed to load model {model_name} (attempt {failures}, retrying in {backoff:.0f} s): {e}")
+            self._record("model_loads_total", model=model_name, result="error")
+            return None, None
+
+        size = _model_bytes(model)
+        if not size and before is not None:
+            # Not a torch module (e.g. ONNX Runtime sessions): fall back to the RSS growth
+            size = max(0, (_resident_bytes() or before) - before)
+        with self._lock:
+            self._resident[model_name] = (tokenizer, model, size)
+            self._sizes[model_name] = size
+            self._failed.pop(model_name, None)
+            self._counters["loads"] += 1
+        self._record("model_loads_total", model=model_name, result="ok")
+        if self.metrics is not None:
+            self.metrics.observe("model_load_seconds", time.perf_counter() - start, model=model_name)
+        self._evict_for(0, keep=model_name)
+        return tokenizer, model
+
+    def _evict_for(self, incoming: int, keep: str):
+        """Drops least recently used models until `incoming` more bytes fit the budget."""
+        if not self.budget:
+            return
+        evicted = []
+        with self._lock:
+            total = sum(entry[2] for entry in self._resident.values())
+            for name in list(self._resident):
+                if total + incoming <= self.budget:
+                    break
+                if name == keep:
+                    continue
+                total -= self._resident.pop(name)[2]
+                self._counters["evictions"] += 1
+                evicted.append(name)
+        for name in evicted:
+            logger.info(f"Evicted model {name} to stay within {self.budget / 2 ** 20:.0f} MB")
+            self._record("model_evictions_total", model=name)
+
+    def _record(self, name: str, **labels):
+        if self.metrics is not None:
+            self.metrics.inc(name, **labels)
+
+    def evict(self, model_name: str) -> bool:
+        with self._lock:
+            evicted = self._resident.pop(model_name, None) is not None
+            if evicted:
+                self._counters["evictions"] += 1
+        return evicted
+
+    def stats(self) -> Dict:
+        """
+        Counters, resident models (least recently used first) with their size and the backend
+        they were loaded on, and failed models.
+        """
+        now = time.monotonic()
+        with self._lock:
+            resident = {name: round(entry[2] / 2 ** 20, 1) for name, entry in self._resident.items()}
+            return {
+                **self._counters,
+                "resident_mb": resident,
+                "total_mb": round(sum(resident.values()), 1),
+                "backends": {name: loaded_backend(entry[1]) for name, entry in self._resident.items()},
+                "budget_mb": round(self.budget / 2 ** 20, 1) if self.budget else None,
+                "loading": sorted(self._loading),
+                "failed": {
+                    name: {"failures": failures, "retry_in_s": max(0.0, round(retry_at - now, 1)), "error": error}
+                    for name, (failures, retry_at, error) in self._failed.items()
+                },
+                "pairs": {pair_route(*pair): name for pair, name in sorted(self.pairs.items())},
+            }
@@ -0,0 +1,109 @@
+import logging
+import os
+import threading
+from typing import Callable, List, Optional
+from .cache import content_hash
+from .glossary import GlossaryManager
+from .normalize import Normalizer
+from .transliterate import Transliterator
+
+logger = logging.getLogger(__name__)
+
+class Resources:
+    """An immutable snapshot of the slang map and glossary with their lookup structures built."""
+    def __init__(self, version: int, normalizer: Normalizer, glossary_manager: GlossaryManager):
+        self.version = version
+        self.normalizer = normalizer
+        self.glossary_manager = glossary_manager
+        # Content hash; stable across restarts, so persisted cache entries stay valid
+        glossary = sorted((str(k), str(v)) for k, v in glossary_manager.glossary.items())
+        self.fingerprint = content_hash(normalizer.slang_map, glossary)
+
+class ResourceStore:
+    """
+    Holds the current Resources and swaps in a new snapshot when the files change.
+    New snapshots are built completely before a single reference assignment publishes them,
+    so a request that grabbed current() keeps a consistent view until it finishes.
+    """
+    def __init__(self, slang_map_path: str, glossary_path: str, transliterator: Optional[Transliterator] = None):
+        self.slang_map_path = slang_map_path
+        self.glossary_path = glossary_path
+        # Transliteration does not depend on the files, so every snapshot shares one
+        self.transliterator = transliterator or Transliterator()
+        self._listeners: List[Callable[[Resources], None]] = []
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._mtimes = self._read_mtimes()
+        # Lenient at startup so a missing file does not stop the service; reloads are strict
+        self._current = self._build(version=1, strict=False)
+
+    def current(self) -> Resources:
+        return self._current
+
+    def add_listener(self, callback: Callable[[Resources], None]):
+        """Registers a callback run after every swap (e.g. to drop caches built on the old version)."""
+        self._listeners.append(callback)
+
+    def _read_mtimes(self):
+        return tuple(
+            os.path.getmtime(path) if path and os.path.exists(path) else None
+            for path in (self.slang_map_path, self.glossary_path)
+        )
+
+    def _build(self, version: int, strict: bool = True) -> Resources:
+        """With strict, an unreadable or malformed file raises, so reload() keeps the old version."""
+        return Resources(
+            version,
+            Normalizer(self.slang_map_path, self.transliterator, strict=strict),
+            GlossaryManager(self.glossary_path, strict=strict),
+        )
+
+    def reload(self, force: bool = False) -> bool:
+        """Rebuilds the resources from disk. Returns True if a new version was published."""
+        with self._reload_lock:
+            self._mtimes = self._read_mtimes()
+            old = self._current
+            try:
+                new = self._build(version=old.version + 1)
+            except Exception as e:
+                logger.error(f"Failed to reload resources, keeping version {old.version}: {e}")
+                return False
+
+            if not force and new.fingerprint == old.fingerprint:
+                return False
+            self._current = new
+            logger.info(f"Resources reloaded: version {new.version} ({new.fingerprint[:8]})")
+
+        for callback in self._listeners:
+            try:
+                callback(new)
+            except Exception as e:
+                logger.error(f"Resource reload listener failed: {e}")
+        return True
+
+    def start_watching(self, interval: float = 2.0):
+        """Polls file mtimes in a daemon thread and reloads once a change has settled."""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+
+        def poll():
+            pending = None
+            while not self._stop.wait(interval):
+                mtimes = self._read_mtimes()
+                if mtimes == self._mtimes:
+                    pending = None
+                elif mtimes == pending:
+                    # Unchanged since the last poll, so the editor has finished writing
+                    self.reload()
+                    pending = None
+                else:
+                    pending = mtimes
+
+        self._watcher = threading.Thread(target=poll, name="resource-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop.set()
+        self._watcher = None
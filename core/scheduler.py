@@ -0,0 +1,171 @@
+import logging
+import threading
+from typing import Callable, Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Padded-length buckets used for the stats. The last bucket catches everything longer.
+DEFAULT_BUCKETS = (8, 16, 32, 64, 128, 256, 512)
+# Tokenizers without a configured limit report a huge sentinel as model_max_length
+_MAX_SANE_LENGTH = 100_000
+
+def _output_tokens(generated, pad_token_id) -> int:
+    """Generated token count without padding (Marian also starts decoding from the pad id)."""
+    if hasattr(generated, "ne"):
+        return int(generated.ne(pad_token_id).sum()) if pad_token_id is not None else int(generated.numel())
+    return sum(len(row) for row in generated)
+
+class BatchScheduler:
+    """
+    Length-bucketed batching for MarianMT inference.
+    Sequences are sorted by token length and packed into batches whose padded size
+    (batch size x longest sequence) stays under a token budget, so short chat messages
+    are not padded to the length of the longest sentence in the request.
+    """
+    def __init__(self, max_tokens: int = 2048, max_batch_size: int = 32, buckets: Sequence[int] = DEFAULT_BUCKETS,
+                 metrics=None):
+        self.max_tokens = max_tokens
+        self.max_batch_size = max_batch_size
+        self.buckets = tuple(sorted(buckets))
+        # Optional MetricsRegistry for token counts and fallbacks
+        self.metrics = metrics
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def plan(self, lengths: Sequence[int], max_batch_size: int = None) -> List[List[int]]:
+        """Groups indices of `lengths` into batches under the token budget, shortest first."""
+        max_batch_size = max_batch_size or self.max_batch_size
+        order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+
+        batches = []
+        batch: List[int] = []
+        for i in order:
+            # Sorted ascending, so the new sequence is the longest one in the batch
+            padded = (len(batch) + 1) * max(lengths[i], 1)
+            if batch and (len(batch) >= max_batch_size or padded > self.max_tokens):
+                batches.append(batch)
+                batch = []
+            batch.append(i)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def run(self, tokenizer, generate_fn: Callable, texts: List[str], max_batch_size: int = None,
+            model_name: str = "") -> List[str]:
+        """
+        Tokenizes texts, runs generate_fn on each planned batch of padded features
+        and scatters the decoded outputs back into input order.
+        generate_fn receives the padded tensors and returns generated token ids.
+        Inputs are truncated to the tokenizer's model_max_length. If tokenizing or generating
+        a batch fails, its inputs are retried one by one so only the failing input gets the error.
+        model_name only labels the metrics.
+        """
+        metrics = self.metrics if self.metrics is not None and self.metrics.enabled else None
+        max_length = getattr(tokenizer, "model_max_length", None)
+        if not (isinstance(max_length, int) and 0 < max_length <= _MAX_SANE_LENGTH):
+            max_length = None
+        outputs: List[str] = [""] * len(texts)
+        try:
+            input_ids = self._tokenize(tokenizer, texts, max_length)
+            valid = list(range(len(texts)))
+        except Exception as e:
+            logger.error(f"Tokenization failed: {e}")
+            # Tokenize one by one so only the input that breaks the tokenizer gets the error
+            input_ids = [None] * len(texts)
+            valid = []
+            for i, text in enumerate(texts):
+                try:
+                    input_ids[i] = self._tokenize(tokenizer, [text], max_length)[0]
+                    valid.append(i)
+                except Exception as e:
+                    logger.error(f"Tokenization failed: {e}")
+                    outputs[i] = self._fallback(metrics, model_name, "tokenize_error")
+        if max_length is not None:
+            truncated = sum(len(input_ids[i]) >= max_length for i in valid)
+            if truncated:
+                logger.warning(f"{truncated} input(s) reached the {max_length}-token limit of {model_name or 'the model'}"
+                               " and were truncated")
+        lengths = [len(ids) if ids is not None else 0 for ids in input_ids]
+
+        for batch in self.plan([lengths[i] for i in valid], max_batch_size):
+            batch = [valid[k] for k in batch]
+            try:
+                decoded = self._generate(tokenizer, generate_fn, input_ids, batch, metrics, model_name)
+            except Exception as e:
+                logger.error(f"Translation failed: {e}")
+                if len(batch) > 1:
+                    # One bad input must not fail the unrelated requests batched with it
+                    decoded = [self._generate_one(tokenizer, generate_fn, input_ids, i, metrics, model_name)
+                               for i in batch]
+                else:
+                    decoded = [self._fallback(metrics, model_name)]
+
+            for i, output in zip(batch, decoded):
+                outputs[i] = output
+            self._record([lengths[i] for i in batch])
+        return outputs
+
+    @staticmethod
+    def _tokenize(tokenizer, texts: List[str], max_length) -> List:
+        if max_length is None:
+            return tokenizer(texts)["input_ids"]
+        return tokenizer(texts, truncation=True, max_length=max_length)["input_ids"]
+
+    @staticmethod
+    def _generate(tokenizer, generate_fn: Callable, input_ids: List, batch: List[int], metrics,
+                  model_name: str) -> List[str]:
+        inputs = tokenizer.pad([{"input_ids": input_ids[i]} for i in batch], padding=True, return_tensors="pt")
+        generated = generate_fn(inputs)
+        decoded = tokenizer.batch_decode(generated, skip_special_tokens=True)
+        if metrics:
+            metrics.inc("generate_tokens_total", sum(len(input_ids[i]) for i in batch), model=model_name, direction="in")
+            metrics.inc("generate_tokens_total", _output_tokens(generated, getattr(tokenizer, "pad_token_id", None)),
+                        model=model_name, direction="out")
+        return decoded
+
+    def _generate_one(self, tokenizer, generate_fn: Callable, input_ids: List, i: int, metrics, model_name: str) -> str:
+        try:
+            return self._generate(tokenizer, generate_fn, input_ids, [i], metrics, model_name)[0]
+        except Exception as e:
+            logger.error(f"Translation failed: {e}")
+            return self._fallback(metrics, model_name)
+
+    @staticmethod
+    def _fallback(metrics, model_name: str, reason: str = "generate_error") -> str:
+        if metrics:
+            metrics.inc("translate_fallbacks_total", model=model_name, reason=reason)
+        return "Error in translation"
+
+    def _bucket(self, length: int) -> str:
+        for boundary in self.buckets:
+            if length <= boundary:
+                return f"<={boundary}"
+        return f">{self.buckets[-1]}"
+
+    def _record(self, lengths: List[int]):
+        longest = max(lengths)
+        with self._lock:
+            stats = self._stats.setdefault(self._bucket(longest), {
+                "batches": 0, "sequences": 0, "real_tokens": 0, "padded_tokens": 0
+            })
+            stats["batches"] += 1
+            stats["sequences"] += len(lengths)
+            stats["real_tokens"] += sum(lengths)
+            stats["padded_tokens"] += longest * len(lengths)
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-bucket batch counts, mean batch size and padding ratio (share of padded tokens that are padding)."""
+        with self._lock:
+            report = {}
+            for bucket, stats in self._stats.items():
+                padded = stats["padded_tokens"]
+                report[bucket] = {
+                    **stats,
+                    "avg_batch_size": stats["sequences"] / stats["batches"],
+                    "padding_ratio": 1 - stats["real_tokens"] / padded if padded else 0.0,
+                }
+            return report
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+class EngineOverloadedError(RuntimeError):
+    """Raised when the request queue is full and the overflow policy is 'reject'."""
+
+class AsyncTranslationEngine:
+    """
+    asyncio front end for TranslationPipeline.
+    Requests that arrive within a short window are coalesced into one translate_batch
+    call, which runs on a worker thread pool so the event loop stays responsive.
+    The request queue is bounded: when it is full, callers either wait for a slot
+    (overflow_policy='wait') or get EngineOverloadedError (overflow_policy='reject').
+    """
+    def __init__(self, pipeline, max_batch_size: int = 32, batch_window_ms: float = 10.0,
+                 max_queue_size: int = 256, overflow_policy: str = "wait",
+                 request_timeout: float = 30.0, num_workers: int = 1):
+        if overflow_policy not in ("wait", "reject"):
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self.pipeline = pipeline
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.request_timeout = request_timeout
+        self.num_workers = num_workers
+
+        self._executor = ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="translate")
+        self._queue = None
+        self._slots = None
+        self._collector = None
+        self._loop = None
+
+    @classmethod
+    def from_config(cls, pipeline, config: Dict) -> "AsyncTranslationEngine":
+        return cls(
+            pipeline,
+            max_batch_size=config["MAX_BATCH_SIZE"],
+            batch_window_ms=config["SERVE_BATCH_WINDOW_MS"],
+            max_queue_size=config["SERVE_MAX_QUEUE"],
+            overflow_policy=config["SERVE_OVERFLOW_POLICY"],
+            request_timeout=config["SERVE_TIMEOUT"],
+            # A WorkerPool can run one batch per process at a time
+            num_workers=getattr(pipeline, "num_workers", config["SERVE_WORKERS"]),
+        )
+
+    def _ensure_started(self):
+        # The queue and collector task are bound to the loop of the first caller
+        loop = asyncio.get_running_loop()
+        if self._collector is not None and self._loop is loop and not self._collector.done():
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._slots = asyncio.Semaphore(self.num_workers)
+        self._collector = loop.create_task(self._collect())
+
+    async def translate_async(self, text: str, target_lang: str = "Hindi", timeout: float = None) -> Dict:
+        """Queues one request and waits for its result. Raises asyncio.TimeoutError after the timeout."""
+        self._ensure_started()
+        timeout = self.request_timeout if timeout is None else timeout
+        future = self._loop.create_future()
+        item = (text, target_lang, future)
+
+        if self.overflow_policy == "reject":
+            try:
+                self._queue.put_nowait(item)
+            except asyncio.QueueFull:
+                raise EngineOverloadedError(f"Translation queue is full ({self.max_queue_size} requests)")
+            return await asyncio.wait_for(future, timeout)
+
+        async def enqueue_and_wait():
+            await self._queue.put(item)
+            return await future
+
+        try:
+            return await asyncio.wait_for(enqueue_and_wait(), timeout)
+        finally:
+            # A timed-out request must not be translated later
+            if not future.done():
+                future.cancel()
+
+    async def _collect(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [item for item in batch if not item[2].done()]
+            if not batch:
+                continue
+            # Keep collecting the next batch while this one runs on the pool
+            await self._slots.acquire()
+            self._loop.create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch: List[Tuple]):
+        try:
+            groups: Dict[str, List[Tuple]] = {}
+            for item in batch:
+                groups.setdefault(item[1], []).append(item)
+
+            for target_lang, items in groups.items():
+                texts = [text for text, _, _ in items]
+                try:
+                    results = await self._loop.run_in_executor(
+                        self._executor, self.pipeline.translate_batch, texts, target_lang
+                    )
+                except Exception as e:
+                    logger.error(f"Batched translation failed: {e}")
+                    for _, _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                for (_, _, future), result in zip(items, results):
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self._slots.release()
+
+    async def close(self):
+        if self._collector is not None:
+            self._collector.cancel()
+            self._collector = None
+        self._executor.shutdown(wait=False)
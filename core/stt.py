@@ -1,37 +1,95 @@
-from faster_whisper import WhisperModel
 import os
 import logging
+from typing import Dict, Iterator
+from .utils import startup_profile
 
 logger = logging.getLogger(__name__)
 
+# Decoding presets for bulk jobs, from most accurate to cheapest
+TRANSCRIBE_PROFILES = {
+    "accurate": {"beam_size": 5},
+    "balanced": {"beam_size": 2, "vad_filter": True},
+    # Greedy decoding, silence skipped, no conditioning on the previous window
+    "fast": {"beam_size": 1, "best_of": 1, "temperature": 0.0, "vad_filter": True, "condition_on_previous_text": False},
+}
+
 class STT:
-    def __init__(self, model_size="tiny", device="cpu", compute_type="int8"):
+    def __init__(self, model_size="tiny", device="cpu", compute_type="int8", vad_filter=False, min_silence_ms=500,
+                 cpu_threads=0, num_workers=1):
         self.model_size = model_size
         self.device = device
         self.compute_type = compute_type
+        # Threads per transcription (0 = CTranslate2 default) and concurrent transcriptions the model serves
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        # Silero VAD in faster-whisper: skip silence and cut segments at pauses
+        self.vad_filter = vad_filter
+        self.min_silence_ms = min_silence_ms
         self.model = None
 
     def load_model(self):
         if self.model is None:
             logger.info(f"Loading Whisper model: {self.model_size} on {self.device}")
             try:
-                self.model = WhisperModel(self.model_size, device=self.device, compute_type=self.compute_type)
+                with startup_profile.measure("faster_whisper", "import"):
+                    from faster_whisper import WhisperModel
+                with startup_profile.measure(f"whisper-{self.model_size}", "load"):
+                    self.model = WhisperModel(
+                        self.model_size, device=self.device, compute_type=self.compute_type,
+                        cpu_threads=self.cpu_threads, num_workers=self.num_workers,
+                    )
             except Exception as e:
                 logger.error(f"Failed to load Whisper model: {e}")
                 raise
 
-    def transcribe(self, audio_path: str) -> str:
-        """Transcribes audio file to text."""
+    def transcribe_stream(self, audio_path: str) -> Iterator[Dict]:
+        """
+        Yields {"start", "end", "text"} for each segment as soon as faster-whisper finalizes it.
+        faster-whisper decodes lazily, so the first segment arrives after one window of
+        audio instead of after the whole file.
+        """
         if not os.path.exists(audio_path):
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
         self.load_model()
-        
-        segments, info = self.model.transcribe(audio_path, beam_size=5)
+
+        vad_parameters = {"min_silence_duration_ms": self.min_silence_ms} if self.vad_filter else None
+        segments, info = self.model.transcribe(
+            audio_path, beam_size=5, vad_filter=self.vad_filter, vad_parameters=vad_parameters
+        )
         logger.info(f"Detected language '{info.language}' with probability {info.language_probability}")
 
-        full_text = ""
         for segment in segments:
-            full_text += segment.text + " "
-            
-        return full_text.strip()
+            text = segment.text.strip()
+            if text:
+                yield {"start": segment.start, "end": segment.end, "text": text}
+
+    def transcribe_file(self, audio_path: str, profile: str = "accurate") -> Dict:
+        """
+        Transcribes one file with a decoding profile from TRANSCRIBE_PROFILES.
+        Returns text, segments, language and the audio duration in seconds. Safe to call
+        from up to num_workers threads at once; decoding releases the GIL.
+        """
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        self.load_model()
+
+        options = dict(TRANSCRIBE_PROFILES[profile])
+        if options.get("vad_filter"):
+            options["vad_parameters"] = {"min_silence_duration_ms": self.min_silence_ms}
+        segments, info = self.model.transcribe(audio_path, **options)
+        segments = [
+            {"start": segment.start, "end": segment.end, "text": segment.text.strip()}
+            for segment in segments if segment.text.strip()
+        ]
+        return {
+            "text": " ".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": info.language,
+            "duration": info.duration,
+        }
+
+    def transcribe(self, audio_path: str) -> str:
+        """Transcribes audio file to text."""
+        return " ".join(segment["text"] for segment in self.transcribe_stream(audio_path))
@@ -0,0 +1,131 @@
+import logging
+import re
+from functools import lru_cache
+from indic_transliteration import sanscript
+
+logger = logging.getLogger(__name__)
+
+# Words and the whitespace runs between them; transliteration never crosses whitespace
+_WHITESPACE = re.compile(r'(\s+)')
+
+class ItransTransducer:
+    """
+    Compiled Roman -> Brahmic transducer (ITRANS -> Devanagari by default).
+    Runs the same greedy longest-token algorithm as sanscript's roman mapper, but over
+    a trie built once from the scheme map instead of re-slicing and re-hashing up to
+    max_key_length candidate tokens at every position.
+    """
+    def __init__(self, from_scheme=sanscript.ITRANS, to_scheme=sanscript.DEVANAGARI):
+        self.scheme_map = sanscript.SchemeMap(sanscript.SCHEMES[from_scheme], sanscript.SCHEMES[to_scheme])
+        scheme_map = self.scheme_map
+        if not scheme_map.from_scheme.is_roman or scheme_map.to_scheme.is_roman:
+            raise ValueError("ItransTransducer only supports Roman -> Brahmic schemes")
+        if not set(scheme_map.vowels) <= set(scheme_map.non_marks_viraama):
+            # The trie assumes the set of matchable tokens does not depend on the previous token
+            raise ValueError("Scheme map has vowels outside non_marks_viraama; use sanscript directly")
+
+        self.virama = scheme_map.virama['']
+        self._root = {}
+        for token, output in scheme_map.non_marks_viraama.items():
+            node = self._root
+            for ch in token:
+                node = node.setdefault(ch, {})
+            # (independent form, dependent vowel mark or None, token is a consonant)
+            mark = scheme_map.vowel_marks.get(token, '') if token in scheme_map.vowels else None
+            node[None] = (output, mark, token in scheme_map.consonants)
+
+        self._accents = None
+        if scheme_map.accents:
+            accents = "".join(re.escape(ch) for ch in scheme_map.accents.values())
+            yogavaahas = "".join(re.escape(ch) for ch in scheme_map.to_scheme['yogavaahas'])
+            self._accents = re.compile(f"([{accents}])([{yogavaahas}])")
+        from indic_transliteration.sanscript.schemes import roman
+        self._fix_om = scheme_map.from_scheme.name in roman.CAPITALIZABLE_SCHEME_IDS
+
+    def transliterate(self, data: str) -> str:
+        scheme_map = self.scheme_map
+        data = scheme_map.from_scheme.unapply_shortcuts(data_in=data)
+
+        root = self._root
+        virama = self.virama
+        buf = []
+        append = buf.append
+        had_consonant = False
+        i = 0
+        n = len(data)
+        while i < n:
+            # Longest token starting at i
+            node = root
+            j = i
+            entry = None
+            end = i
+            while j < n:
+                node = node.get(data[j])
+                if node is None:
+                    break
+                j += 1
+                if None in node:
+                    entry = node[None]
+                    end = j
+
+            if entry is None:
+                if had_consonant:
+                    append(virama)
+                append(data[i])
+                had_consonant = False
+                i += 1
+                continue
+
+            output, mark, is_consonant = entry
+            if had_consonant and mark is not None:
+                # Vowel after a consonant: dependent mark (nothing for the inherent 'a')
+                if mark:
+                    append(mark)
+            else:
+                if had_consonant:
+                    append(virama)
+                append(output)
+            had_consonant = is_consonant
+            i = end
+
+        if had_consonant:
+            append(virama)
+
+        result = "".join(buf)
+        if self._accents is not None:
+            result = self._accents.sub(r"\2\1", result)
+        if self._fix_om:
+            result = scheme_map.to_scheme.fix_om(result)
+        return scheme_map.to_scheme.apply_shortcuts(data_in=result)
+
+class Transliterator:
+    """
+    Word-level memoized ITRANS -> Devanagari transliteration.
+    Chat traffic repeats a small vocabulary, so each distinct word is converted once and
+    served from a bounded LRU afterwards. Words are converted with sanscript, or with the
+    compiled ItransTransducer when use_transducer is set.
+    """
+    def __init__(self, cache_size: int = 50000, use_transducer: bool = False):
+        self.transducer = None
+        if use_transducer:
+            try:
+                self.transducer = ItransTransducer()
+            except Exception as e:
+                logger.error(f"Failed to build transliteration transducer, using sanscript: {e}")
+        convert = self.transducer.transliterate if self.transducer else self._sanscript
+        self._word = lru_cache(maxsize=cache_size)(convert) if cache_size > 0 else convert
+
+    @staticmethod
+    def _sanscript(word: str) -> str:
+        return sanscript.transliterate(word, sanscript.ITRANS, sanscript.DEVANAGARI)
+
+    def transliterate(self, text: str) -> str:
+        pieces = _WHITESPACE.split(text)
+        # Odd positions are the whitespace separators
+        for k in range(0, len(pieces), 2):
+            if pieces[k]:
+                pieces[k] = self._word(pieces[k])
+        return "".join(pieces)
+
+    def cache_info(self):
+        return self._word.cache_info() if hasattr(self._word, "cache_info") else None
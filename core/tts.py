@@ -1,27 +1,172 @@
 import os
-from gtts import gTTS
-import pyttsx3
 import logging
+import queue
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Tuple
+from .cache import content_hash
 
 logger = logging.getLogger(__name__)
 
+class AudioCache:
+    """
+    Content-addressed audio files on disk with a size-bounded LRU.
+    Files are named by the hash of (text, lang, engine, voice), written to a temporary
+    name and renamed into place, so a reader never sees a partial file. Recency survives
+    restarts through file mtimes. Paths are handed to clients that fetch them later, so a
+    file used within the last grace_seconds is not evicted, even if the cache is over its
+    bound for a while.
+    """
+    def __init__(self, directory: str, max_bytes: int, grace_seconds: float = 60.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.grace_seconds = grace_seconds
+        self._lock = threading.Lock()
+        # name -> (size, last used as time.time()), least recently used first
+        self._files: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._total = 0
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.startswith(".") or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, name, stat.st_size))
+        for mtime, name, size in sorted(entries):
+            self._files[name] = (size, mtime)
+            self._total += size
+
+    @staticmethod
+    def make_key(text: str, lang: str, engine: str, voice: Optional[str]) -> str:
+        return content_hash(text, lang, engine, voice or "")
+
+    def get(self, name: str) -> Optional[str]:
+        with self._lock:
+            if name not in self._files:
+                self.misses += 1
+                return None
+            self._files[name] = (self._files[name][0], time.time())
+            self._files.move_to_end(name)
+            self.hits += 1
+        path = os.path.join(self.directory, name)
+        try:
+            os.utime(path)
+        except OSError:
+            # Deleted behind our back; forget it
+            with self._lock:
+                self._total -= self._files.pop(name, (0, 0.0))[0]
+            return None
+        return path
+
+    def temp_path(self, name: str) -> str:
+        return os.path.join(self.directory, f".{uuid.uuid4().hex}-{name}")
+
+    def put(self, name: str, temp_path: str) -> str:
+        """
+        Moves a finished file into the cache and evicts the least recently used files over
+        the bound, except those used within the grace period.
+        """
+        path = os.path.join(self.directory, name)
+        os.replace(temp_path, path)
+        size = os.path.getsize(path)
+        evicted = []
+        now = time.time()
+        with self._lock:
+            self._total += size - self._files.pop(name, (0, 0.0))[0]
+            self._files[name] = (size, now)
+            while self._total > self.max_bytes and len(self._files) > 1:
+                old, (old_size, used) = next(iter(self._files.items()))
+                # Entries are in order of use, so every later one is within the grace period too
+                if now - used < self.grace_seconds:
+                    break
+                del self._files[old]
+                self._total -= old_size
+                evicted.append(old)
+        for old in evicted:
+            try:
+                os.remove(os.path.join(self.directory, old))
+            except OSError:
+                pass
+        return path
+
+    def stats(self):
+        return {"files": len(self._files), "bytes": self._total, "hits": self.hits, "misses": self.misses}
+
 class TTS:
-    def __init__(self, use_online=True):
+    def __init__(self, use_online=True, voice: str = None, cache_dir: str = "outputs/tts_cache",
+                 cache_max_mb: float = 200, output_dir: str = "outputs"):
         self.use_online = use_online
+        # gTTS: top-level domain for the accent (e.g. "co.in"); pyttsx3: voice id
+        self.voice = voice or None
+        self.output_dir = output_dir
+        self.cache = AudioCache(cache_dir, int(cache_max_mb * 1024 * 1024)) if cache_max_mb > 0 else None
         self.offline_engine = None
+        # Concurrent requests for the same phrase share one synthesis
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tts")
+        self._offline_queue = None
         if not use_online:
             self._init_offline()
 
     def _init_offline(self):
+        # pyttsx3 engines are not thread-safe and runAndWait blocks, so one thread owns the engine
+        self._offline_queue = queue.Queue()
+        ready = threading.Event()
+        threading.Thread(target=self._offline_worker, args=(ready,), name="tts-offline", daemon=True).start()
+        ready.wait()
+
+    def _offline_worker(self, ready: threading.Event):
         try:
+            import pyttsx3
             self.offline_engine = pyttsx3.init()
+            if self.voice:
+                self.offline_engine.setProperty('voice', self.voice)
         except Exception as e:
             logger.warning(f"Failed to init pyttsx3: {e}")
+        finally:
+            ready.set()
 
-    def speak(self, text: str, lang: str = 'hi', output_file: str = "output.mp3") -> str:
-        """Generates audio from text. Returns path to audio file."""
+        while True:
+            text, output_file, future = self._offline_queue.get()
+            if future.set_running_or_notify_cancel():
+                try:
+                    self.offline_engine.save_to_file(text, output_file)
+                    self.offline_engine.runAndWait()
+                    future.set_result(output_file)
+                except Exception as e:
+                    future.set_exception(e)
+
+    @property
+    def engine(self) -> str:
+        return "gtts" if self.use_online else "pyttsx3"
+
+    def _synthesize(self, text: str, target_lang: str, output_file: str) -> str:
+        if self.use_online:
+            from gtts import gTTS
+            tts = gTTS(text=text, lang=target_lang, slow=False, **({"tld": self.voice} if self.voice else {}))
+            tts.save(output_file)
+            return output_file
+        if not self.offline_engine:
+            raise RuntimeError("No offline engine available")
+        # pyttsx3 is limited in language support out of box
+        future = Future()
+        self._offline_queue.put((text, output_file, future))
+        return future.result()
+
+    def submit(self, text: str, lang: str = 'hi', output_file: str = None) -> Future:
+        """Queues synthesis and returns a Future of the audio path ("" on failure)."""
+        future = Future()
         if not text:
-            return ""
+            future.set_result("")
+            return future
 
         # Map typical lang codes to gTTS
         lang_map = {
@@ -31,21 +176,55 @@ class TTS:
             'Marathi': 'mr'
         }
         target_lang = lang_map.get(lang, 'en')
+        extension = ".mp3" if self.use_online else ".wav"
+        name = AudioCache.make_key(text, target_lang, self.engine, self.voice) + extension
 
+        if self.cache is not None:
+            cached = self.cache.get(name)
+            if cached:
+                future.set_result(self._deliver(cached, output_file))
+                return future
+            if not output_file:
+                with self._pending_lock:
+                    if name in self._pending:
+                        return self._pending[name]
+                    self._pending[name] = future
+
+        self._executor.submit(self._run, future, name, text, target_lang, extension, output_file)
+        return future
+
+    def _run(self, future: Future, name: str, text: str, target_lang: str, extension: str, output_file: str):
         try:
-            if self.use_online:
-                tts = gTTS(text=text, lang=target_lang, slow=False)
-                tts.save(output_file)
-                return output_file
+            if self.cache is not None:
+                temp_path = self.cache.temp_path(name)
+                try:
+                    path = self._deliver(self.cache.put(name, self._synthesize(text, target_lang, temp_path)), output_file)
+                finally:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
             else:
-                if self.offline_engine:
-                    # pyttsx3 is limited in language support out of box
-                    self.offline_engine.save_to_file(text, output_file)
-                    self.offline_engine.runAndWait()
-                    return output_file
-                else:
-                    logger.error("No offline engine available")
-                    return ""
+                path = self._synthesize(text, target_lang, output_file or self._unique_path(extension))
         except Exception as e:
             logger.error(f"TTS Error: {e}")
-            return ""
+            path = ""
+        finally:
+            with self._pending_lock:
+                if self._pending.get(name) is future:
+                    del self._pending[name]
+        future.set_result(path)
+
+    def _unique_path(self, extension: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        return os.path.join(self.output_dir, f"tts_{uuid.uuid4().hex}{extension}")
+
+    @staticmethod
+    def _deliver(cached_path: str, output_file: Optional[str]) -> str:
+        """Cached files are immutable and named by content, so they are returned as-is unless a copy is asked for."""
+        if not output_file:
+            return cached_path
+        shutil.copyfile(cached_path, output_file)
+        return output_file
+
+    def speak(self, text: str, lang: str = 'hi', output_file: str = None) -> str:
+        """Generates audio from text. Returns path to audio file."""
+        return self.submit(text, lang, output_file).result()
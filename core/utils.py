@@ -1,19 +1,105 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
 from dotenv import load_dotenv
 
+_log_queue = None
+_log_handlers = []
+_log_listener = None
+
 def setup_logger(name="BharatCodeMix"):
-    """Configures and returns a logger instance."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler("app.log", encoding='utf-8')
-        ]
-    )
+    """
+    Configures and returns a logger instance.
+    Records are put on a queue and written to the console and app.log by a listener
+    thread, so request threads never wait on the file.
+    """
+    global _log_queue, _log_handlers
+    if _log_queue is None:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        _log_handlers = [logging.StreamHandler(), logging.FileHandler("app.log", encoding='utf-8')]
+        for handler in _log_handlers:
+            handler.setFormatter(formatter)
+        _log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(_log_queue)
+        # The listener's handlers do the formatting; this only merges the message arguments
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+        _start_log_listener()
+        atexit.register(lambda: _log_listener.stop())
     return logging.getLogger(name)
 
+def _start_log_listener():
+    global _log_listener
+    _log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+    _log_listener.start()
+
+def restart_log_listener():
+    """Threads do not survive fork: a forked child calls this to drain its copy of the log queue."""
+    if _log_queue is not None:
+        _start_log_listener()
+
+class StartupProfile:
+    """Records import, model-load and first-inference time per component (first measurement wins)."""
+    PHASES = ("import", "load", "first_inference")
+
+    def __init__(self):
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def has(self, component: str, phase: str) -> bool:
+        return phase in self._timings.get(component, {})
+
+    @contextmanager
+    def measure(self, component: str, phase: str):
+        if self.has(component, phase):
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._timings.setdefault(component, {}).setdefault(phase, elapsed)
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {component: dict(phases) for component, phases in self._timings.items()}
+
+    def format_report(self) -> str:
+        lines = [f"{'component':<40}" + "".join(f"{phase:>17}" for phase in self.PHASES)]
+        for component, phases in self.report().items():
+            cells = "".join(
+                f"{phases[phase]:>16.2f}s" if phase in phases else f"{'-':>17}" for phase in self.PHASES
+            )
+            lines.append(f"{component:<40}{cells}")
+        return "\n".join(lines)
+
+# Shared by every component so one report covers the whole process
+startup_profile = StartupProfile()
+
+class StageTimer:
+    """Wall time per pipeline stage of one request, in milliseconds; a stage measured twice adds up."""
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage: str, seconds: float):
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds * 1000
+
 def load_config():
     """Loads environment variables and returns a config dictionary."""
     load_dotenv()
@@ -22,4 +108,67 @@ def load_config():
         "USE_GPU": os.getenv("USE_GPU", "False").lower() == "true",
         "DEFAULT_MODEL_EN_HI": "Helsinki-NLP/opus-mt-en-hi",
         "DEFAULT_MODEL_HI_EN": "Helsinki-NLP/opus-mt-hi-en",
+        # Extra or replacement language pairs, e.g. "English-Marathi=Helsinki-NLP/opus-mt-en-mr,hi-en=<model>"
+        "MODEL_PAIRS": os.getenv("MODEL_PAIRS", ""),
+        # Memory budget for resident translation models in MB (0 = unlimited; least recently used are evicted)
+        "MODEL_MEMORY_MB": float(os.getenv("MODEL_MEMORY_MB", "0")),
+        # Seconds before a model that failed to load is tried again (doubles per failure)
+        "MODEL_RETRY_SECONDS": float(os.getenv("MODEL_RETRY_SECONDS", "30")),
+        # Maximum number of sentences sent to a single model.generate call
+        "MAX_BATCH_SIZE": int(os.getenv("MAX_BATCH_SIZE", "32")),
+        # Padded token budget (batch size x longest sequence) per generate call
+        "MAX_BATCH_TOKENS": int(os.getenv("MAX_BATCH_TOKENS", "2048")),
+        # Translation result cache: in-memory LRU size (0 disables) and optional sqlite file
+        "CACHE_SIZE": int(os.getenv("CACHE_SIZE", "10000")),
+        "CACHE_PATH": os.getenv("CACHE_PATH"),
+        # Async serving: micro-batch window, bounded queue ('wait' or 'reject' when full), per-request timeout
+        "SERVE_BATCH_WINDOW_MS": float(os.getenv("SERVE_BATCH_WINDOW_MS", "10")),
+        "SERVE_MAX_QUEUE": int(os.getenv("SERVE_MAX_QUEUE", "256")),
+        "SERVE_OVERFLOW_POLICY": os.getenv("SERVE_OVERFLOW_POLICY", "wait"),
+        "SERVE_TIMEOUT": float(os.getenv("SERVE_TIMEOUT", "30")),
+        "SERVE_WORKERS": int(os.getenv("SERVE_WORKERS", "1")),
+        # Worker processes for translation (0 = translate in the serving process) and torch threads in each
+        "SERVE_PROCESSES": int(os.getenv("SERVE_PROCESSES", "0")),
+        "SERVE_THREADS_PER_PROCESS": int(os.getenv("SERVE_THREADS_PER_PROCESS", "1")),
+        # Voice activity detection for speech input: skip silence and split segments at pauses
+        "STT_VAD": os.getenv("STT_VAD", "False").lower() == "true",
+        "STT_VAD_MIN_SILENCE_MS": int(os.getenv("STT_VAD_MIN_SILENCE_MS", "500")),
+        # Speech output: gTTS (online) or pyttsx3, voice (gTTS accent domain or pyttsx3 voice id) and audio cache
+        "TTS_ONLINE": os.getenv("TTS_ONLINE", "True").lower() == "true",
+        "TTS_VOICE": os.getenv("TTS_VOICE", ""),
+        "TTS_CACHE_DIR": os.getenv("TTS_CACHE_DIR", "outputs/tts_cache"),
+        "TTS_CACHE_MB": float(os.getenv("TTS_CACHE_MB", "200")),
+        # Model warm-up at startup: 'off' (load on first use), 'background' or 'blocking'
+        "WARMUP": os.getenv("WARMUP", "off").lower(),
+        # Poll the slang map / glossary files for edits every N seconds (0 = only on explicit reload)
+        "RESOURCE_POLL_SECONDS": float(os.getenv("RESOURCE_POLL_SECONDS", "0")),
+        # Character n-gram language ID (train with scripts/train_langid.py); used when the file exists
+        "LANGID_MODEL_PATH": os.getenv("LANGID_MODEL_PATH", "data/langid_ngram.npz"),
+        "LANGID_MIN_CONFIDENCE": float(os.getenv("LANGID_MIN_CONFIDENCE", "0.8")),
+        # Document mode: sentences per translate_batch chunk, chunks in flight at once, longest sentence before it is cut
+        "DOC_CHUNK_SENTENCES": int(os.getenv("DOC_CHUNK_SENTENCES", "32")),
+        "DOC_CONCURRENCY": int(os.getenv("DOC_CONCURRENCY", "2")),
+        "DOC_MAX_SENTENCE_CHARS": int(os.getenv("DOC_MAX_SENTENCE_CHARS", "400")),
+        # Route Hinglish token spans separately so only the English parts reach the EN->HI model
+        "SPAN_ROUTING": os.getenv("SPAN_ROUTING", "False").lower() == "true",
+        # Distinct words kept in the transliteration LRU (0 disables memoization)
+        "TRANSLIT_CACHE_SIZE": int(os.getenv("TRANSLIT_CACHE_SIZE", "50000")),
+        # Use the compiled trie transducer instead of sanscript for ITRANS -> Devanagari
+        "TRANSLIT_COMPILED": os.getenv("TRANSLIT_COMPILED", "False").lower() == "true",
+        # Quality estimation: embeddings kept in the LRU, float16 storage, skipping rule-based routes
+        "QE_CACHE_SIZE": int(os.getenv("QE_CACHE_SIZE", "4096")),
+        "QE_HALF_PRECISION": os.getenv("QE_HALF_PRECISION", "False").lower() == "true",
+        "QE_SKIP_DETERMINISTIC": os.getenv("QE_SKIP_DETERMINISTIC", "False").lower() == "true",
+        # Inference backend for Marian and the QE encoder: torch, torch-int8 or onnx
+        "INFERENCE_BACKEND": os.getenv("INFERENCE_BACKEND", "torch").lower(),
+        # Where scripts/export_backend.py writes the ONNX graphs
+        "ONNX_EXPORT_DIR": os.getenv("ONNX_EXPORT_DIR", "models/onnx"),
+        # Translation memory file (scripts/import_tm.py writes it) and the similarity that counts as a match
+        "TM_PATH": os.getenv("TM_PATH", "data/translation_memory.jsonl.gz"),
+        "TM_THRESHOLD": float(os.getenv("TM_THRESHOLD", "0.9")),
+        # Metrics: stage timings, counters and token counts; Prometheus endpoint port (0 = off) and JSON dump
+        "METRICS_ENABLED": os.getenv("METRICS_ENABLED", "False").lower() == "true",
+        "METRICS_PORT": int(os.getenv("METRICS_PORT", "0")),
+        "METRICS_JSON_PATH": os.getenv("METRICS_JSON_PATH", ""),
+        "METRICS_JSON_INTERVAL": float(os.getenv("METRICS_JSON_INTERVAL", "60")),
     }
@@ -0,0 +1,271 @@
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Dict, List
+from .document import translate_document
+from .metrics import merge_snapshots
+from .utils import load_config, restart_log_listener
+
+logger = logging.getLogger(__name__)
+
+def _pin_threads(threads: int):
+    """Caps torch intra-op threads so N workers do not oversubscribe the cores."""
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+def _after_fork(pipeline):
+    """Replaces the state a forked child must not share with its parent."""
+    restart_log_listener()
+    # Counts from before the fork belong to the parent's snapshot
+    pipeline.metrics.reset()
+    # A load in progress in the parent never completes here
+    pipeline.registry.after_fork()
+    if pipeline.cache is not None:
+        pipeline.cache.after_fork()
+    # Threads do not survive fork; restart the resource watcher in the child
+    if pipeline.config["RESOURCE_POLL_SECONDS"] > 0:
+        pipeline.resources.stop_watching()
+        pipeline.resources.start_watching(pipeline.config["RESOURCE_POLL_SECONDS"])
+
+def _worker_main(index: int, pipeline, threads: int, requests, results):
+    _pin_threads(threads)
+    try:
+        if pipeline is None:
+            # spawn: nothing is inherited, so build (and load) a pipeline here
+            from .pipeline import TranslationPipeline
+            pipeline = TranslationPipeline()
+            pipeline.warmup(background=False)
+        else:
+            _after_fork(pipeline)
+    except Exception as e:
+        logger.error(f"Worker {index} failed to start: {e}")
+        results.put(("failed", index, None, str(e)))
+        return
+    results.put(("ready", index, None, None))
+
+    while True:
+        message = requests.get()
+        if message is None:
+            break
+        kind, request_id, payload = message
+        try:
+            if kind == "translate":
+                value = pipeline.translate_batch(*payload)
+            elif kind == "reload":
+                value = pipeline.reload_resources()
+            elif kind == "metrics":
+                value = pipeline.metrics_snapshot()
+            elif kind == "models":
+                value = pipeline.model_stats()
+            else:
+                raise ValueError(f"Unknown worker request: {kind}")
+            results.put(("done", index, request_id, value))
+        except Exception as e:
+            logger.error(f"Worker {index} failed on {kind}: {e}")
+            results.put(("error", index, request_id, f"{type(e).__name__}: {e}"))
+
+class WorkerPool:
+    """
+    Runs translate_batch in N worker processes, each with its own GIL and a pinned torch
+    thread count. With the fork start method (Linux) the models are loaded once in the
+    parent before the workers start, so the weights are shared copy-on-write instead of
+    being loaded N times; under spawn each worker loads its own pipeline, and safetensors
+    checkpoints are memory-mapped from the page cache.
+    Requests go to the worker with the fewest in flight over a per-worker queue, which
+    also lets reload_resources reach every worker. translate_batch has the pipeline's
+    signature, so the pool can stand in for the pipeline behind AsyncTranslationEngine.
+    Create the pool at startup, before the parent serves any requests.
+    A worker that dies fails the requests it held and gets no new ones; translate_batch
+    waits at most request_timeout seconds.
+    """
+    def __init__(self, pipeline=None, num_workers: int = None, threads_per_worker: int = 1, start_method: str = None,
+                 request_timeout: float = 300.0):
+        if start_method is None:
+            start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        context = multiprocessing.get_context(start_method)
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.num_workers = num_workers or max(1, (os.cpu_count() or 1) // self.threads_per_worker)
+        self.start_method = start_method
+        self.request_timeout = request_timeout
+
+        shared = None
+        if start_method == "fork":
+            if pipeline is None:
+                from .pipeline import TranslationPipeline
+                pipeline = TranslationPipeline()
+            # Load everything before forking so every worker maps the same pages
+            pipeline.warmup(background=False)
+            shared = pipeline
+        # Document mode splits in this process and spreads the chunks over the workers
+        config = pipeline.config if pipeline is not None else load_config()
+        self.document_chunk_sentences = config["DOC_CHUNK_SENTENCES"]
+        self.document_max_chars = config["DOC_MAX_SENTENCE_CHARS"]
+
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._futures: Dict[int, Future] = {}
+        self._assigned: Dict[int, int] = {}
+        self._in_flight = [0] * self.num_workers
+        self._dead = set()
+        self._ready = [threading.Event() for _ in range(self.num_workers)]
+        self._closed = False
+
+        self._results = context.Queue()
+        self._requests = []
+        self._processes = []
+        for index in range(self.num_workers):
+            requests = context.Queue()
+            process = context.Process(
+                target=_worker_main, args=(index, shared, self.threads_per_worker, requests, self._results),
+                name=f"translate-worker-{index}", daemon=True,
+            )
+            process.start()
+            self._requests.append(requests)
+            self._processes.append(process)
+
+        self._reader = threading.Thread(target=self._read_results, name="worker-results", daemon=True)
+        self._reader.start()
+
+    @classmethod
+    def from_config(cls, pipeline, config: Dict) -> "WorkerPool":
+        return cls(pipeline, num_workers=config["SERVE_PROCESSES"], threads_per_worker=config["SERVE_THREADS_PER_PROCESS"],
+                   request_timeout=config["SERVE_TIMEOUT"])
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Blocks until every worker has started (or failed to). Returns False on timeout."""
+        return all(event.wait(timeout) for event in self._ready)
+
+    def pids(self) -> List[int]:
+        return [process.pid for process in self._processes]
+
+    def _alive_workers(self) -> List[int]:
+        return [index for index, process in enumerate(self._processes)
+                if index not in self._dead and process.is_alive()]
+
+    def _submit(self, kind: str, payload, worker: int = None) -> Future:
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("WorkerPool is closed")
+            if worker is None:
+                alive = self._alive_workers()
+                if not alive:
+                    raise RuntimeError("No translation worker is alive")
+                worker = min(alive, key=self._in_flight.__getitem__)
+            request_id = next(self._ids)
+            self._futures[request_id] = future
+            self._assigned[request_id] = worker
+            self._in_flight[worker] += 1
+        self._requests[worker].put((kind, request_id, payload))
+        return future
+
+    def _broadcast(self, kind: str) -> List[Future]:
+        """Sends a request to every live worker."""
+        workers = self._alive_workers()
+        if not workers:
+            raise RuntimeError("No translation worker is alive")
+        return [self._submit(kind, None, worker) for worker in workers]
+
+    def submit(self, texts: List[str], target_lang="Hindi", max_batch_size=None) -> Future:
+        """Queues a batch; the future resolves to the translate_batch results."""
+        return self._submit("translate", (list(texts), target_lang, max_batch_size))
+
+    def translate_batch(self, texts: List[str], target_lang="Hindi", max_batch_size=None) -> List[Dict]:
+        return self.submit(texts, target_lang, max_batch_size).result(timeout=self.request_timeout)
+
+    def translate(self, text, source_lang_hint=None, target_lang="Hindi"):
+        return self.translate_batch([text], target_lang)[0]
+
+    def translate_document(self, text, target_lang="Hindi") -> Dict:
+        """Like TranslationPipeline.translate_document, with the chunks spread over the workers."""
+        # One chunk per worker at a time, each bounded like translate_batch
+        return translate_document(self.submit, text, target_lang, self.document_chunk_sentences,
+                                  self.document_max_chars, self.num_workers, self.request_timeout)
+
+    def reload_resources(self) -> int:
+        """Reloads the slang map and glossary in every worker. Returns the newest version in use."""
+        futures = self._broadcast("reload")
+        return max(future.result() for future in futures)
+
+    def metrics_snapshot(self) -> Dict:
+        """Metrics of every worker added together (see core.metrics.merge_snapshots)."""
+        futures = self._broadcast("metrics")
+        return merge_snapshots([future.result() for future in futures])
+
+    def model_stats(self) -> List[Dict]:
+        """Model registry stats of each worker (models are loaded and evicted per process)."""
+        futures = self._broadcast("models")
+        return [future.result() for future in futures]
+
+    def _resolve(self, request_id: int, value=None, error: str = None):
+        with self._lock:
+            future = self._futures.pop(request_id, None)
+            worker = self._assigned.pop(request_id, None)
+            if worker is not None:
+                self._in_flight[worker] -= 1
+        if future is None or future.done():
+            return
+        if error is None:
+            future.set_result(value)
+        else:
+            future.set_exception(RuntimeError(error))
+
+    def _read_results(self):
+        while True:
+            # Checked on every pass: under load the queue is never idle, and a dead
+            # worker's requests would otherwise wait forever
+            self._fail_dead_workers()
+            try:
+                kind, index, request_id, value = self._results.get(timeout=0.5)
+            except queue.Empty:
+                if self._closed:
+                    return
+                continue
+            except (EOFError, OSError):
+                return
+
+            if kind in ("ready", "failed"):
+                if kind == "failed":
+                    logger.error(f"Translation worker {index} did not start: {value}")
+                self._ready[index].set()
+            elif kind == "done":
+                self._resolve(request_id, value)
+            elif kind == "error":
+                self._resolve(request_id, error=value)
+
+    def _fail_dead_workers(self):
+        """Fails the requests of workers that exited, so callers are not left waiting."""
+        for index, process in enumerate(self._processes):
+            if process.is_alive():
+                continue
+            self._ready[index].set()
+            with self._lock:
+                if index not in self._dead:
+                    self._dead.add(index)
+                    if not self._closed:
+                        logger.error(f"Translation worker {index} exited with code {process.exitcode}")
+                lost = [request_id for request_id, worker in self._assigned.items() if worker == index]
+            for request_id in lost:
+                self._resolve(request_id, error=f"Worker {index} exited with code {process.exitcode}")
+
+    def close(self, timeout: float = 5.0):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for requests in self._requests:
+            requests.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._fail_dead_workers()
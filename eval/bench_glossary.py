@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import random
+import re
+import string
+import time
+from core.glossary import GlossaryManager
+
+SAMPLE_MESSAGES = [
+    "Please deploy the server fix before the merge",
+    "Main aaj bahut happy hoon, bug fix ho gaya",
+    "Can you review my commit on the feature branch?",
+    "React app crash ho raha hai after the last deploy",
+    "Hello world, how are you?",
+]
+
+def legacy_simple_replace(glossary, text):
+    """The previous implementation: one regex compile and substitution per glossary entry."""
+    for source, target in glossary.items():
+        pattern = re.compile(r'\b' + re.escape(str(source)) + r'\b', re.IGNORECASE)
+        text = pattern.sub(str(target), text)
+    return text
+
+def synthetic_glossary(size, seed=0):
+    rng = random.Random(seed)
+    glossary = {}
+    while len(glossary) < size:
+        length = rng.randint(4, 12)
+        term = "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+        glossary[term] = term.upper()
+    # Keep the real terms so the sample messages contain matches
+    for term in ["React", "deploy", "server", "bug", "commit", "merge", "branch", "feature"]:
+        glossary[term] = term
+    return glossary
+
+def time_per_message(fn, messages, min_seconds=0.5, max_rounds=1000):
+    rounds = 0
+    start = time.perf_counter()
+    while True:
+        for message in messages:
+            fn(message)
+        rounds += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds or rounds >= max_rounds:
+            return elapsed / (rounds * len(messages))
+
+def run_benchmark(sizes, min_seconds):
+    results = []
+    for size in sizes:
+        glossary = synthetic_glossary(size)
+        manager = GlossaryManager()
+
+        start = time.perf_counter()
+        manager.set_glossary(glossary)
+        build_s = time.perf_counter() - start
+
+        # The legacy loop is very slow on large glossaries, so give it a single round
+        legacy_s = time_per_message(lambda m: legacy_simple_replace(glossary, m), SAMPLE_MESSAGES,
+                                    min_seconds=min_seconds, max_rounds=1 if size > 1000 else 1000)
+        matcher_s = time_per_message(manager.simple_replace, SAMPLE_MESSAGES, min_seconds=min_seconds)
+
+        for message in SAMPLE_MESSAGES:
+            assert manager.simple_replace(message) == legacy_simple_replace(glossary, message), message
+
+        results.append({
+            "glossary_size": size,
+            "matcher_build_ms": build_s * 1000,
+            "legacy_us_per_message": legacy_s * 1e6,
+            "matcher_us_per_message": matcher_s * 1e6,
+            "speedup": legacy_s / matcher_s,
+        })
+        print(f"{size:>8} entries | build {build_s * 1000:8.1f} ms | legacy {legacy_s * 1e6:12.1f} us/msg"
+              f" | matcher {matcher_s * 1e6:8.1f} us/msg | x{legacy_s / matcher_s:,.0f}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Glossary matcher vs per-term regex loop")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10000, 100000])
+    parser.add_argument("--min-seconds", type=float, default=0.5)
+    parser.add_argument("--output", default="outputs/bench_glossary.json")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, args.min_seconds)
+
+    if not os.path.exists("outputs"):
+        os.makedirs("outputs")
+    with open(args.output, "w", encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
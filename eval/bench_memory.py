@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import numpy as np
+from core.memory import TranslationMemory, _normalize, _trigrams
+
+def synthetic_corpus(count, seed):
+    """Sentences over a Zipf-distributed vocabulary of random words, like real word frequencies."""
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    vocab = ["".join(rng.choice(letters, size=max(1, int(rng.normal(5, 2))))) for _ in range(30000)]
+    weights = 1 / np.arange(1, len(vocab) + 1) ** 1.05
+    weights /= weights.sum()
+    lengths = rng.integers(4, 21, size=count)
+    words = rng.choice(len(vocab), size=int(lengths.sum()), p=weights)
+    sentences, start = [], 0
+    for length in lengths:
+        sentences.append(" ".join(vocab[i] for i in words[start:start + length]))
+        start += length
+    return sentences, vocab
+
+def queries_for(sentences, vocab, count, seed):
+    """Half near-duplicates (one word swapped), half unrelated sentences."""
+    rng = random.Random(seed)
+    queries = []
+    for i in range(count):
+        if i % 2:
+            queries.append(" ".join(rng.choice(vocab[:2000]) for _ in range(rng.randint(4, 20))))
+            continue
+        words = rng.choice(sentences).split()
+        words[rng.randrange(len(words))] = rng.choice(vocab[:2000])
+        queries.append(" ".join(words))
+    return queries
+
+def short_strings(count, seed):
+    """Short strings over a few letters: many pairs have a similarity exactly on a threshold."""
+    rng = random.Random(seed)
+    return ["".join(rng.choice("abcdef ") for _ in range(rng.randint(5, 14))).strip() or "a" for _ in range(count)]
+
+def brute_force(sentences, query, threshold):
+    grams = _trigrams(_normalize(query))
+    best = None
+    for sentence in sentences:
+        other = _trigrams(_normalize(sentence))
+        similarity = 2 * len(grams & other) / (len(grams) + len(other))
+        if similarity >= threshold and (best is None or similarity > best):
+            best = similarity
+    return best
+
+def boundary_mismatches(memory, sentences, queries):
+    """
+    Looks each query up with the threshold set to its exact best brute-force similarity, so
+    the best candidate sits exactly on the threshold and must still be returned.
+    """
+    mismatches = 0
+    for query in queries:
+        best = brute_force(sentences, query, 0.0)
+        if best is None or not 0 < best < 1:
+            continue
+        match = memory.lookup(query, "Hindi", best)
+        if match is None or abs(match["similarity"] - best) > 1e-9:
+            mismatches += 1
+    return mismatches
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Translation memory lookup latency and exactness")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.9, 0.8])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--check", type=int, default=50,
+                        help="Queries compared with a brute-force scan (smallest size), at each threshold"
+                             " and at a threshold equal to their best similarity")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="outputs/bench_memory.json")
+    args = parser.parse_args()
+
+    results = []
+    mismatches = 0
+    for size in args.sizes:
+        sentences, vocab = synthetic_corpus(size, args.seed)
+        memory = TranslationMemory()
+        start = time.perf_counter()
+        for i, sentence in enumerate(sentences):
+            memory.add(sentence, f"target {i}")
+        build = time.perf_counter() - start
+        queries = queries_for(sentences, vocab, args.queries, args.seed)
+
+        for threshold in args.thresholds:
+            latencies, hits = [], 0
+            for query in queries:
+                start = time.perf_counter()
+                match = memory.lookup(query, "Hindi", threshold)
+                latencies.append(time.perf_counter() - start)
+                hits += match is not None
+                if size == min(args.sizes) and len(latencies) <= args.check:
+                    expected = brute_force(sentences, query, threshold)
+                    found = match["similarity"] if match else None
+                    if (expected is None) != (found is None) or (expected is not None and abs(expected - found) > 1e-9):
+                        mismatches += 1
+            row = {
+                "entries": size,
+                "threshold": threshold,
+                "build_s": build,
+                "hit_rate": hits / len(queries),
+                "mean_us": 1e6 * sum(latencies) / len(latencies),
+                "p95_us": 1e6 * float(np.percentile(latencies, 95)),
+            }
+            results.append(row)
+            print(f"{size:>9,} entries | threshold {threshold:.2f} | mean {row['mean_us']:7.0f} us"
+                  f" | p95 {row['p95_us']:7.0f} us | hits {row['hit_rate']:.0%} | built in {build:.1f} s")
+        if size == min(args.sizes):
+            mismatches += boundary_mismatches(memory, sentences, queries[:args.check])
+
+    # Float rounding in the candidate bounds shows up on short strings (e.g. 12 * 0.8 / 1.2 > 8)
+    sentences = short_strings(3000, args.seed)
+    memory = TranslationMemory()
+    for i, sentence in enumerate(sentences):
+        memory.add(sentence, f"target {i}")
+    mismatches += boundary_mismatches(memory, sentences, short_strings(20 * args.check, args.seed + 1))
+
+    if not os.path.exists("outputs"):
+        os.makedirs("outputs")
+    with open(args.output, "w", encoding='utf-8') as f:
+        json.dump({"results": results, "mismatches": mismatches}, f, indent=2)
+    print(f"Brute-force mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
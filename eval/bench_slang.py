@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import random
+import string
+import time
+from core.matcher import PhraseMatcher, TermMatcher
+from core.normalize import Normalizer
+
+SLANG_MESSAGES = [
+    "Bindass yaar, exam ka load mat le!",
+    "Chalo bhai, fatafat timepass karte hai",
+    "Scene kya hai? Let's   go to the canteen, it's mast.",
+]
+# No slang map entry appears in these
+PLAIN_MESSAGES = [
+    "Kal ka plan kya hai, sab log aa rahe hain?",
+    "Meeting 5 baje hai, late mat hona",
+    "Thanks, report bhej di hai",
+]
+
+def legacy_normalize_slang(slang_map, text):
+    """The previous implementation: whitespace split, per-word strip/lower lookup, single-space join."""
+    normalized_words = []
+    for word in text.split():
+        lower_word = word.lower().strip(".,!?")
+        if lower_word in slang_map:
+            replacement = slang_map[lower_word]
+            if word[0].isupper():
+                replacement = replacement.capitalize()
+            normalized_words.append(replacement)
+        else:
+            normalized_words.append(word)
+    return " ".join(normalized_words)
+
+def synthetic_slang_map(size, seed=0):
+    """Random single- and multi-word keys plus the shipped slang map, so the samples contain matches."""
+    rng = random.Random(seed)
+    with open("data/slang_map.json", 'r', encoding='utf-8') as f:
+        slang_map = json.load(f)
+    slang_map["let's go"] = "come on"
+    while len(slang_map) < size:
+        words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+                 for _ in range(rng.choice((1, 1, 1, 2, 3)))]
+        slang_map.setdefault(" ".join(words), words[0].upper())
+    return slang_map
+
+def time_per_message(fn, messages, min_seconds, round_size=200):
+    """Best round of round_size passes over messages, so scheduler noise on shared machines does not count."""
+    best = float("inf")
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        round_start = time.perf_counter()
+        for _ in range(round_size):
+            fn(messages)
+        best = min(best, time.perf_counter() - round_start)
+    return best / (round_size * len(messages))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Slang normalization micro-benchmark")
+    parser.add_argument("--size", type=int, default=50000, help="Number of slang map entries")
+    parser.add_argument("--min-seconds", type=float, default=1.0)
+    parser.add_argument("--output", default="outputs/bench_slang.json")
+    args = parser.parse_args()
+
+    slang_map = synthetic_slang_map(args.size)
+    for message in PLAIN_MESSAGES:
+        for word in message.lower().replace(",", " ").replace("?", " ").split():
+            slang_map.pop(word, None)
+
+    start = time.perf_counter()
+    normalizer = Normalizer()
+    normalizer.slang_map = slang_map
+    normalizer.slang_matcher = PhraseMatcher(slang_map.items(), flexible_whitespace=True)
+    build_s = time.perf_counter() - start
+    char_trie = TermMatcher(slang_map.items(), flexible_whitespace=True)
+
+    results = {"slang_map_size": len(slang_map), "matcher_build_ms": build_s * 1000}
+    print(f"{len(slang_map):,} entries, matcher build {build_s * 1000:.1f} ms")
+    for name, messages in (("slang", SLANG_MESSAGES), ("plain", PLAIN_MESSAGES)):
+        timings = {
+            "legacy": time_per_message(lambda ms: [legacy_normalize_slang(slang_map, m) for m in ms], messages, args.min_seconds),
+            "char_trie": time_per_message(lambda ms: [char_trie.replace(m, normalizer._slang_replacement) for m in ms], messages, args.min_seconds),
+            "matcher": time_per_message(lambda ms: [normalizer.normalize_slang(m) for m in ms], messages, args.min_seconds),
+            "matcher_batch": time_per_message(normalizer.normalize_slang_batch, messages, args.min_seconds),
+        }
+        results[name] = {impl: seconds * 1e6 for impl, seconds in timings.items()}
+        print(f"  {name} messages (us/message): " + " | ".join(f"{impl} {us:.2f}" for impl, us in results[name].items()))
+
+    for message in SLANG_MESSAGES:
+        print(f"  {message!r}\n    legacy:  {legacy_normalize_slang(slang_map, message)!r}\n    matcher: {normalizer.normalize_slang(message)!r}")
+
+    if not os.path.exists("outputs"):
+        os.makedirs("outputs")
+    with open(args.output, "w", encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
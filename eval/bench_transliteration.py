@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from indic_transliteration import sanscript
+from core.transliterate import ItransTransducer, Transliterator
+
+def reference(text):
+    return sanscript.transliterate(text, sanscript.ITRANS, sanscript.DEVANAGARI)
+
+def corpus_sentences(path="data/langid_train.jsonl"):
+    """Hinglish sentences from the language ID corpus; chat-style text with a repetitive vocabulary."""
+    sentences = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                if row.get("lang") == "Hinglish":
+                    sentences.append(row["text"])
+    return sentences
+
+def random_inputs(transducer, count, seed=0):
+    """Random strings over the scheme's tokens plus punctuation, digits, accents and unmapped letters."""
+    rng = random.Random(seed)
+    alphabet = list(transducer.scheme_map.non_marks_viraama)
+    alphabet += list("aeiouAEIOU .,!?'0123xyzqw\\`_^~#") + ["\\'", "\\_", ".N", "M", "H", "  ", "\t"]
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))) for _ in range(count)]
+
+def check_parity(transducer, inputs):
+    """Returns the inputs on which any implementation disagrees with sanscript."""
+    implementations = {
+        "transducer": transducer.transliterate,
+        "cached_sanscript": Transliterator(use_transducer=False).transliterate,
+        "cached_transducer": Transliterator(use_transducer=True).transliterate,
+    }
+    failures = []
+    for text in inputs:
+        expected = reference(text)
+        for name, fn in implementations.items():
+            got = fn(text)
+            if got != expected:
+                failures.append({"impl": name, "input": text, "expected": expected, "got": got})
+    return failures
+
+def throughput(fn, messages, min_seconds):
+    chars = sum(len(m) for m in messages)
+    rounds = 0
+    start = time.perf_counter()
+    while True:
+        for message in messages:
+            fn(message)
+        rounds += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return rounds * len(messages) / elapsed, rounds * chars / elapsed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Transliteration parity check and throughput benchmark")
+    parser.add_argument("--random", type=int, default=20000, help="Number of random strings for the parity check")
+    parser.add_argument("--min-seconds", type=float, default=1.0)
+    parser.add_argument("--output", default="outputs/bench_transliteration.json")
+    args = parser.parse_args()
+
+    transducer = ItransTransducer()
+    sentences = corpus_sentences()
+    words = sorted({word for sentence in sentences for word in sentence.split()})
+
+    failures = check_parity(transducer, sentences + words + random_inputs(transducer, args.random))
+    print(f"Parity: {len(failures)} mismatches over {len(sentences)} sentences, {len(words)} words, {args.random} random strings")
+    for failure in failures[:10]:
+        print(f"  {failure}")
+
+    implementations = {
+        "sanscript": reference,
+        "transducer": transducer.transliterate,
+        "cached_sanscript": Transliterator(use_transducer=False).transliterate,
+        "cached_transducer": Transliterator(use_transducer=True).transliterate,
+    }
+    results = {"parity_mismatches": len(failures), "throughput": {}}
+    baseline = None
+    for name, fn in implementations.items():
+        per_s, chars_per_s = throughput(fn, sentences, args.min_seconds)
+        baseline = baseline or per_s
+        results["throughput"][name] = {"sentences_per_s": per_s, "chars_per_s": chars_per_s, "speedup": per_s / baseline}
+        print(f"{name:>18} | {per_s:10,.0f} sentences/s | {chars_per_s:12,.0f} chars/s | x{per_s / baseline:.1f}")
+
+    if not os.path.exists("outputs"):
+        os.makedirs("outputs")
+    with open(args.output, "w", encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import time
+from core.pipeline import TranslationPipeline
+from core.workers import WorkerPool
+
+def load_sources(path, count):
+    with open(path, 'r', encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    sources = [row["source"] for row in rows if row.get("target_lang", "Hindi") == "Hindi"]
+    # Suffix a counter so repeats are not answered by the result cache
+    return [f"{sources[i % len(sources)]} ({i})" for i in range(count)]
+
+def memory_kb(pid, field):
+    """Rss or Pss of a process from /proc (Linux); Pss splits shared pages between the processes using them."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", 'r') as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def run(translate_batch, submit_all, sources, batch_size):
+    batches = [sources[i:i + batch_size] for i in range(0, len(sources), batch_size)]
+    translate_batch(batches[0])  # warm
+    start = time.perf_counter()
+    submit_all(batches)
+    return len(sources) / (time.perf_counter() - start)
+
+if __name__ == "__main__":
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Throughput scaling of the multi-process worker pool")
+    parser.add_argument("--workers", type=int, nargs="+", default=[n for n in (1, 2, 4, 8, 16, 32) if n <= cpus])
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--sentences", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--data", default="data/eval_set.jsonl")
+    parser.add_argument("--output", default="outputs/bench_workers.json")
+    args = parser.parse_args()
+
+    os.environ["CACHE_SIZE"] = "0"
+    pipeline = TranslationPipeline()
+    pipeline.warmup(background=False)
+    sources = load_sources(args.data, args.sentences)
+
+    print(f"{cpus} CPUs")
+    results = {"cpus": cpus, "pools": []}
+
+    base = None
+    for workers in args.workers:
+        pool = WorkerPool(pipeline, num_workers=workers, threads_per_worker=args.threads_per_worker)
+        pool.wait_ready()
+        throughput = run(pool.translate_batch, lambda batches: [f.result() for f in [pool.submit(b) for b in batches]],
+                         sources, args.batch_size)
+        base = base or throughput / workers
+        rss = [memory_kb(pid, "Rss") for pid in pool.pids()]
+        pss = [memory_kb(pid, "Pss") for pid in pool.pids()]
+        pool.close()
+
+        row = {
+            "workers": workers,
+            "sentences_per_s": throughput,
+            "speedup": throughput / base,
+            "efficiency": throughput / (base * workers),
+            "rss_mb_total": sum(rss) / 1024 if None not in rss else None,
+            "pss_mb_total": sum(pss) / 1024 if None not in pss else None,
+        }
+        results["pools"].append(row)
+        memory = f" | RSS {row['rss_mb_total']:8.0f} MB | PSS {row['pss_mb_total']:8.0f} MB" if row["pss_mb_total"] else ""
+        print(f"{workers:>3} workers | {throughput:10,.1f} sentences/s | x{row['speedup']:5.2f}"
+              f" | efficiency {row['efficiency']:.0%}{memory}")
+
+    # Measured last: the pools fork this process, and inference here first would hand the
+    # workers its OpenMP thread state (see WorkerPool)
+    in_process = run(pipeline.translate_batch, lambda batches: [pipeline.translate_batch(b) for b in batches],
+                     sources, args.batch_size)
+    results["in_process_sentences_per_s"] = in_process
+    print(f"in-process: {in_process:,.1f} sentences/s")
+
+    if not os.path.exists("outputs"):
+        os.makedirs("outputs")
+    with open(args.output, "w", encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
@@ -0,0 +1,240 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is reported as null there
+    resource = None
+
+logging.basicConfig(level=logging.WARNING)
+
+WORKLOADS = ("english", "hinglish", "devanagari", "mixed")
+MODES = ("single", "batch", "async")
+STAGES = ("detect", "normalize", "transliterate", "glossary", "generate", "qe")
+# Sentences joined into one request for the short / medium / long inputs of the mixed workload
+LENGTHS = (1, 3, 8)
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+def summarize(values):
+    return {
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+    }
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far (it only grows)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def load_sentences(path):
+    """Sentences per language from the language ID training set."""
+    sentences = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                sentences.setdefault(row["lang"], []).append(row["text"])
+    return sentences
+
+def synthetic_workload(name, sentences, count, rng):
+    """(text, target_lang) requests; Hinglish alternates targets to cover both of its routes."""
+    requests = []
+    for i in range(count):
+        if name == "mixed":
+            lang = ("English", "Hinglish", "Hindi")[i % 3]
+            length = LENGTHS[(i // 3) % len(LENGTHS)]
+        else:
+            lang = {"english": "English", "hinglish": "Hinglish", "devanagari": "Hindi"}[name]
+            length = 1
+        text = " ".join(rng.choice(sentences[lang]) for _ in range(length))
+        if lang == "English":
+            target = "Hindi"
+        elif lang == "Hindi":
+            target = "English"
+        else:
+            target = ("Hindi", "English")[i % 2]
+        requests.append((text, target))
+    return requests
+
+def file_workload(path, count):
+    """Requests from a .jsonl file ('source' or 'text', optional 'target_lang'), cycled up to count."""
+    with open(path, 'r', encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    requests = [(row.get("source", row.get("text")), row.get("target_lang", "Hindi")) for row in rows]
+    return [requests[i % len(requests)] for i in range(count)]
+
+def run_single(pipeline, requests):
+    latencies, results = [], []
+    for text, target in requests:
+        start = time.perf_counter()
+        results.append(pipeline.translate(text, target_lang=target))
+        latencies.append(time.perf_counter() - start)
+    return latencies, results
+
+def run_batch(pipeline, requests, batch_size):
+    """Consecutive requests with the same target go out together; each one's latency is its batch's."""
+    latencies, results = [], []
+    i = 0
+    while i < len(requests):
+        target = requests[i][1]
+        batch = []
+        while i < len(requests) and len(batch) < batch_size and requests[i][1] == target:
+            batch.append(requests[i][0])
+            i += 1
+        start = time.perf_counter()
+        outputs = pipeline.translate_batch(batch, target_lang=target)
+        elapsed = time.perf_counter() - start
+        latencies.extend([elapsed] * len(outputs))
+        results.extend(outputs)
+    return latencies, results
+
+def run_async(engine, requests, concurrency):
+    """Keeps `concurrency` requests in flight through AsyncTranslationEngine."""
+    async def main():
+        slots = asyncio.Semaphore(concurrency)
+
+        async def one(text, target):
+            async with slots:
+                start = time.perf_counter()
+                result = await engine.translate_async(text, target_lang=target)
+                return time.perf_counter() - start, result
+
+        timed = await asyncio.gather(*(one(text, target) for text, target in requests))
+        await engine.close()
+        return [latency for latency, _ in timed], [result for _, result in timed]
+
+    return asyncio.run(main())
+
+def stage_breakdown(results):
+    """Per-stage time over the requests that ran the stage, from each result's logs['timings_ms']."""
+    stages = {}
+    for result in results:
+        for stage, ms in result["logs"].get("timings_ms", {}).items():
+            stages.setdefault(stage, []).append(ms)
+    return {
+        stage: {"requests": len(stages[stage]), **summarize(stages[stage])}
+        for stage in STAGES + tuple(sorted(set(stages) - set(STAGES))) if stage in stages
+    }
+
+def run(pipeline, requests, mode, args):
+    if mode == "single":
+        execute = lambda: run_single(pipeline, requests)
+    elif mode == "batch":
+        execute = lambda: run_batch(pipeline, requests, args.batch_size)
+    else:
+        from core.serving import AsyncTranslationEngine
+        execute = lambda: run_async(AsyncTranslationEngine.from_config(pipeline, pipeline.config), requests,
+                                    args.concurrency)
+
+    start = time.perf_counter()
+    latencies, results = execute()
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": len(requests),
+        "latency_ms": {key: 1000 * value for key, value in summarize(latencies).items()},
+        "throughput_requests_per_s": len(requests) / elapsed,
+        "stages_ms": stage_breakdown(results),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def find_regressions(results, baseline, threshold):
+    """Runs slower (p50/p95) or with lower throughput than the baseline by more than threshold."""
+    regressions = []
+    for key, run_result in results["runs"].items():
+        before = baseline.get("runs", {}).get(key)
+        if not before:
+            continue
+        for metric in ("p50", "p95"):
+            old, new = before["latency_ms"][metric], run_result["latency_ms"][metric]
+            if old > 0 and (new - old) / old > threshold:
+                regressions.append(f"{key} {metric} latency {old:.1f} -> {new:.1f} ms")
+        old, new = before["throughput_requests_per_s"], run_result["throughput_requests_per_s"]
+        if old > 0 and (old - new) / old > threshold:
+            regressions.append(f"{key} throughput {old:.1f} -> {new:.1f} req/s")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latency, throughput, per-stage time and peak RSS of the pipeline")
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS), choices=WORKLOADS)
+    parser.add_argument("--data", nargs="*", default=[],
+                        help="Extra .jsonl workloads ('source'/'text' and 'target_lang'), e.g. data/eval_set.jsonl")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per workload")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight in async mode")
+    parser.add_argument("--sentences", default="data/langid_train.jsonl", help="Sentence pool for synthetic workloads")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", action="store_true", help="Keep the result cache on (off by default)")
+    parser.add_argument("--baseline", help="Earlier benchmark JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown flagged as a regression")
+    parser.add_argument("--output", default="outputs/benchmark.json")
+    args = parser.parse_args()
+
+    # Read by load_config when the pipeline is built
+    if not args.cache:
+        os.environ["CACHE_SIZE"] = "0"
+    from core.pipeline import TranslationPipeline
+    pipeline = TranslationPipeline()
+    pipeline.warmup(background=False)
+
+    rng = random.Random(args.seed)
+    sentences = load_sentences(args.sentences)
+    workloads = {name: synthetic_workload(name, sentences, args.requests, rng) for name in args.workloads}
+    for path in args.data:
+        workloads[os.path.splitext(os.path.basename(path))[0]] = file_workload(path, args.requests)
+
+    # First inference per model is paid here, not by the first measured run
+    run_single(pipeline, [requests[0] for requests in workloads.values()])
+
+    results = {
+        "config": {
+            "inference_backend": pipeline.config["INFERENCE_BACKEND"],
+            "cache": args.cache,
+            "batch_size": args.batch_size,
+            "concurrency": args.concurrency,
+            "cpus": os.cpu_count(),
+        },
+        "rss_after_load_mb": peak_rss_mb(),
+        "runs": {},
+    }
+    print(f"{'run':>22} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'req/s':>8} | {'peak MB':>8}")
+    for name, requests in workloads.items():
+        for mode in args.modes:
+            key = f"{name}/{mode}"
+            result = results["runs"][key] = run(pipeline, requests, mode, args)
+            latency = result["latency_ms"]
+            rss = f"{result['peak_rss_mb']:8.0f}" if result["peak_rss_mb"] is not None else f"{'-':>8}"
+            print(f"{key:>22} | {latency['p50']:8.1f} | {latency['p95']:8.1f} | {latency['p99']:8.1f}"
+                  f" | {result['throughput_requests_per_s']:8.1f} | {rss}")
+            print("    " + "  ".join(f"{stage} {stats['mean']:.2f}" for stage, stats in result["stages_ms"].items()))
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    with open(args.output, "w", encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = find_regressions(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"Regressions beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
@@ -0,0 +1,106 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from eval.metrics import chrf_from_stats, chrf_stats
+
+logging.basicConfig(level=logging.WARNING)
+
+def load_eval_set(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+def run_backend(backend, rows, rounds):
+    # Backend and cache are read by load_config when the pipeline is built
+    os.environ["INFERENCE_BACKEND"] = backend
+    os.environ["CACHE_SIZE"] = "0"
+    from core.backends import loaded_backend
+    from core.pipeline import TranslationPipeline
+    pipeline = TranslationPipeline()
+    pipeline.warmup(background=False)
+    # A missing export silently falls back to torch; such a run does not measure the backend
+    checker = pipeline.quality_checker
+    loaded = {**pipeline.model_stats()["backends"], checker.model_name: loaded_backend(checker.model)}
+
+    # Latency: one request at a time
+    latencies = []
+    hypotheses = []
+    for row in rows:
+        start = time.perf_counter()
+        output = pipeline.translate(row["source"], target_lang=row.get("target_lang", "Hindi"))
+        latencies.append(time.perf_counter() - start)
+        hypotheses.append(output["translation"])
+
+    # Throughput: the whole set as batches per target language
+    by_target = {}
+    for row in rows:
+        by_target.setdefault(row.get("target_lang", "Hindi"), []).append(row["source"])
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for target_lang, sources in by_target.items():
+            pipeline.translate_batch(sources, target_lang)
+    elapsed = time.perf_counter() - start
+
+    references = [row["reference"] for row in rows]
+    return {
+        # Same corpus chrF as eval/evaluate.py
+        "chrf": float(chrf_from_stats(chrf_stats(hypotheses, references).sum(axis=0))[0]),
+        "latency_ms": {
+            "mean": 1000 * sum(latencies) / len(latencies),
+            "p50": 1000 * percentile(latencies, 50),
+            "p95": 1000 * percentile(latencies, 95),
+        },
+        "throughput_sentences_per_s": rounds * len(rows) / elapsed,
+        "loaded_backends": loaded,
+        "fallbacks": {name: actual for name, actual in loaded.items() if actual != backend},
+        "hypotheses": hypotheses,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quality and speed of each inference backend on the eval set")
+    parser.add_argument("--backends", nargs="+", default=["torch", "torch-int8", "onnx"],
+                        help="The first backend is the baseline for the chrF delta")
+    parser.add_argument("--data", default="data/eval_set.jsonl")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the set for the throughput figure")
+    parser.add_argument("--max-chrf-drop", type=float, default=1.0, help="Fail if a backend loses more chrF than this")
+    parser.add_argument("--output", default="outputs/compare_backends.json")
+    args = parser.parse_args()
+
+    rows = load_eval_set(args.data)
+    results = {}
+    for backend in args.backends:
+        results[backend] = run_backend(backend, rows, args.rounds)
+
+    baseline = results[args.backends[0]]["chrf"]
+    regressions = []
+    fallbacks = []
+    print(f"{'backend':>12} | {'chrF':>6} | {'delta':>6} | {'p50 ms':>8} | {'p95 ms':>8} | {'sent/s':>8}")
+    for backend, result in results.items():
+        result["chrf_delta"] = result["chrf"] - baseline
+        if result["chrf_delta"] < -args.max_chrf_drop:
+            regressions.append(backend)
+        label = backend
+        if result["fallbacks"]:
+            fallbacks.append(backend)
+            label += "*"
+        print(f"{label:>12} | {result['chrf']:6.2f} | {result['chrf_delta']:+6.2f} | {result['latency_ms']['p50']:8.1f}"
+              f" | {result['latency_ms']['p95']:8.1f} | {result['throughput_sentences_per_s']:8.1f}")
+
+    if not os.path.exists("outputs"):
+        os.makedirs("outputs")
+    with open(args.output, "w", encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    for backend in fallbacks:
+        models = ", ".join(f"{name} on {actual or 'nothing'}" for name, actual in results[backend]["fallbacks"].items())
+        print(f"* {backend} was not actually used: {models}")
+    if regressions:
+        print(f"chrF regression beyond {args.max_chrf_drop} points: {', '.join(regressions)}")
+    if regressions or fallbacks:
+        sys.exit(1)
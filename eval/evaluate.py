@@ -2,10 +2,14 @@ import argparse
 import json
 import logging
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+import numpy as np
 from nltk.translate.bleu_score import sentence_bleu, SmoothingFunction
 # For chrF, we usually use sacrebleu or manual calculation. NLTK CHRF is also an option.
 from nltk.translate.chrf_score import sentence_chrf
 from core.pipeline import TranslationPipeline
+from eval.metrics import bleu_from_stats, bleu_stats, bootstrap, chrf_from_stats, chrf_stats
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -81,12 +85,130 @@ def run_evaluation(smoke=False):
     with open("outputs/eval_results.json", "w", encoding='utf-8') as f:
         json.dump(results, f, indent=2, ensure_ascii=False)
 
+def stream_chunks(path, batch_size, limit=None):
+    """Yields (target_lang, rows) batches from an eval_set.jsonl-style file without loading all of it."""
+    buffers = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for count, line in enumerate(f):
+            if limit is not None and count >= limit:
+                break
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            target = row.get("target_lang", "Hindi")
+            buffer = buffers.setdefault(target, [])
+            buffer.append(row)
+            if len(buffer) >= batch_size:
+                yield target, buffers.pop(target)
+    for target, buffer in buffers.items():
+        yield target, buffer
+
+def run_corpus_evaluation(data_path, output_path, workers=0, batch_size=64, samples=1000, limit=None):
+    """
+    Translates a jsonl file with references through translate_batch, in worker processes
+    when workers > 0, and reports corpus BLEU and chrF with bootstrap intervals plus
+    per-route pipeline time (the sum of each request's logs['timings_ms']).
+    Sentence statistics are computed per batch as results arrive; only they are kept.
+    """
+    os.environ.setdefault("CACHE_SIZE", "0")
+    pipeline = TranslationPipeline()
+    pool = None
+    if workers > 0:
+        from core.workers import WorkerPool
+        pool = WorkerPool(pipeline, num_workers=workers)
+        pool.wait_ready()
+        submit = pool.submit
+    else:
+        pipeline.warmup(background=False)
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=1)
+        submit = lambda texts, target: executor.submit(pipeline.translate_batch, texts, target)
+
+    bleu_parts, chrf_parts = [], []
+    route_ms = {}
+    sentences = 0
+    start = time.perf_counter()
+    in_flight = {}
+
+    def collect(futures, out):
+        nonlocal sentences
+        for future in futures:
+            rows = in_flight.pop(future)
+            results = future.result()
+            hypotheses = [result["translation"] for result in results]
+            references = [row.get("reference", "") for row in rows]
+            bleu_parts.append(bleu_stats(hypotheses, references))
+            chrf_parts.append(chrf_stats(hypotheses, references))
+            for row, result in zip(rows, results):
+                route = result["logs"].get("route", "unknown")
+                route_ms.setdefault(route, []).append(sum(result["logs"].get("timings_ms", {}).values()))
+                out.write(json.dumps({**row, "prediction": result["translation"], "route": route,
+                                      "confidence": result["confidence"]}, ensure_ascii=False) + "\n")
+            sentences += len(rows)
+
+    with open(output_path, "w", encoding='utf-8') as out:
+        # Keep every worker busy with one batch queued behind it, without reading the whole file
+        max_in_flight = 2 * max(workers, 1)
+        for target, rows in stream_chunks(data_path, batch_size, limit):
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done, out)
+            in_flight[submit([row["source"] for row in rows], target)] = rows
+        collect(list(in_flight), out)
+    elapsed = time.perf_counter() - start
+
+    if pool is not None:
+        pool.close()
+    else:
+        executor.shutdown()
+    if not sentences:
+        print("No sentences found.")
+        return {}
+
+    bleu = bootstrap(np.vstack(bleu_parts), bleu_from_stats, samples)
+    chrf = bootstrap(np.vstack(chrf_parts), chrf_from_stats, samples)
+    routes = {
+        route: {
+            "sentences": len(times),
+            "p50_ms": float(np.percentile(times, 50)),
+            "p95_ms": float(np.percentile(times, 95)),
+            "mean_ms": float(np.mean(times)),
+        }
+        for route, times in sorted(route_ms.items())
+    }
+    summary = {
+        "data": data_path,
+        "sentences": sentences,
+        "wall_seconds": elapsed,
+        "sentences_per_s": sentences / elapsed,
+        "bleu": bleu,
+        "chrf": chrf,
+        "routes": routes,
+    }
+    print(f"{sentences} sentences in {elapsed:.1f} s ({sentences / elapsed:.1f}/s)")
+    print(f"BLEU {bleu['score']:.2f} [{bleu['low']:.2f}, {bleu['high']:.2f}]"
+          f"  chrF {chrf['score']:.2f} [{chrf['low']:.2f}, {chrf['high']:.2f}]  (95% bootstrap, {samples} samples)")
+    for route, stats in routes.items():
+        print(f"{route:>14} | {stats['sentences']:>7} sentences | p50 {stats['p50_ms']:8.1f} ms | p95 {stats['p95_ms']:8.1f} ms")
+    return summary
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--smoke", action="store_true", help="Run quick smoke test")
+    parser.add_argument("--data", help="Corpus mode: jsonl with source, target_lang and reference (e.g. data/eval_set.jsonl)")
+    parser.add_argument("--workers", type=int, default=0, help="Corpus mode: worker processes (0 = in-process)")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--bootstrap", type=int, default=1000, help="Bootstrap resamples for the confidence intervals")
+    parser.add_argument("--limit", type=int, help="Only the first N lines")
     args = parser.parse_args()
     
     if not os.path.exists("outputs"):
         os.makedirs("outputs")
-        
-    run_evaluation(smoke=args.smoke)
+
+    if args.data:
+        summary = run_corpus_evaluation(args.data, "outputs/eval_corpus_predictions.jsonl", args.workers,
+                                        args.batch_size, args.bootstrap, 3 if args.smoke else args.limit)
+        with open("outputs/eval_corpus.json", "w", encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    else:
+        run_evaluation(smoke=args.smoke)
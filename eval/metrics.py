@@ -0,0 +1,169 @@
+"""
+Corpus-level BLEU and chrF with bootstrap confidence intervals.
+
+Each sentence is reduced to n-gram sufficient statistics (clipped matches and totals per
+order) in one vectorized pass over the whole corpus: n-grams get dense integer ids by
+extending the (n-1)-gram id with the next token and re-numbering with np.unique, so
+counting and clipping are array operations instead of a Counter per sentence. Corpus
+scores come from summed statistics, which also makes bootstrap resampling a matrix
+product. Single reference per sentence.
+"""
+import re
+import numpy as np
+
+BLEU_ORDER = 4
+CHRF_ORDER = 6
+CHRF_BETA = 2.0
+
+# ASCII punctuation and the danda are split off words (close to sacreBLEU's 13a tokenizer);
+# \w alone would also split Devanagari words at their vowel signs
+_PUNCTUATION = re.compile(r"([!-/:-@\[-`{-~।॥])")
+
+def tokenize(text: str):
+    return _PUNCTUATION.sub(r" \1 ", text).split()
+
+def _ngram_stats(sequences, n_sentences: int, max_order: int) -> np.ndarray:
+    """
+    sequences: n_sentences hypotheses followed by their n_sentences references, each a 1-D
+    int array. Returns (n_sentences, 3 * max_order): per order, clipped matches, hypothesis
+    n-grams and reference n-grams.
+    """
+    stats = np.zeros((n_sentences, 3 * max_order))
+    lengths = np.array([len(seq) for seq in sequences], dtype=np.int64)
+    if lengths.sum() == 0:
+        return stats
+    tokens = np.concatenate([np.asarray(seq, dtype=np.int64) for seq in sequences])
+    _, tokens = np.unique(tokens, return_inverse=True)
+    vocab = int(tokens.max()) + 1
+
+    owner = np.repeat(np.arange(len(sequences), dtype=np.int64), lengths)
+    # Tokens from each position to the end of its sequence, inclusive
+    remaining = np.repeat(np.cumsum(lengths), lengths) - np.arange(len(tokens))
+    sentence = owner % n_sentences
+    is_hypothesis = owner < n_sentences
+
+    grams = tokens.copy()
+    for n in range(1, max_order + 1):
+        valid = np.flatnonzero(remaining >= n)
+        if len(valid) == 0:
+            break
+        if n > 1:
+            # id of the n-gram at i = dense id of (id of the (n-1)-gram at i, token at i+n-1)
+            _, extended = np.unique(grams[valid] * vocab + tokens[valid + n - 1], return_inverse=True)
+            grams = np.zeros_like(grams)
+            grams[valid] = extended
+        keys = grams[valid] * n_sentences + sentence[valid]
+        hyp_side = is_hypothesis[valid]
+
+        hyp_keys, hyp_counts = np.unique(keys[hyp_side], return_counts=True)
+        ref_keys, ref_counts = np.unique(keys[~hyp_side], return_counts=True)
+        common, hyp_at, ref_at = np.intersect1d(hyp_keys, ref_keys, assume_unique=True, return_indices=True)
+        column = 3 * (n - 1)
+        stats[:, column] = np.bincount(common % n_sentences, weights=np.minimum(hyp_counts[hyp_at], ref_counts[ref_at]),
+                                       minlength=n_sentences)
+        stats[:, column + 1] = np.bincount(sentence[valid][hyp_side], minlength=n_sentences)
+        stats[:, column + 2] = np.bincount(sentence[valid][~hyp_side], minlength=n_sentences)
+    return stats
+
+def bleu_stats(hypotheses, references) -> np.ndarray:
+    """Per-sentence BLEU statistics: matches and hypothesis totals for orders 1-4, hypothesis and reference length."""
+    vocab = {}
+    sequences = [
+        np.array([vocab.setdefault(token, len(vocab)) for token in tokenize(text)], dtype=np.int64)
+        for text in list(hypotheses) + list(references)
+    ]
+    raw = _ngram_stats(sequences, len(hypotheses), BLEU_ORDER)
+    matches = raw[:, 0::3]
+    totals = raw[:, 1::3]
+    return np.hstack([matches, totals, raw[:, 1:2], raw[:, 2:3]])
+
+def chrf_stats(hypotheses, references) -> np.ndarray:
+    """Per-sentence chrF statistics over character n-grams (whitespace removed), orders 1-6."""
+    sequences = [
+        np.frombuffer("".join(text.split()).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+        for text in list(hypotheses) + list(references)
+    ]
+    stats = _ngram_stats(sequences, len(hypotheses), CHRF_ORDER)
+    # As in sacreBLEU, hypothesis n-grams of an order the reference is too short to have are not counted
+    stats[:, 1::3][stats[:, 2::3] == 0] = 0
+    return stats
+
+def bleu_from_stats(stats: np.ndarray) -> np.ndarray:
+    """Corpus BLEU (0-100) from summed statistics; accepts one row or a batch of rows."""
+    stats = np.atleast_2d(stats)
+    matches, totals = stats[:, :BLEU_ORDER], stats[:, BLEU_ORDER:2 * BLEU_ORDER]
+    hyp_len, ref_len = stats[:, -2], stats[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_precision = np.where(matches > 0, np.log(matches) - np.log(np.maximum(totals, 1)), -np.inf).mean(axis=1)
+        brevity = np.where(hyp_len < ref_len, 1 - ref_len / np.maximum(hyp_len, 1), 0.0)
+    score = np.where(hyp_len > 0, 100 * np.exp(log_precision + brevity), 0.0)
+    return np.nan_to_num(score)
+
+def chrf_from_stats(stats: np.ndarray, beta: float = CHRF_BETA) -> np.ndarray:
+    """
+    Corpus chrF (0-100) as sacreBLEU computes it: precision and recall are averaged over the
+    orders present in both sides, then combined into a single F-beta.
+    """
+    stats = np.atleast_2d(stats)
+    matches, hyp, ref = stats[:, 0::3], stats[:, 1::3], stats[:, 2::3]
+    present = (hyp > 0) & (ref > 0)
+    effective = np.maximum(present.sum(axis=1), 1)
+    factor = beta ** 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(present, matches / hyp, 0.0).sum(axis=1) / effective
+        recall = np.where(present, matches / ref, 0.0).sum(axis=1) / effective
+        denominator = factor * precision + recall
+        f_score = np.where(denominator > 0, (1 + factor) * precision * recall / denominator, 0.0)
+    return 100 * f_score
+
+def bootstrap(stats: np.ndarray, score_fn, samples: int = 1000, confidence: float = 0.95, seed: int = 0,
+              chunk: int = 50):
+    """
+    Corpus score and its percentile bootstrap interval.
+    Each resample is a multinomial weight vector over sentences, so a chunk of resamples
+    is one (chunk x sentences) @ (sentences x statistics) product.
+    """
+    score = float(score_fn(stats.sum(axis=0))[0])
+    n = len(stats)
+    if n == 0 or samples <= 0:
+        return {"score": score, "low": score, "high": score}
+    rng = np.random.default_rng(seed)
+    uniform = np.full(n, 1.0 / n)
+    scores = []
+    for start in range(0, samples, chunk):
+        weights = rng.multinomial(n, uniform, size=min(chunk, samples - start))
+        scores.append(score_fn(weights @ stats))
+    scores = np.concatenate(scores)
+    tail = 100 * (1 - confidence) / 2
+    return {"score": score, "low": float(np.percentile(scores, tail)), "high": float(np.percentile(scores, 100 - tail))}
+
+def _random_corpus(rng, sentences: int, max_words: int):
+    words = ["मैं", "घर", "जा", "रहा", "हूँ", "है", "।", "पढ़", "the", "cat", "book", "a", "ok", "!"]
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(0, max_words))) for _ in range(sentences)]
+
+if __name__ == "__main__":
+    # Parity check against sacreBLEU's chrF, including references too short for the higher orders
+    import argparse
+    import random
+    import sys
+    parser = argparse.ArgumentParser(description="Check corpus chrF against sacreBLEU on random corpora")
+    parser.add_argument("--corpora", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    try:
+        import sacrebleu
+    except ImportError:
+        sys.exit("sacrebleu is not installed; pip install sacrebleu to run the parity check")
+
+    rng = random.Random(args.seed)
+    worst = 0.0
+    for k in range(args.corpora):
+        size = rng.randint(1, 8)
+        hypotheses = _random_corpus(rng, size, 10)
+        # Every other corpus has short references (a few characters, or none)
+        references = _random_corpus(rng, size, 2 if k % 2 else 12)
+        ours = float(chrf_from_stats(chrf_stats(hypotheses, references).sum(axis=0))[0])
+        worst = max(worst, abs(ours - sacrebleu.corpus_chrf(hypotheses, [references]).score))
+    print(f"chrF vs sacreBLEU on {args.corpora} corpora: max difference {worst:.2e}")
+    if worst > 1e-6:
+        sys.exit(1)
@@ -0,0 +1,69 @@
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+from core.backends import export_path
+from core.utils import load_config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+QE_MODEL = "all-MiniLM-L6-v2"
+# Graphs written by optimum for a seq2seq model with a decoder KV cache
+SEQ2SEQ_GRAPHS = ("encoder_model.onnx", "decoder_model.onnx", "decoder_with_past_model.onnx")
+
+def quantization_config(arch: str):
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    return getattr(AutoQuantizationConfig, arch)(is_static=False, per_channel=False)
+
+def export_marian(model_name: str, output_dir: str, quantize: bool, arch: str):
+    """Exports encoder, decoder and decoder-with-past graphs, optionally int8-quantized in place of the fp32 ones."""
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+    from transformers import MarianTokenizer
+
+    path = export_path(output_dir, model_name)
+    staging = tempfile.mkdtemp(prefix="onnx-export-") if quantize else path
+    logger.info(f"Exporting {model_name} to {path}")
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, use_cache=True)
+    model.save_pretrained(staging)
+    MarianTokenizer.from_pretrained(model_name).save_pretrained(staging)
+
+    if quantize:
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(staging):
+            if name not in SEQ2SEQ_GRAPHS:
+                shutil.copy2(os.path.join(staging, name), path)
+        for graph in SEQ2SEQ_GRAPHS:
+            if os.path.exists(os.path.join(staging, graph)):
+                quantizer = ORTQuantizer.from_pretrained(staging, file_name=graph)
+                # No suffix, so the loader picks the quantized graphs up under the standard names
+                quantizer.quantize(save_dir=path, quantization_config=quantization_config(arch), file_suffix="")
+        shutil.rmtree(staging, ignore_errors=True)
+
+def export_sentence_encoder(model_name: str, output_dir: str, quantize: bool, arch: str):
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    path = export_path(output_dir, model_name)
+    logger.info(f"Exporting {model_name} to {path}")
+    model = SentenceTransformer(model_name, backend="onnx")
+    model.save(path)
+    if quantize:
+        export_dynamic_quantized_onnx_model(model, arch, path)
+
+if __name__ == "__main__":
+    config = load_config()
+    parser = argparse.ArgumentParser(description="Export the translation and QE models for the ONNX Runtime backend")
+    parser.add_argument("--models", nargs="+", default=[config["DEFAULT_MODEL_EN_HI"], config["DEFAULT_MODEL_HI_EN"]])
+    parser.add_argument("--qe-model", default=QE_MODEL, help="Sentence encoder used for QE ('' to skip)")
+    parser.add_argument("--output", default=config["ONNX_EXPORT_DIR"])
+    parser.add_argument("--quantize", action="store_true", help="Dynamic int8 quantization of the exported graphs")
+    parser.add_argument("--arch", default="avx2", choices=["arm64", "avx2", "avx512", "avx512_vnni"],
+                        help="Target instruction set for the quantized kernels")
+    args = parser.parse_args()
+
+    for model_name in args.models:
+        export_marian(model_name, args.output, args.quantize, args.arch)
+    if args.qe_model:
+        export_sentence_encoder(args.qe_model, args.output, args.quantize, args.arch)
+    logger.info(f"Done. Run with INFERENCE_BACKEND=onnx ONNX_EXPORT_DIR={args.output}")
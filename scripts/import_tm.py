@@ -0,0 +1,31 @@
+import argparse
+import logging
+import os
+from core.memory import TranslationMemory
+from core.utils import load_config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+if __name__ == "__main__":
+    config = load_config()
+    parser = argparse.ArgumentParser(description="Import TMX or CSV translation pairs into the translation memory")
+    parser.add_argument("inputs", nargs="+", help=".tmx files, or .csv files with Source and Target columns")
+    parser.add_argument("--output", default=config["TM_PATH"], help="Memory file, extended if it exists (TM_PATH)")
+    parser.add_argument("--source-lang", help="TMX: source language code (default: the header's srclang); "
+                                              "CSV: source language for rows without a SourceLang column")
+    parser.add_argument("--target-lang", default="hi", help="TMX: target language code; "
+                                                            "CSV: target for rows without a TargetLang column")
+    args = parser.parse_args()
+
+    memory = TranslationMemory()
+    if os.path.exists(args.output):
+        logger.info(f"{memory.load(args.output)} existing entries in {args.output}")
+    for path in args.inputs:
+        if path.lower().endswith(".tmx"):
+            added = memory.import_tmx(path, args.source_lang, args.target_lang)
+        else:
+            added = memory.import_csv(path, args.target_lang, args.source_lang or "")
+        logger.info(f"{added} pairs from {path}")
+    memory.save(args.output)
+    logger.info(f"{len(memory)} entries written to {args.output} ({os.path.getsize(args.output) / 1024:.0f} KB)")
@@ -0,0 +1,62 @@
+import argparse
+import json
+import logging
+import random
+import time
+from core.langid import LABELS, NgramLanguageID, train
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def read_examples(path):
+    """Reads (text, label) pairs from jsonl rows with 'text'/'source' and 'lang'/'source_lang' fields."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            text = row.get("text", row.get("source"))
+            label = row.get("lang", row.get("source_lang"))
+            if text and label:
+                yield text, label
+
+def evaluate(model: NgramLanguageID, examples):
+    texts = [text for text, _ in examples]
+    predicted, _ = model.predict_batch(texts)
+    correct = sum(p == label for p, (_, label) in zip(predicted, examples))
+    return correct / len(examples) if examples else 0.0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the character n-gram language ID model")
+    parser.add_argument("--data", default="data/langid_train.jsonl")
+    parser.add_argument("--output", default="data/langid_ngram.npz")
+    parser.add_argument("--buckets", type=int, default=2 ** 16, help="Size of the hashed n-gram weight table")
+    parser.add_argument("--min-n", type=int, default=1)
+    parser.add_argument("--max-n", type=int, default=4)
+    parser.add_argument("--epochs", type=int, default=30)
+    parser.add_argument("--holdout", type=float, default=0.1, help="Fraction held out for accuracy reporting")
+    args = parser.parse_args()
+
+    examples = list(read_examples(args.data))
+    random.Random(0).shuffle(examples)
+    split = int(len(examples) * (1 - args.holdout))
+    train_set, holdout_set = examples[:split], examples[split:]
+    logger.info(f"Training on {len(train_set)} examples, holding out {len(holdout_set)} (labels: {', '.join(LABELS)})")
+
+    model = train(train_set, n_buckets=args.buckets, ngram_range=(args.min_n, args.max_n), epochs=args.epochs)
+    if holdout_set:
+        logger.info(f"Holdout accuracy: {evaluate(model, holdout_set):.3f}")
+
+    # Latency report: single-sentence and batched inference
+    sample = [text for text, _ in examples[:1000]] or ["hello"]
+    start = time.perf_counter()
+    for text in sample:
+        model.predict(text)
+    single_us = (time.perf_counter() - start) / len(sample) * 1e6
+    start = time.perf_counter()
+    model.predict_batch(sample * 10)
+    batch_us = (time.perf_counter() - start) / (len(sample) * 10) * 1e6
+    logger.info(f"Inference: {single_us:.1f} us/sentence single, {batch_us:.2f} us/sentence batched")
+
+    model.save(args.output)
+    logger.info(f"Saved model to {args.output}")
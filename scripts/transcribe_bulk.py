@@ -0,0 +1,119 @@
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from core.stt import STT, TRANSCRIBE_PROFILES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".m4a", ".flac", ".ogg", ".opus", ".webm")
+
+def list_inputs(source):
+    """Audio files under a directory, or the paths in a manifest (.txt: one per line, .jsonl: 'path' field)."""
+    if os.path.isdir(source):
+        paths = []
+        for root, _, files in os.walk(source):
+            paths.extend(os.path.join(root, name) for name in files if name.lower().endswith(AUDIO_EXTENSIONS))
+        return sorted(paths)
+
+    paths = []
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            paths.append(json.loads(line)["path"] if source.endswith(".jsonl") else line)
+    return paths
+
+def completed_paths(output):
+    """Paths already transcribed in the output file; it doubles as the resume checkpoint."""
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by a crash; that file is transcribed again
+                continue
+            if "error" not in row:
+                done.add(row["path"])
+    return done
+
+def transcribe_all(stt, paths, profile, workers, output=None):
+    """Transcribes paths on a thread pool, appending each result to output as it finishes. Returns stats."""
+    audio_seconds = 0.0
+    failures = 0
+    start = time.perf_counter()
+    out = open(output, 'a', encoding='utf-8') if output else None
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="transcribe") as executor:
+            futures = {executor.submit(stt.transcribe_file, path, profile): path for path in paths}
+            for i, future in enumerate(as_completed(futures), 1):
+                path = futures[future]
+                try:
+                    row = {"path": path, "profile": profile, **future.result()}
+                    audio_seconds += row["duration"]
+                except Exception as e:
+                    logger.error(f"Failed to transcribe {path}: {e}")
+                    row = {"path": path, "profile": profile, "error": str(e)}
+                    failures += 1
+                if out:
+                    out.write(json.dumps(row, ensure_ascii=False) + "\n")
+                    out.flush()
+                if i % 50 == 0:
+                    elapsed = time.perf_counter() - start
+                    logger.info(f"{i}/{len(paths)} files, {audio_seconds / elapsed:.1f} audio-s per wall-s")
+    finally:
+        if out:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "profile": profile,
+        "files": len(paths),
+        "failures": failures,
+        "audio_seconds": audio_seconds,
+        "wall_seconds": elapsed,
+        "audio_seconds_per_wall_second": audio_seconds / elapsed if elapsed > 0 else 0.0,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk transcription of audio files to jsonl")
+    parser.add_argument("input", help="Directory of audio files, or a .txt/.jsonl manifest")
+    parser.add_argument("--output", default="outputs/transcripts.jsonl")
+    parser.add_argument("--profile", default="balanced", choices=sorted(TRANSCRIBE_PROFILES))
+    parser.add_argument("--model-size", default="tiny")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 1) // 4),
+                        help="Files transcribed concurrently (WhisperModel num_workers)")
+    parser.add_argument("--cpu-threads", type=int, default=4, help="CTranslate2 threads per transcription")
+    parser.add_argument("--compare-profiles", type=int, default=0, metavar="N",
+                        help="Instead of a job, time every profile on the first N files and report audio-s per wall-s")
+    args = parser.parse_args()
+
+    stt = STT(model_size=args.model_size, compute_type=args.compute_type,
+              cpu_threads=args.cpu_threads, num_workers=args.workers)
+    paths = list_inputs(args.input)
+
+    if args.compare_profiles:
+        sample = paths[:args.compare_profiles]
+        stt.load_model()
+        for profile in TRANSCRIBE_PROFILES:
+            stats = transcribe_all(stt, sample, profile, args.workers)
+            print(f"{profile:>9} | {stats['audio_seconds']:8.1f} audio-s in {stats['wall_seconds']:7.1f} s"
+                  f" | {stats['audio_seconds_per_wall_second']:6.1f} audio-s per wall-s")
+    else:
+        done = completed_paths(args.output)
+        pending = [path for path in paths if path not in done]
+        logger.info(f"{len(paths)} files, {len(done)} already done, {len(pending)} to transcribe with '{args.profile}'")
+        output_dir = os.path.dirname(args.output)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        stats = transcribe_all(stt, pending, args.profile, args.workers, args.output)
+        logger.info(f"Done: {stats['files']} files ({stats['failures']} failed), {stats['audio_seconds']:.0f} audio-s"
+                    f" in {stats['wall_seconds']:.0f} s = {stats['audio_seconds_per_wall_second']:.1f} audio-s per wall-s")
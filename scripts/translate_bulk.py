@@ -0,0 +1,271 @@
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from itertools import islice
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+OUTPUT_FIELDS = ("translation", "confidence")
+
+class _LineReader:
+    """
+    Decoded lines of a binary file; `position` is the byte offset after the last line handed out.
+    Lines that are not valid UTF-8 are decoded with replacement characters, and `invalid` is set
+    to the byte offset of the first bad byte until the caller resets it.
+    """
+    def __init__(self, f):
+        self.f = f
+        self.position = f.tell()
+        self.start = self.position
+        self.invalid = None
+
+    def __iter__(self):
+        for line in iter(self.f.readline, b""):
+            self.start = self.position
+            self.position += len(line)
+            encoding = "utf-8-sig" if self.start == 0 else "utf-8"
+            try:
+                yield line.decode(encoding)
+            except UnicodeDecodeError as e:
+                if self.invalid is None:
+                    self.invalid = self.start + e.start
+                yield line.decode(encoding, errors="replace")
+
+def read_rows(path, fmt, offset=0):
+    """
+    Yields (offset_after_row, row dict) from a jsonl or CSV file, starting at a byte offset.
+    A CSV header is always read from the top of the file. Rows that cannot be parsed, or are
+    not valid UTF-8, are yielded as {"_error": ...} so the caller can record them and move on.
+    """
+    with open(path, "rb") as f:
+        lines = _LineReader(f)
+        if fmt == "csv":
+            header = next(csv.reader(lines), None)
+            if header is None:
+                logger.warning(f"{path} is empty; no rows to translate")
+                return
+            if offset:
+                f.seek(offset)
+                lines.position = offset
+            lines.invalid = None
+            for values in csv.reader(lines):
+                # A quoted row may span several lines; any bad one flags the whole row
+                invalid, lines.invalid = lines.invalid, None
+                if not values:
+                    continue
+                if invalid is not None:
+                    yield lines.position, {"_error": f"Invalid UTF-8 at byte {invalid}"}
+                else:
+                    yield lines.position, dict(zip(header, values))
+            return
+
+        f.seek(offset)
+        lines.position = offset
+        for line in lines:
+            invalid, lines.invalid = lines.invalid, None
+            if invalid is not None:
+                yield lines.position, {"_error": f"Invalid UTF-8 at byte {invalid}"}
+                continue
+            if not line.strip():
+                continue
+            try:
+                yield lines.position, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield lines.position, {"_error": f"Invalid JSON at byte {lines.start}: {e}"}
+
+def prefetch(iterable, size):
+    """Runs `iterable` on a reader thread, holding at most `size` items ahead of the consumer."""
+    items = queue.Queue(maxsize=size)
+    done = object()
+
+    def produce():
+        try:
+            for item in iterable:
+                items.put(item)
+        except Exception as e:
+            items.put(e)
+        items.put(done)
+
+    threading.Thread(target=produce, name="bulk-reader", daemon=True).start()
+    while True:
+        item = items.get()
+        if item is done:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+def batched(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+def translate_rows(pipeline, rows, text_field, target_field, default_target, with_logs):
+    """Translates one batch of rows; rows with different targets go out as one translate_batch each."""
+    outputs = [None] * len(rows)
+    by_target = {}
+    for i, row in enumerate(rows):
+        if "_error" in row:
+            outputs[i] = {"error": row["_error"]}
+            continue
+        text = row.get(text_field)
+        if not isinstance(text, str):
+            outputs[i] = {**row, "error": f"Missing text field '{text_field}'"}
+            continue
+        target = (row.get(target_field) if target_field else None) or default_target
+        by_target.setdefault(target, []).append(i)
+
+    for target, indices in by_target.items():
+        try:
+            results = pipeline.translate_batch([rows[i][text_field] for i in indices], target_lang=target)
+        except Exception as e:
+            logger.error(f"Batch of {len(indices)} rows failed: {e}")
+            for i in indices:
+                outputs[i] = {**rows[i], "error": str(e)}
+            continue
+        for i, result in zip(indices, results):
+            outputs[i] = {**rows[i], "translation": result["translation"], "confidence": result["confidence"]}
+            if with_logs:
+                outputs[i]["logs"] = result["logs"]
+    return outputs
+
+class Checkpoint:
+    """Input and output byte offsets after the last fully written batch, replaced atomically."""
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, state):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.path)
+
+class OutputWriter:
+    """Appends rows to jsonl or CSV; the CSV header comes from the first row (or the input header)."""
+    def __init__(self, path, fmt, resume_offset=None):
+        self.fmt = fmt
+        exists = os.path.exists(path)
+        self.f = open(path, "r+b" if exists else "wb")
+        if resume_offset is not None:
+            # Drop anything written after the last checkpoint, e.g. a batch cut short by a crash
+            self.f.truncate(resume_offset)
+        self.f.seek(0, io.SEEK_END)
+        self.text = io.TextIOWrapper(self.f, encoding="utf-8", newline="", write_through=True)
+        self.fieldnames = None
+        if fmt == "csv" and exists and self.f.tell() > 0:
+            with open(path, "r", encoding="utf-8", newline="") as existing:
+                self.fieldnames = next(csv.reader(existing))
+        self._csv = None
+
+    def write(self, rows):
+        if self.fmt == "jsonl":
+            for row in rows:
+                self.text.write(json.dumps(row, ensure_ascii=False) + "\n")
+            return
+        if self._csv is None:
+            if self.fieldnames is None:
+                first = next((row for row in rows if "error" not in row), rows[0])
+                self.fieldnames = [key for key in first if key not in OUTPUT_FIELDS and key != "logs"]
+                self.fieldnames += list(OUTPUT_FIELDS) + ["error"]
+                self._csv = csv.DictWriter(self.text, self.fieldnames, extrasaction="ignore")
+                self._csv.writeheader()
+            else:
+                self._csv = csv.DictWriter(self.text, self.fieldnames, extrasaction="ignore")
+        self._csv.writerows(rows)
+
+    def offset(self):
+        self.text.flush()
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        return self.f.tell()
+
+    def close(self):
+        self.text.close()
+
+def file_format(path, override=None):
+    if override:
+        return override
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+def run(pipeline, args):
+    input_format = file_format(args.input, args.input_format)
+    output_format = file_format(args.output, args.output_format)
+    checkpoint = Checkpoint(args.output + ".ckpt")
+    state = checkpoint.load()
+    if state and state.get("input") != os.path.abspath(args.input):
+        raise SystemExit(f"{checkpoint.path} belongs to {state.get('input')}; remove it to start over")
+    if state:
+        logger.info(f"Resuming at row {state['rows']} (input byte {state['offset']})")
+    else:
+        state = {"input": os.path.abspath(args.input), "offset": 0, "rows": 0, "failed": 0, "output_offset": 0}
+        if os.path.exists(args.output) and os.path.getsize(args.output):
+            logger.warning(f"No checkpoint for {args.output}; starting over and replacing it")
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    writer = OutputWriter(args.output, output_format, state["output_offset"] if state["rows"] else 0)
+
+    start = time.perf_counter()
+    done_this_run = 0
+    rows = prefetch(read_rows(args.input, input_format, state["offset"]), args.prefetch * args.batch_size)
+    try:
+        for batch in batched(rows, args.batch_size):
+            outputs = translate_rows(pipeline, [row for _, row in batch], args.text_field, args.target_field,
+                                     args.target_lang, args.logs)
+            writer.write(outputs)
+            state["offset"] = batch[-1][0]
+            state["rows"] += len(batch)
+            state["failed"] += sum(1 for output in outputs if "error" in output)
+            # Output first, then the checkpoint: a crash in between only repeats this batch
+            state["output_offset"] = writer.offset()
+            checkpoint.save(state)
+
+            done_this_run += len(batch)
+            if done_this_run % args.log_every < len(batch):
+                elapsed = time.perf_counter() - start
+                logger.info(f"{state['rows']} rows ({state['failed']} failed), {done_this_run / elapsed:.1f} rows/s")
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"Done: {state['rows']} rows ({state['failed']} failed); {done_this_run} this run"
+                f" in {elapsed:.0f} s = {done_this_run / elapsed if elapsed > 0 else 0:.1f} rows/s")
+    return state
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streaming bulk translation of a jsonl or CSV corpus")
+    parser.add_argument("input", help=".jsonl (one object per line) or .csv with a header row")
+    parser.add_argument("--output", default="outputs/translations.jsonl",
+                        help="jsonl or CSV; <output>.ckpt holds the resume checkpoint")
+    parser.add_argument("--input-format", choices=("jsonl", "csv"))
+    parser.add_argument("--output-format", choices=("jsonl", "csv"))
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--target-field", help="Per-row target language column; --target-lang when empty")
+    parser.add_argument("--target-lang", default="Hindi")
+    parser.add_argument("--batch-size", type=int, default=64, help="Rows per translate_batch call and checkpoint")
+    parser.add_argument("--prefetch", type=int, default=4, help="Batches read ahead of translation")
+    parser.add_argument("--logs", action="store_true", help="Include the pipeline logs of each row (jsonl only)")
+    parser.add_argument("--log-every", type=int, default=10000)
+    args = parser.parse_args()
+
+    from core.pipeline import TranslationPipeline
+    pipeline = TranslationPipeline()
+    pipeline.warmup(background=False)
+    run(pipeline, args)